@@ -0,0 +1,170 @@
+"""
+알림 API 쿼리 A/B 테스트 (합성 데이터, SQLite)
+A: 예전 쿼리 - 보호자 구분 없이 tb_alert 전체 (전체 정렬 / 전체 UPDATE)
+B: 보호자별 쿼리 (bomi.py check_alert / get_alert_list / mark_all_read)
+   - 인덱스 없음 / (guardian_id, received_yes, sented_at) 인덱스 있음 비교
+
+- B 결과가 파이썬으로 직접 계산한 기준값과 같은지 확인 (보호자 표본)
+- 쿼리 계획에서 인덱스를 쓰는지 확인
+- UPDATE는 트랜잭션 안에서 실행 후 롤백 (데이터 유지)
+
+사용법: python alert_ab_test.py [알림 수] [보호자 수]
+"""
+
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+
+SCHEMA = """
+    CREATE TABLE tb_alert (
+        alert_id INTEGER PRIMARY KEY,
+        guardian_id INTEGER NOT NULL,
+        alert_type TEXT,
+        alert_content TEXT,
+        alert_channel TEXT,
+        sented_at TEXT NOT NULL,
+        received_yes INTEGER NOT NULL
+    )
+"""
+
+INDEX_SQL = "CREATE INDEX idx_alert_guardian_unread ON tb_alert (guardian_id, received_yes, sented_at)"
+
+# A: 예전 쿼리 (bomi.py 수정 전)
+OLD_CHECK = "SELECT alert_id FROM tb_alert WHERE received_yes = 0 ORDER BY sented_at DESC LIMIT 1"
+OLD_LIST = "SELECT alert_id FROM tb_alert ORDER BY sented_at DESC LIMIT 10"
+OLD_MARK = "UPDATE tb_alert SET received_yes = 1"
+
+# B: 보호자별 쿼리 (bomi.py와 같은 조건, 플레이스홀더만 ?)
+NEW_CHECK = """
+    SELECT alert_id FROM tb_alert
+    WHERE guardian_id = ? AND received_yes = 0
+    ORDER BY sented_at DESC LIMIT 1
+"""
+NEW_LIST = """
+    SELECT alert_id FROM tb_alert
+    WHERE guardian_id = ? AND alert_id > ?
+    ORDER BY sented_at DESC LIMIT 10
+"""
+NEW_MARK = "UPDATE tb_alert SET received_yes = 1 WHERE guardian_id = ? AND received_yes = 0"
+
+
+def build_db(n_alerts, n_guardians, seed=0):
+    """합성 알림 (시간순 증가 + 약간의 지연, 10%는 안 읽음)"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(":memory:")
+    conn.execute(SCHEMA)
+
+    start = datetime(2025, 1, 1)
+    rows = []
+    for alert_id in range(1, n_alerts + 1):
+        sent = start + timedelta(seconds=alert_id * 30 + rng.randint(0, 60))
+        rows.append((
+            alert_id,
+            rng.randint(1, n_guardians),
+            rng.choice(["Emergency", "No Movement"]),
+            "합성 알림",
+            "WEB",
+            sent.strftime("%Y-%m-%d %H:%M:%S"),
+            0 if rng.random() < 0.1 else 1
+        ))
+    conn.executemany("INSERT INTO tb_alert VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    return conn, rows
+
+
+def reference(rows, guardian_id, since_alert_id):
+    """파이썬 기준값 (check, list, mark 대상 수)"""
+    mine = [r for r in rows if r[1] == guardian_id]
+    by_time = sorted(mine, key=lambda r: (r[5], r[0]), reverse=True)
+    unread = [r for r in by_time if r[6] == 0]
+    return (
+        unread[0][0] if unread else None,
+        [r[0] for r in by_time if r[0] > since_alert_id][:10],
+        len(unread)
+    )
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def run_queries(conn, guardians, since_ids):
+    """B 쿼리 결과 (보호자별)"""
+    results = []
+    for g, since in zip(guardians, since_ids):
+        row = conn.execute(NEW_CHECK, (g,)).fetchone()
+        listed = [r[0] for r in conn.execute(NEW_LIST, (g, since))]
+        conn.execute("BEGIN")
+        marked = conn.execute(NEW_MARK, (g,)).rowcount
+        conn.execute("ROLLBACK")
+        results.append((row[0] if row else None, listed, marked))
+    return results
+
+
+def bench(conn, guardians, since_ids, repeat):
+    def mark(sql, params):
+        conn.execute("BEGIN")
+        conn.execute(sql, params)
+        conn.execute("ROLLBACK")
+
+    return {
+        'check': timed(lambda i: conn.execute(NEW_CHECK, (guardians[i % len(guardians)],)).fetchone(), repeat),
+        'list': timed(lambda i: conn.execute(NEW_LIST, (guardians[i % len(guardians)], since_ids[i % len(guardians)])).fetchall(), repeat),
+        'mark': timed(lambda i: mark(NEW_MARK, (guardians[i % len(guardians)],)), repeat),
+    }
+
+
+def run_ab_test(n_alerts, n_guardians, samples=50, repeat=200):
+    print(f"⏳ 합성 알림 {n_alerts:,}건 생성 중 (보호자 {n_guardians:,}명)...")
+    conn, rows = build_db(n_alerts, n_guardians)
+
+    rng = random.Random(1)
+    guardians = [rng.randint(1, n_guardians) for _ in range(samples)]
+    since_ids = [rng.choice([0, n_alerts // 2, n_alerts - 1000]) for _ in range(samples)]
+    expected = [reference(rows, g, s) for g, s in zip(guardians, since_ids)]
+    del rows
+
+    # A: 예전 전체 쿼리
+    old = {
+        'check': timed(lambda i: conn.execute(OLD_CHECK).fetchone(), 3),
+        'list': timed(lambda i: conn.execute(OLD_LIST).fetchall(), 3),
+        'mark': timed(lambda i: (conn.execute("BEGIN"), conn.execute(OLD_MARK), conn.execute("ROLLBACK")), 1),
+    }
+
+    # B: 보호자별 (인덱스 없음 → 있음)
+    no_index = bench(conn, guardians, since_ids, repeat=5)
+    conn.execute(INDEX_SQL)
+    with_index = bench(conn, guardians, since_ids, repeat)
+
+    plan = " / ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + NEW_CHECK, (1,)))
+    mismatches = [
+        (g, exp, got)
+        for g, exp, got in zip(guardians, expected, run_queries(conn, guardians, since_ids))
+        if exp != got
+    ]
+
+    print("="*60)
+    print(f"📊 알림 쿼리 A/B 결과 (알림 {n_alerts:,}건, 보호자 {n_guardians:,}명)")
+    print("="*60)
+    print(f"{'':10}{'A 전체':>14}{'B 인덱스 없음':>16}{'B 인덱스':>14}")
+    for key in ('check', 'list', 'mark'):
+        print(f"{key:10}{old[key]:>12.3f}ms{no_index[key]:>14.3f}ms{with_index[key]:>12.3f}ms"
+              f"   ({old[key] / max(with_index[key], 1e-9):,.0f}x)")
+    print(f"쿼리 계획: {plan}")
+    print(f"불일치:    {len(mismatches)}건 (표본 {samples}명)")
+    for g, exp, got in mismatches[:5]:
+        print(f"   보호자 {g}: {exp} != {got}")
+    return not mismatches and "idx_alert_guardian_unread" in plan
+
+
+# ========== 메인 실행 ==========
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    guardian_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    sys.exit(0 if run_ab_test(count, guardian_count) else 1)
@@ -0,0 +1,257 @@
+"""
+실시간 알림 분배기 (SSE /api/alert-stream 용)
+- 예전: 대시보드 탭마다 3초마다 /api/check-alert → 탭 수만큼 DB 연결 + tb_alert 전체 정렬
+- 지금: 서버 프로세스에 분배기 1개가 주기적으로 새 알림만 조회
+    · 마지막으로 본 alert_id(high-water mark)보다 큰 행만 (기본키 범위 조회)
+    · 새 알림은 해당 보호자(guardian_id)를 구독 중인 연결에만 전달
+- 구독자별 큐가 가득 차면 오래된 알림부터 버림 (느린 탭이 서버를 막지 않음)
+
+사용 예:
+    dispatcher = get_dispatcher()
+    sub = dispatcher.subscribe(guardian_id, last_alert_id=None)
+    alert = sub.get(timeout=15)     # 새 알림 (없으면 None)
+    dispatcher.unsubscribe(sub)
+
+설정: config/serving.py의 ALERT_STREAM_CONFIG
+"""
+
+import queue
+import threading
+from datetime import datetime
+
+from config.serving import ALERT_STREAM_CONFIG
+from db_pool import get_pool
+
+
+ALERT_COLUMNS = "alert_id, guardian_id, alert_type, alert_content, sented_at"
+
+
+def format_alert(row):
+    """DB 행 → 클라이언트 전달 형식 (/api/check-alert와 같은 필드)"""
+    sented_at = row['sented_at']
+    if isinstance(sented_at, datetime):
+        sented_at = sented_at.strftime('%Y-%m-%d %H:%M:%S')
+    return {
+        'alert_id': row['alert_id'],
+        'alert_type': row['alert_type'],
+        'alert_content': row['alert_content'],
+        'sented_at': sented_at
+    }
+
+
+class Subscription:
+    """알림 구독 1개 (SSE 연결 1개)"""
+
+    def __init__(self, guardian_id, queue_size):
+        self.guardian_id = guardian_id  # None이면 모든 알림
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def matches(self, alert_row):
+        return self.guardian_id is None or alert_row['guardian_id'] == self.guardian_id
+
+    def push(self, alert):
+        """큐에 넣기 (가득 차면 가장 오래된 알림 버림)"""
+        while True:
+            try:
+                self.queue.put_nowait(alert)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=None):
+        """다음 알림 (timeout 안에 없으면 None)"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class AlertDispatcher:
+    """tb_alert 새 행 감시 + 구독자에게 분배 (프로세스당 1개)"""
+
+    def __init__(self, pool=None, poll_interval_sec=2.0, queue_size=100, replay_limit=50):
+        """
+        Args:
+            pool: db_pool.ConnectionPool (None이면 공유 풀)
+            poll_interval_sec: 새 알림 확인 주기 (초)
+            queue_size: 구독자별 최대 대기 알림 수
+            replay_limit: 구독 시 놓친 알림 최대 재전송 수
+        """
+        self.pool = pool or get_pool()
+        self.poll_interval_sec = poll_interval_sec
+        self.queue_size = queue_size
+        self.replay_limit = replay_limit
+
+        self.high_water_mark = None       # 지금까지 분배한 가장 큰 alert_id
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+        self.polls = 0
+        self.dispatched = 0
+        self.errors = 0
+
+    # ========== 구독 ==========
+
+    def subscribe(self, guardian_id=None, last_alert_id=None):
+        """
+        구독 시작
+
+        Args:
+            guardian_id: 받을 보호자 ID (None이면 전체)
+            last_alert_id: 클라이언트가 마지막으로 받은 alert_id (재연결, Last-Event-ID)
+                           None이면 안 읽은 최신 알림 1개를 먼저 전달 (예전 /api/check-alert와 같은 동작)
+        """
+        self.start()
+        sub = Subscription(guardian_id, self.queue_size)
+
+        # 구독 등록 후에 놓친 알림 조회 → 사이에 들어온 알림은 중복될 수 있지만 빠지지는 않음
+        # (클라이언트는 alert_id로 중복 제거)
+        with self._lock:
+            self._subscribers.add(sub)
+        try:
+            for alert in self._initial_alerts(guardian_id, last_alert_id):
+                sub.push(alert)
+        except Exception as e:
+            print(f"⚠️ 알림 초기 조회 실패: {e}")
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def _initial_alerts(self, guardian_id, last_alert_id):
+        where, params = [], []
+        if guardian_id is not None:
+            where.append("guardian_id = %s")
+            params.append(guardian_id)
+
+        if last_alert_id is not None:
+            where.append("alert_id > %s")
+            params.append(last_alert_id)
+            order = "alert_id ASC"
+            limit = self.replay_limit
+        else:
+            where.append("received_yes = 0")
+            order = "alert_id DESC"
+            limit = 1
+
+        sql = f"""
+            SELECT {ALERT_COLUMNS}
+            FROM tb_alert
+            WHERE {" AND ".join(where)}
+            ORDER BY {order}
+            LIMIT %s
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, (*params, limit))
+            rows = cursor.fetchall()
+        return [format_alert(row) for row in rows]
+
+    # ========== 감시 스레드 ==========
+
+    def start(self):
+        """감시 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+
+        # 시작 시점 high-water mark를 먼저 잡아야 첫 구독 직후 알림이 빠지지 않음
+        self._poll_safely()
+        self._thread.start()
+        print(f"📡 알림 분배기 시작 ({self.poll_interval_sec}초 주기)")
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=self.poll_interval_sec + 1)
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval_sec):
+            self._poll_safely()
+
+    def _poll_safely(self):
+        try:
+            self.poll_once()
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ 알림 조회 오류: {e}")
+
+    def poll_once(self):
+        """새 알림 조회 → 구독자에게 분배 (분배한 알림 수 반환)"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            if self.high_water_mark is None:
+                # 시작 시점 이전 알림은 구독 시 _initial_alerts로만 전달
+                cursor.execute("SELECT COALESCE(MAX(alert_id), 0) AS max_id FROM tb_alert")
+                self.high_water_mark = cursor.fetchone()['max_id']
+                return 0
+
+            cursor.execute(f"""
+                SELECT {ALERT_COLUMNS}
+                FROM tb_alert
+                WHERE alert_id > %s
+                ORDER BY alert_id
+                LIMIT 500
+            """, (self.high_water_mark,))
+            rows = cursor.fetchall()
+        self.polls += 1
+
+        if not rows:
+            return 0
+        self.high_water_mark = rows[-1]['alert_id']
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for row in rows:
+            alert = format_alert(row)
+            for sub in subscribers:
+                if sub.matches(row):
+                    sub.push(alert)
+                    self.dispatched += 1
+        return len(rows)
+
+    # ========== 통계 ==========
+
+    def stats(self):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return {
+            'running': self._thread is not None,
+            'subscribers': len(subscribers),
+            'high_water_mark': self.high_water_mark,
+            'polls': self.polls,
+            'dispatched': self.dispatched,
+            'dropped': sum(sub.dropped for sub in subscribers),
+            'errors': self.errors
+        }
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    """프로세스 공유 분배기 (첫 호출 때 생성, 스레드는 첫 구독 때 시작)"""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = AlertDispatcher(
+                    poll_interval_sec=ALERT_STREAM_CONFIG['poll_interval_sec'],
+                    queue_size=ALERT_STREAM_CONFIG['queue_size'],
+                    replay_limit=ALERT_STREAM_CONFIG['replay_limit']
+                )
+    return _dispatcher
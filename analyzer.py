@@ -3,108 +3,309 @@
 Whisper + KcELECTRA + 개선된 감정 분석 (PDF 기반)
 """
 
+import copy
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import torch
 import numpy as np
-from transformers import WhisperProcessor, WhisperForConditionalGeneration, AutoTokenizer
+from transformers import WhisperProcessor, AutoTokenizer, pipeline
 from config.models import MODELS
-from config.scoring import SCORING_CRITERIA, calculate_score
+from config.scoring import ScoringEngine, score_features
 from emotion_model import EmotionEnsemble
+from audio_io import AudioData, TARGET_SR, load_audio
+from model_registry import ModelRegistry
+from inference_backend import load_model
+from stt_policy import STTTierPolicy
+from cache import TextCache
+from vad import detect_voice_activity, extract_regions, to_original_time
 
 
-def calculate_emotion_score(emotion_info):
+class SpeechAnalyzer:
     """
-    감정 안정도 점수 계산
-    
-    Args:
-        emotion_info: EmotionEnsemble.predict() 결과
+    음성 분석기 (Whisper + KcELECTRA + 개선된 감정)
     
-    Returns:
-        score: 0-100 점수
+    단계별 공개 API (streaming_analyzer.StreamingSession이 구간별로 조합):
+        transcribe_batch → whisper_metrics (+ group_segments) → vocabulary_analysis
+        → calculate_scores → print_scores
     """
-    if not emotion_info or 'final_emotion' not in emotion_info:
-        return 70.0
     
-    final_emotion = emotion_info.get('final_emotion', '중립')
-    confidence = emotion_info.get('audio_conf', 0.5)
+    # 분석에 필요한 모델 (ModelRegistry 이름, 로딩 순서) + Whisper tier별 'whisper_<tier>'
+    MODEL_NAMES = ('tokenizer', 'emotion')
     
-    # 감정 분류
-    POSITIVE = ['기쁨', '행복', 'happiness', 'happy']
-    NEUTRAL = ['중립', 'neutral']
+    def __init__(self, registry=None, result_cache=None):
+        """
+        Args:
+            registry: ModelRegistry
+                - None: 지금 바로 모든 모델 로드 (스크립트/CLI용, 기존 동작)
+                - 지정: 모델 등록만 (서버가 registry.start()로 백그라운드 로딩)
+            result_cache: cache.ResultCache (같은 음성 재분석 생략, None이면 사용 안 함)
+        """
+        # GPU 체크
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        print(f"Device set to use {self.device}")
+        
+        # STT tier 선택 정책 + 동시 분석 건수 (대기열 없는 서버의 부하 지표)
+        self.stt_policy = STTTierPolicy()
+        self._inflight = 0
+        self._inflight_lock = threading.Lock()
+        
+        self.result_cache = result_cache
+        self.token_cache = TextCache('tokens', **MODELS['text_cache_options'])
+        self.scoring_engine = ScoringEngine()
+        
+        self.registry = registry or ModelRegistry(warmup=False)
+        self.register_models(self.registry)
+        
+        if registry is None:
+            print("⏳ 모델 로딩 중... (2-3분 소요)")
+            self.load_models()
+            print("✅ 모델 로딩 완료!")
     
-    # 점수 계산
-    if any(pos in final_emotion.lower() for pos in POSITIVE):
-        score = 80.0 + (confidence * 20.0)
-    elif any(neu in final_emotion.lower() for neu in NEUTRAL):
-        score = 70.0 + (confidence * 10.0)
-    else:  # 부정 감정
-        score = 60.0 - (confidence * 60.0)
+    def register_models(self, registry):
+        """레지스트리에 모델 로더 + 워밍업 등록"""
+        registry.register('tokenizer', self._load_tokenizer, warmup=self._warmup_tokenizer)
+        registry.register('emotion', EmotionEnsemble, warmup=self._warmup_emotion)
+        # 작은 tier부터 로딩 → 큰 모델 로딩 중에도 작은 tier로 먼저 서비스
+        for tier in self.stt_policy.tiers:
+            registry.register(
+                self._whisper_name(tier),
+                lambda tier=tier: self._load_whisper(tier),
+                warmup=self._warmup_whisper
+            )
     
-    return max(0.0, min(100.0, score))
-
-
-class SpeechAnalyzer:
-    """음성 분석기 (Whisper + KcELECTRA + 개선된 감정)"""
+    def _whisper_name(self, tier):
+        """tier → 레지스트리 이름"""
+        return f"whisper_{tier}"
     
-    def __init__(self):
-        print("⏳ 모델 로딩 중... (2-3분 소요)")
-        self.load_models()
-        print("✅ 모델 로딩 완료!")
+    def _all_model_names(self):
+        return self.MODEL_NAMES + tuple(self._whisper_name(t) for t in self.stt_policy.tiers)
     
     def load_models(self):
-        """모델 로드"""
-        # GPU 체크
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        print(f"Device set to use {self.device}")
+        """모델 로드 (모두 준비될 때까지 대기, 실패 시 ModelNotReadyError)"""
+        names = self._all_model_names()
+        self.registry.load_all(names)
+        for name in names:
+            self.registry.get(name)
+    
+    def is_ready(self):
+        """분석 가능한지 (토크나이저 + 감정 모델 + Whisper tier 1개 이상)"""
+        return self.registry.is_ready(*self.MODEL_NAMES) and bool(self.ready_stt_tiers())
+    
+    def ready_stt_tiers(self):
+        """로딩 완료된 Whisper tier"""
+        return [t for t in self.stt_policy.tiers if self.registry.is_ready(self._whisper_name(t))]
+    
+    def select_stt_tier(self, duration, queue_depth=0, stt_tier=None):
+        """
+        이번 요청에 쓸 Whisper tier 선택
         
-        # Whisper (STT)
-        whisper_model = MODELS['whisper']
-        self.processor = WhisperProcessor.from_pretrained(whisper_model)
-        self.model = WhisperForConditionalGeneration.from_pretrained(whisper_model).to(self.device)
+        Args:
+            duration: 음성 길이 (초, 배치는 가장 긴 발화)
+            queue_depth: 앞에 밀린 대기 건수 (스케줄러 대기열)
+                - 지금 진행 중인 다른 분석 건수도 더해서 판단
+            stt_tier: 직접 지정 (정책 무시)
         
-        # KcELECTRA (어휘 분석)
-        tokenizer_model = MODELS['tokenizer']
-        self.tokenizer = AutoTokenizer.from_pretrained(tokenizer_model)
+        Returns:
+            {'tier', 'reason', 'estimate_ms', 'queue_depth'}
+        """
+        if stt_tier is not None:
+            if stt_tier not in self.stt_policy.tiers:
+                raise ValueError(f"사용할 수 없는 STT tier: {stt_tier} (가능: {self.stt_policy.tiers})")
+            return {'tier': stt_tier, 'reason': 'requested', 'estimate_ms': None, 'queue_depth': queue_depth}
+        
+        with self._inflight_lock:
+            others = max(0, self._inflight - 1)
+        
+        decision = self.stt_policy.choose(duration, queue_depth + others, self.ready_stt_tiers())
+        print(f"   🎚️ STT tier: {decision['tier']} ({decision['reason']}, "
+              f"대기 {decision['queue_depth']}건, 예상 {decision['estimate_ms']:.0f}ms)")
+        return decision
+    
+    def text_cache_stats(self):
+        """짧은 문장 캐시 적중률 (토큰화 + 텍스트 감정, /health 용)"""
+        stats = {'tokens': self.token_cache.stats()}
+        if self.registry.is_ready('emotion'):
+            stats['text_emotion'] = self.emotion_engine.text_cache.stats()
+        return stats
+    
+    def _track_inflight(self, n):
+        with self._inflight_lock:
+            self._inflight += n
+    
+    # ========== 모델 접근 (준비 안 됐으면 로딩 완료까지 대기) ==========
+    
+    def _whisper_bundle(self, tier=None):
+        """tier의 Whisper 묶음 (None이면 기본 tier)"""
+        return self.registry.get(self._whisper_name(tier or self.stt_policy.default_tier))
+    
+    @property
+    def processor(self):
+        return self._whisper_bundle()['processor']
+    
+    @property
+    def model(self):
+        return self._whisper_bundle()['model']
+    
+    @property
+    def asr(self):
+        return self._whisper_bundle()['asr']
+    
+    @property
+    def whisper_timestamps(self):
+        return self._whisper_bundle()['return_timestamps']
+    
+    @property
+    def tokenizer(self):
+        return self.registry.get('tokenizer')
+    
+    @property
+    def emotion_engine(self):
+        return self.registry.get('emotion')
+    
+    # ========== 모델 로더 / 워밍업 ==========
+    
+    def _load_whisper(self, tier):
+        """Whisper (STT, tier 크기) + 청크 STT 파이프라인 (설정된 추론 백엔드)"""
+        whisper_model = MODELS['stt_tiers'][tier]
+        processor = WhisperProcessor.from_pretrained(whisper_model)
+        model, backend = load_model('whisper', self.device, model_name=whisper_model)
+        
+        # 단어 타임스탬프는 cross-attention이 필요 → ONNX 그래프는 구간 타임스탬프 사용
+        return_timestamps = MODELS['whisper_options']['return_timestamps']
+        if backend == 'onnx' and return_timestamps == 'word':
+            return_timestamps = True
+        
+        # 청크 STT (같은 Whisper 모델 재사용 - 30초 윈도우를 겹쳐서 자르고 배치 추론)
+        whisper_options = MODELS['whisper_options']
+        if backend == 'onnx':
+            from optimum.pipelines import pipeline as asr_pipeline
+        else:
+            asr_pipeline = pipeline
+        asr = asr_pipeline(
+            "automatic-speech-recognition",
+            model=model,
+            tokenizer=processor.tokenizer,
+            feature_extractor=processor.feature_extractor,
+            chunk_length_s=whisper_options['chunk_length_s'],
+            stride_length_s=whisper_options['stride_length_s'],
+            device=model.device
+        )
         
-        # 개선된 감정 분석 엔진 (PDF 기반)
-        self.emotion_engine = EmotionEnsemble()
+        return {
+            'tier': tier,
+            'processor': processor,
+            'model': model,
+            'asr': asr,
+            'backend': backend,
+            'return_timestamps': return_timestamps
+        }
+    
+    def _load_tokenizer(self):
+        """KcELECTRA (어휘 분석)"""
+        return AutoTokenizer.from_pretrained(MODELS['tokenizer'])
+    
+    def _warmup_audio(self, seconds=2.0):
+        """워밍업용 가짜 음성 (150Hz 톤 + 약한 잡음)"""
+        sr = TARGET_SR
+        t = np.arange(int(sr * seconds)) / sr
+        pcm = 0.1 * np.sin(2 * np.pi * 150 * t) + 0.005 * np.random.default_rng(0).standard_normal(len(t))
+        return AudioData(pcm, sr, "warmup", "warmup")
+    
+    def _warmup_whisper(self, bundle):
+        audio = self._warmup_audio()
+        bundle['asr'](
+            {'raw': audio.pcm, 'sampling_rate': audio.sample_rate},
+            return_timestamps=bundle['return_timestamps'],
+            generate_kwargs={'language': 'ko', 'task': 'transcribe'}
+        )
+    
+    def _warmup_tokenizer(self, tokenizer):
+        tokenizer.tokenize("안녕하세요 오늘 기분은 어떠세요")
+    
+    def _warmup_emotion(self, engine):
+        engine.predict(self._warmup_audio(), "안녕하세요 오늘 기분은 어떠세요")
     
-    def analyze(self, audio_path):
+    def analyze(self, audio, stt_tier=None):
         """
         음성 파일 분석 (main.py 호환용)
         
         Args:
-            audio_path: WAV 파일 경로
+            audio: WAV 파일 경로 | 업로드 원본 bytes | AudioData
+            stt_tier: Whisper tier 직접 지정 (None이면 정책이 선택)
         
         Returns:
             분석 결과 딕셔너리
         """
-        return self.analyze_audio(audio_path)
+        return self.analyze_audio(audio, stt_tier)
     
-    def analyze_audio(self, audio_path):
+    def analyze_audio(self, audio, stt_tier=None):
         """
         음성 파일 분석
         
         Args:
-            audio_path: WAV 파일 경로
+            audio: WAV 파일 경로 | 업로드 원본 bytes | AudioData
+                (여기서 한 번만 디코딩하고 모든 분석 단계가 공유)
+            stt_tier: Whisper tier 직접 지정 (None이면 정책이 선택)
         
         Returns:
-            분석 결과 딕셔너리
+            분석 결과 딕셔너리 (features.whisper.stt_tier = 사용한 tier)
+            결과 캐시 사용 시 'cached': 캐시(또는 진행 중인 같은 분석)에서 받았는지
+        """
+        self._track_inflight(1)
+        try:
+            # 0. 디코딩 (1회)
+            audio = load_audio(audio)
+            if self.result_cache is None:
+                return self._analyze_audio(audio, stt_tier)
+            
+            key = self.result_cache.make_key(audio.source_hash, stt_tier)
+            result, cached = self.result_cache.get_or_compute(
+                key, lambda: self._analyze_audio(audio, stt_tier),
+                should_store=lambda r: self._is_cacheable(r, stt_tier)
+            )
+            if cached:
+                print(f"⚡ 캐시된 분석 결과 사용: {audio}")
+            result['cached'] = cached
+            return result
+        finally:
+            self._track_inflight(-1)
+    
+    def _is_cacheable(self, result, stt_tier):
+        """
+        결과 캐시에 저장할지
+        - tier를 직접 지정한 요청은 키에 tier가 들어가므로 저장
+        - 정책이 부하 때문에 기본보다 작은 tier를 고른 결과는 저장하지 않음
+          (재시도 때 낮은 품질 결과가 TTL 동안 계속 나가지 않도록, 다음 요청은 다시 분석)
         """
+        if stt_tier is not None:
+            return True
+        return result['features']['whisper']['stt_tier'] == self.stt_policy.default_tier
+    
+    def _analyze_audio(self, audio, stt_tier=None):
         print("="*60)
-        print(f"🎤 분석 시작: {audio_path}")
+        print(f"🎤 분석 시작: {audio}")
         print("="*60)
         
-        # 1. Whisper 분석
+        # 0-1. 음성 구간 검출 (침묵/반응시간/VPR + Whisper·Pitch 입력 구간)
+        vad = detect_voice_activity(audio)
+        print(f"   🔈 {vad}")
+        
+        # 1. Whisper 분석 (tier 선택)
         print("\n[1/3] 📝 Whisper 분석 중...")
-        whisper_results = self._whisper_analysis(audio_path)
+        decision = self.select_stt_tier(audio.duration, stt_tier=stt_tier)
+        whisper_results = self._whisper_analysis(audio, vad, decision['tier'])
+        whisper_results['stt_policy'] = decision
         
         # 2. 어휘 분석
         print("\n[2/3] 📚 어휘력 분석 중...")
-        vocab_results = self._vocabulary_analysis(whisper_results['text'])
+        vocab_results = self.vocabulary_analysis(whisper_results['text'])
         
         # 3. 개선된 감정 분석 (PDF 기반)
         print("\n[3/3] ❤️ 개선된 감정 분석 중...")
-        emotion_results = self.emotion_engine.predict(audio_path, whisper_results['text'])
+        emotion_results = self.emotion_engine.predict(audio, whisper_results['text'], vad)
         print(f"      👉 최종 감정: {emotion_results['final_emotion']}")
         print(f"      👉 텍스트: {emotion_results['text_emotion']} ({emotion_results['text_conf']:.2f})")
         print(f"      👉 음성: {emotion_results['audio_emotion']} ({emotion_results['audio_conf']:.2f})")
@@ -120,10 +321,10 @@ class SpeechAnalyzer:
                 print(f"         • {reason}")
         
         # 4. 점수 계산 (감정 포함!)
-        scores = self._calculate_scores(whisper_results, vocab_results, emotion_results)
+        scores = self.calculate_scores(whisper_results, vocab_results, emotion_results)
         
         # 5. 결과 출력
-        self._print_scores(scores)
+        self.print_scores(scores)
         
         # 6. 결과 반환 (main.py 호환 구조)
         return {
@@ -135,78 +336,305 @@ class SpeechAnalyzer:
             'scores': scores
         }
     
-    def _whisper_analysis(self, audio_path):
-        """Whisper STT 분석"""
-        import librosa
-        
-        # 오디오 로드
-        audio, sr = librosa.load(audio_path, sr=16000)
-        duration = len(audio) / sr
-        
-        # Whisper 처리
-        input_features = self.processor(
-            audio, 
-            sampling_rate=16000, 
-            return_tensors="pt"
-        ).input_features.to(self.device)
-        
-        # 생성 (한국어 명시 + 경고 제거)
-        predicted_ids = self.model.generate(
-            input_features,
-            language="ko",
-            task="transcribe"
+    def analyze_batch(self, inputs, batch_size=None, stt_tier=None, queue_depth=0):
+        """
+        여러 음성 일괄 분석 (배치 추론)
+        
+        - 디코딩/Pitch는 CPU 코어 수만큼 병렬
+        - Whisper, 토크나이저, 텍스트/음성 감정 모델은 발화들을 묶어서 배치 실행
+        - 결과는 발화별 analyze_audio()와 같은 구조
+        
+        Args:
+            inputs: 파일 경로 | bytes | numpy 배열(16kHz) | AudioData 리스트
+            batch_size: Whisper 배치 크기 (None이면 설정값)
+            stt_tier: Whisper tier 직접 지정 (None이면 정책이 선택, 배치 전체 같은 tier)
+            queue_depth: 이 배치 뒤에 밀린 대기 건수 (MicroBatchScheduler.queue_depth)
+        
+        Returns:
+            분석 결과 딕셔너리 리스트 (inputs 순서 유지)
+        """
+        if not inputs:
+            return []
+        
+        self._track_inflight(len(inputs))
+        try:
+            if self.result_cache is None:
+                return self._analyze_batch(inputs, batch_size, stt_tier, queue_depth)
+            return self._analyze_batch_cached(inputs, batch_size, stt_tier, queue_depth)
+        finally:
+            self._track_inflight(-len(inputs))
+    
+    def _analyze_batch_cached(self, inputs, batch_size, stt_tier, queue_depth):
+        """캐시에 있는 발화는 건너뛰고, 같은 음성은 배치 안에서 1번만 분석"""
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            audios = list(executor.map(load_audio, inputs))
+        
+        keys = [self.result_cache.make_key(a.source_hash, stt_tier) for a in audios]
+        results = [self.result_cache.get(key) for key in keys]
+        
+        misses = {}  # key → 첫 위치
+        for i, (key, result) in enumerate(zip(keys, results)):
+            if result is None:
+                misses.setdefault(key, i)
+        
+        if len(misses) < len(audios):
+            print(f"⚡ 캐시된 분석 결과 사용: {len(audios) - len(misses)}/{len(audios)}개")
+        
+        computed = self._analyze_batch(
+            [audios[i] for i in misses.values()], batch_size, stt_tier, queue_depth
+        ) if misses else []
+        fresh = dict(zip(misses, computed))
+        for key, result in fresh.items():
+            if self._is_cacheable(result, stt_tier):
+                self.result_cache.put(key, result)
+        
+        out = []
+        for i, (key, result) in enumerate(zip(keys, results)):
+            if result is None:
+                result = fresh[key] if misses[key] == i else copy.deepcopy(fresh[key])
+                result['cached'] = misses[key] != i
+            else:
+                result['cached'] = True
+            out.append(result)
+        return out
+    
+    def _analyze_batch(self, inputs, batch_size, stt_tier, queue_depth):
+        print("="*60)
+        print(f"🎤 배치 분석 시작: {len(inputs)}개")
+        print("="*60)
+        
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            # 0. 디코딩 (병렬, 파일당 1회)
+            audios = list(executor.map(load_audio, inputs))
+            vads = list(executor.map(detect_voice_activity, audios))
+            
+            # 1. Whisper 분석 (배치, 가장 긴 발화 기준으로 tier 선택)
+            print(f"\n[1/3] 📝 Whisper 배치 분석 중... ({len(audios)}개)")
+            decision = self.select_stt_tier(max(a.duration for a in audios), queue_depth, stt_tier)
+            transcriptions = self.transcribe_batch(audios, batch_size, vads, decision['tier'])
+            whisper_list = [
+                self.whisper_metrics(audio, t, vad) for audio, t, vad in zip(audios, transcriptions, vads)
+            ]
+            for whisper_results in whisper_list:
+                whisper_results['stt_policy'] = decision
+            texts = [t['text'] for t in transcriptions]
+            
+            # 2. 어휘 분석 (배치 토큰화)
+            print("\n[2/3] 📚 어휘력 분석 중...")
+            vocab_list = self._vocabulary_batch(texts)
+            
+            # 3. 감정 분석 (배치 + Pitch 병렬)
+            print("\n[3/3] ❤️ 개선된 감정 배치 분석 중...")
+            emotion_list = self.emotion_engine.predict_batch(audios, texts, executor=executor, vads=vads)
+        
+        # 4. 점수 계산 (발화 전체 한 번에) + 발화별 결과 조립
+        scores_list = self.scoring_engine.score_batch([
+            self._score_features(w, v, e) for w, v, e in zip(whisper_list, vocab_list, emotion_list)
+        ])
+        
+        results = []
+        for audio, whisper_results, vocab_results, emotion_results, scores in zip(
+            audios, whisper_list, vocab_list, emotion_list, scores_list
+        ):
+            print(f"   • {audio}: {emotion_results['final_emotion']} / 평균 {scores['average']:.1f}점")
+            
+            results.append({
+                'features': {
+                    'whisper': whisper_results,
+                    'vocabulary': vocab_results, 
+                    'emotion': emotion_results
+                },
+                'scores': scores
+            })
+        
+        return results
+    
+    def _whisper_analysis(self, audio, vad=None, tier=None):
+        """Whisper STT 분석 (디코딩된 AudioData 사용)"""
+        transcription = self.transcribe_batch([audio], vads=[vad] if vad else None, tier=tier)[0]
+        return self.whisper_metrics(audio, transcription, vad)
+    
+    def transcribe_batch(self, audios, batch_size=None, vads=None, tier=None):
+        """
+        Whisper 청크 STT
+        
+        - VAD가 있으면 발화 구간(앞뒤 pad_sec 여유)만 이어붙여서 인식 (침묵 구간 연산 생략)
+        - 30초보다 긴 발화도 잘리지 않도록 30초 윈도우를 겹쳐서(stride) 나눔
+        - 모든 발화의 윈도우를 batch_size 단위로 묶어서 한 번에 generate
+        - 단어별 타임스탬프(원본 오디오 기준) → 구간(segment) 묶음
+        - tier: Whisper 크기 (None이면 기본 tier), 처리 시간은 정책 RTF에 반영
+        
+        Returns:
+            발화별 {'text', 'words', 'segments', 'stt_tier'} 리스트
+        """
+        tier = tier or self.stt_policy.default_tier
+        bundle = self._whisper_bundle(tier)
+        batch_size = batch_size or MODELS['batch_options']['whisper_batch_size']
+        pad_sec = MODELS['vad_options']['pad_sec']
+        vads = vads or [None] * len(audios)
+        
+        # 발화별 입력 구간 (VAD 없으면 전체, 발화가 없으면 인식 생략)
+        regions = []
+        for audio, vad in zip(audios, vads):
+            if vad is None:
+                regions.append([(0, len(audio.pcm))])
+            else:
+                regions.append(vad.voiced_regions(pad_sec))
+        
+        targets = [i for i, r in enumerate(regions) if r]
+        results = [{'text': '', 'words': [], 'segments': [], 'stt_tier': tier} for _ in audios]
+        if not targets:
+            return results
+        
+        inputs = [
+            {'raw': extract_regions(audios[i].pcm, regions[i]), 'sampling_rate': audios[i].sample_rate}
+            for i in targets
+        ]
+        start = time.perf_counter()
+        outputs = bundle['asr'](
+            inputs,
+            batch_size=batch_size,
+            return_timestamps=bundle['return_timestamps'],
+            generate_kwargs={'language': 'ko', 'task': 'transcribe'}  # 한국어 명시 + 경고 제거
+        )
+        # RTF는 실제로 Whisper에 넣은 길이(발화 구간) 기준 (침묵이 긴 음성도 추정치가 부풀지 않도록)
+        self.stt_policy.observe(
+            tier,
+            sum(len(x['raw']) / x['sampling_rate'] for x in inputs),
+            (time.perf_counter() - start) * 1000
         )
-        transcription = self.processor.batch_decode(
-            predicted_ids, 
-            skip_special_tokens=True
-        )[0]
+        
+        for i, output in zip(targets, outputs):
+            results[i] = self._parse_transcription(output, regions[i], audios[i].sample_rate)
+            results[i]['stt_tier'] = tier
+        return results
+    
+    def _parse_transcription(self, output, regions, sample_rate):
+        """파이프라인 출력 → 텍스트 + 단어/구간 타임스탬프 (원본 오디오 시간으로 복원)"""
+        words = []
+        for chunk in output.get('chunks', []):
+            start, end = chunk['timestamp']
+            word = chunk['text'].strip()
+            if not word or start is None:
+                continue
+            # 마지막 단어는 끝 시간이 없을 수 있음
+            if end is None:
+                end = start
+            words.append({
+                'word': word,
+                'start': to_original_time(float(start), regions, sample_rate),
+                'end': to_original_time(float(end), regions, sample_rate)
+            })
+        
+        return {
+            'text': output['text'].strip(),
+            'words': words,
+            'segments': self.group_segments(words)
+        }
+    
+    def group_segments(self, words):
+        """단어 간격이 segment_gap_sec보다 길면 새 구간으로 나눔"""
+        gap_sec = MODELS['whisper_options']['segment_gap_sec']
+        segments = []
+        
+        for w in words:
+            if segments and w['start'] - segments[-1]['end'] <= gap_sec:
+                segments[-1]['end'] = max(segments[-1]['end'], w['end'])
+                segments[-1]['text'] += ' ' + w['word']
+            else:
+                segments.append({'start': w['start'], 'end': w['end'], 'text': w['word']})
+        
+        return segments
+    
+    def whisper_metrics(self, audio, transcription, vad=None):
+        """STT 결과(transcribe_batch) + VAD → 발화 지표"""
+        duration = audio.duration
+        text = transcription['text']
         
         # 단어 분석
-        words = transcription.split()
+        words = text.split()
         word_count = len(words)
         
         # WPM 계산
         wpm = (word_count / duration) * 60 if duration > 0 else 0
         
-        # 반응시간 (첫 단어까지 시간 - 간단 추정)
-        response_time = 0.0
-        
-        # 침묵 분석 (간단 추정)
-        avg_silence = max(0, duration - (word_count * 0.5))
-        
-        # VPR (Vocalization-to-Pause Ratio) 계산 - 추가!
-        # Reference: Mundt et al. (2007)
-        vpr = duration / (avg_silence + 0.01) if avg_silence > 0 else duration * 100
-        
-        print(f"      ✓ 텍스트: {transcription}")
+        timed_words = transcription['words']
+        
+        if vad is not None:
+            # VAD 측정값: 첫 발화까지 침묵 / 발화 사이 평균 침묵 / 발화시간÷침묵시간
+            # Reference: Mundt et al. (2007)
+            response_time = vad.leading_silence
+            avg_silence = vad.avg_silence
+            vpr = vad.vpr
+        else:
+            # 반응시간 (첫 단어 시작 타임스탬프)
+            response_time = timed_words[0]['start'] if timed_words else 0.0
+            
+            # 침묵 분석 (간단 추정)
+            avg_silence = max(0, duration - (word_count * 0.5))
+            
+            # VPR (Vocalization-to-Pause Ratio) 계산 - 추가!
+            # Reference: Mundt et al. (2007)
+            vpr = duration / (avg_silence + 0.01) if avg_silence > 0 else duration * 100
+        
+        print(f"      ✓ 텍스트: {text}")
         print(f"      ✓ 단어 수: {word_count}개")
         print(f"      ✓ WPM: {wpm:.1f}")
         print(f"      ✓ 발화시간: {duration:.2f}초")
         print(f"      ✓ 반응시간: {response_time:.2f}초")
         print(f"      ✓ 평균침묵: {avg_silence:.2f}초")
         print(f"      ✓ VPR (활력도): {vpr:.2f}")  # 추가!
+        print(f"      ✓ 구간: {len(transcription['segments'])}개")
         
         return {
-            'text': transcription,
+            'text': text,
             'word_count': word_count,
             'wpm': wpm,
             'duration': duration,
             'response_time': response_time,
             'avg_silence': avg_silence,
-            'vpr': vpr  # VPR 추가!
+            'vpr': vpr,  # VPR 추가!
+            'words': timed_words,                  # [{'word', 'start', 'end'}] (초)
+            'segments': transcription['segments'],  # [{'text', 'start', 'end'}] (초)
+            'vad': vad.to_dict() if vad is not None else None,  # 발화 구간, 침묵 분포
+            'stt_tier': transcription.get('stt_tier')  # 사용한 Whisper 크기 (품질 감사용)
         }
     
-    def _vocabulary_analysis(self, text):
+    def vocabulary_analysis(self, text):
         """어휘 다양성 분석"""
-        if not text:
+        # 토큰화 (짧은 반복 문장은 캐시)
+        tokens = self.token_cache.get_or_compute(text, self._tokenize) if text else []
+        return self._vocabulary_metrics(tokens)
+    
+    def _vocabulary_batch(self, texts):
+        """어휘 다양성 분석 (캐시에 없는 문장만 한 번에 토큰화)"""
+        nonempty = [text for text in texts if text]
+        token_lists = iter(self.token_cache.get_many(nonempty, self._tokenize_batch) if nonempty else [])
+        return [
+            self._vocabulary_metrics(next(token_lists) if text else None)
+            for text in texts
+        ]
+    
+    def _tokenize(self, text):
+        return tuple(self.tokenizer.tokenize(text))
+    
+    def _tokenize_batch(self, texts):
+        """여러 문장 토큰화 (fast 토크나이저면 1번에)"""
+        if not getattr(self.tokenizer, 'is_fast', False):
+            return [self._tokenize(text) for text in texts]
+        
+        encodings = self.tokenizer(list(texts), add_special_tokens=False)
+        return [tuple(encodings.tokens(i)) for i in range(len(texts))]
+    
+    def _vocabulary_metrics(self, tokens):
+        """토큰 리스트 → TTR 지표"""
+        if not tokens:
             return {
                 'total_tokens': 0,
                 'unique_tokens': 0,
                 'ttr': 0.0
             }
         
-        # 토큰화
-        tokens = self.tokenizer.tokenize(text)
         total_tokens = len(tokens)
         unique_tokens = len(set(tokens))
         
@@ -223,57 +651,17 @@ class SpeechAnalyzer:
             'ttr': ttr
         }
     
-    def _calculate_scores(self, whisper_results, vocab_results, emotion_results):
-        """점수 계산 (감정 + VPR 포함!)"""
-        criteria = SCORING_CRITERIA
-        
-        scores = {
-            'speed': calculate_score(
-                whisper_results['wpm'],
-                criteria['speed']['optimal_min'],
-                criteria['speed']['optimal_max']
-            ),
-            'duration': calculate_score(
-                whisper_results['duration'],
-                criteria['duration']['optimal_min'],
-                criteria['duration']['optimal_max']
-            ),
-            'response': calculate_score(
-                whisper_results['response_time'],
-                criteria['response']['optimal_min'],
-                criteria['response']['optimal_max']
-            ),
-            'word_count': calculate_score(
-                whisper_results['word_count'],
-                criteria['word_count']['optimal_min'],
-                criteria['word_count']['optimal_max']
-            ),
-            'vocabulary': calculate_score(
-                vocab_results['ttr'],
-                criteria['vocabulary']['optimal_min'],
-                criteria['vocabulary']['optimal_max']
-            ),
-            'silence': calculate_score(
-                whisper_results['avg_silence'],
-                criteria['silence']['optimal_min'],
-                criteria['silence']['optimal_max']
-            ),
-            # 감정 점수 (기존)
-            'emotion': calculate_emotion_score(emotion_results),
-            # VPR 점수 (추가!)
-            'vitality': calculate_score(
-                whisper_results['vpr'],
-                criteria['vitality']['optimal_min'],
-                criteria['vitality']['optimal_max']
-            )
-        }
-        
-        # 평균 점수
-        scores['average'] = sum(scores.values()) / len(scores)
-        
-        return scores
+    def _score_features(self, whisper_results, vocab_results, emotion_results):
+        """채점용 특징값 (ScoringEngine 입력)"""
+        return score_features(whisper_results, vocab_results, emotion_results)
+    
+    def calculate_scores(self, whisper_results, vocab_results, emotion_results):
+        """점수 계산 (감정 + VPR 포함!, 평균 + 가중 평균)"""
+        return self.scoring_engine.score(
+            self._score_features(whisper_results, vocab_results, emotion_results)
+        )
     
-    def _print_scores(self, scores):
+    def print_scores(self, scores):
         """점수 출력"""
         print("\n" + "="*60)
         print("📊 최종 점수")
@@ -288,6 +676,7 @@ class SpeechAnalyzer:
         print(f"활력도(VPR):  {scores['vitality']:.1f}점  ← 논문 기반!")  # 추가!
         print()
         print(f"🎯 평균 점수: {scores['average']:.1f}점")
+        print(f"⚖️ 가중 평균: {scores['weighted_average']:.1f}점")
         print("="*60)
 
 
@@ -0,0 +1,416 @@
+"""
+비동기 MySQL 핸들러 (FastAPI 서버용)
+- async def 핸들러에서 pymysql을 직접 부르면 쿼리 동안 이벤트 루프 전체가 멈춤
+  → aiomysql 커넥션 풀로 await 가능한 save_analysis / get_recent_analyses / latest_sensing 제공
+- 쿼리/파라미터는 동기 핸들러(db_handler.VoiceDBHandler)와 같은 db_queries 사용
+- MySQL 없이 테스트: backend='sqlite' (표준 sqlite3를 워커 스레드에서 실행, 같은 인터페이스)
+
+사용 예:
+    db = build_async_db_handler(ASYNC_DB_CONFIG)
+    if await db.connect():
+        voice_id = await db.save_analysis(senior_id, analysis_result, sensing_id)
+    await db.close()
+
+설정: config/db_config.py의 ASYNC_DB_CONFIG (풀 크기는 DB_POOL_CONFIG 공유)
+"""
+
+import asyncio
+import sqlite3
+from contextlib import asynccontextmanager
+
+from config.db_config import DB_CONFIG, DB_POOL_CONFIG
+from config.serving import SENSOR_STATE_CONFIG
+from db_queries import (
+    VOICE_LOG_SQL, ANALYSIS_SQL, VOICE_SCORE_SQL, RECENT_ANALYSES_SQL, LATEST_SENSING_SQL,
+    voice_log_params, analysis_params, voice_score_params, print_saved
+)
+from sensor_state import SensorStateStore
+
+try:
+    import aiomysql
+except ImportError:  # backend='sqlite'만 쓸 때는 없어도 됨
+    aiomysql = None
+
+
+# 재시도해도 되는 연결 오류 (db_handler.RETRYABLE_ERRORS와 동일)
+RETRYABLE_ERRORS = (2003, 2006, 2013, 2055)
+
+
+class MySQLBackend:
+    """aiomysql 커넥션 풀"""
+
+    name = 'mysql'
+
+    def __init__(self, db_config, pool_config):
+        self.db_config = db_config
+        self.pool_config = pool_config
+        self.pool = None
+
+    async def open(self):
+        if aiomysql is None:
+            raise RuntimeError("aiomysql이 설치되지 않았습니다 (pip install aiomysql)")
+        self.pool = await aiomysql.create_pool(
+            host=self.db_config['host'],
+            port=self.db_config.get('port', 3306),
+            user=self.db_config['user'],
+            password=self.db_config['password'],
+            db=self.db_config['database'],
+            charset=self.db_config.get('charset', 'utf8mb4'),
+            minsize=self.pool_config['min_size'],
+            maxsize=self.pool_config['max_size'],
+            pool_recycle=int(self.pool_config['max_lifetime']),  # 최대 수명 넘은 연결은 교체
+            autocommit=False
+        )
+
+    @asynccontextmanager
+    async def transaction(self):
+        """연결 1개 + 커서 → 성공하면 commit, 실패하면 rollback"""
+        async with self.pool.acquire() as conn:
+            cursor = await conn.cursor()
+            try:
+                yield cursor
+                await conn.commit()
+            except BaseException as e:
+                if self.is_connection_error(e):
+                    conn.close()  # 끊긴 연결은 풀이 반납 시 버림
+                else:
+                    await conn.rollback()
+                raise
+            finally:
+                await cursor.close()
+
+    def is_connection_error(self, e):
+        if isinstance(e, aiomysql.InterfaceError):
+            return True
+        return isinstance(e, aiomysql.OperationalError) and bool(e.args) and e.args[0] in RETRYABLE_ERRORS
+
+    def stats(self):
+        if self.pool is None:
+            return {'backend': self.name, 'size': 0}
+        return {
+            'backend': self.name,
+            'size': self.pool.size,
+            'idle': self.pool.freesize,
+            'in_use': self.pool.size - self.pool.freesize,
+            'max_size': self.pool.maxsize
+        }
+
+    async def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            await self.pool.wait_closed()
+            self.pool = None
+
+
+class _SQLiteCursor:
+    """sqlite3 커서를 aiomysql 커서처럼 (await execute/fetch, %s → ?)"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    async def execute(self, sql, args=None):
+        await asyncio.to_thread(self._cursor.execute, sql.replace('%s', '?'), args or ())
+
+    async def fetchone(self):
+        return await asyncio.to_thread(self._cursor.fetchone)
+
+    async def fetchall(self):
+        return await asyncio.to_thread(self._cursor.fetchall)
+
+
+class SQLiteBackend:
+    """
+    로컬 테스트용 대체 DB (표준 sqlite3, 파일 1개)
+    - 쿼리는 워커 스레드에서 실행 → 이벤트 루프를 막지 않음
+    - 연결 1개를 트랜잭션 단위로 순서대로 사용 (asyncio.Lock)
+    """
+
+    name = 'sqlite'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tb_voice_log (
+            voice_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            senior_id INTEGER,
+            sensing_id INTEGER,
+            voice_text TEXT,
+            response_time_sec REAL,
+            utterance_length REAL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS tb_analysis (
+            analysis_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            voice_idx INTEGER,
+            emotion_label TEXT,
+            stt_text TEXT,
+            behavior_policy TEXT,
+            hap_ratio REAL, sad_ratio REAL, neu_ratio REAL, ang_ratio REAL,
+            anxi_ratio REAL, emba_ratio REAL, heart_ratio REAL
+        );
+        CREATE TABLE IF NOT EXISTS tb_voice_score (
+            voice_id INTEGER PRIMARY KEY,
+            features_json TEXT,
+            feature_source TEXT,
+            scores_json TEXT,
+            average_score REAL,
+            weighted_score REAL,
+            criteria_version TEXT,
+            scored_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS tb_sensing (
+            sensing_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sensor_id INTEGER,
+            sensing_type TEXT,
+            sensing_value TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS tb_device (
+            device_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            senior_id INTEGER,
+            device_name TEXT
+        );
+        CREATE TABLE IF NOT EXISTS tb_sensor (
+            sensor_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            device_id INTEGER,
+            sensor_type TEXT
+        );
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = None
+        self._lock = None
+
+    async def open(self):
+        def _open():
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.executescript(self.SCHEMA)
+            return conn
+        self.conn = await asyncio.to_thread(_open)
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def transaction(self):
+        async with self._lock:
+            cursor = _SQLiteCursor(self.conn.cursor())
+            try:
+                yield cursor
+                await asyncio.to_thread(self.conn.commit)
+            except BaseException:
+                await asyncio.to_thread(self.conn.rollback)
+                raise
+
+    def is_connection_error(self, e):
+        return False
+
+    def stats(self):
+        return {'backend': self.name, 'path': self.path}
+
+    async def close(self):
+        if self.conn is not None:
+            await asyncio.to_thread(self.conn.close)
+            self.conn = None
+
+
+class AsyncVoiceDBHandler:
+    """음성 분석 결과 비동기 DB 핸들러 (VoiceDBHandler와 같은 메서드, await로 호출)"""
+
+    def __init__(self, backend, retries=2, retry_delay=0.2, sensor_state=None):
+        """
+        Args:
+            backend: MySQLBackend 또는 SQLiteBackend
+            retries: 연결 오류 시 재시도 횟수
+            retry_delay: 재시도 간격 (초, 재시도마다 2배)
+            sensor_state: sensor_state.SensorStateStore (None이면 새로 생성)
+        """
+        self.backend = backend
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.sensor_state = sensor_state or SensorStateStore(**SENSOR_STATE_CONFIG)
+
+    async def connect(self):
+        """풀 생성 + 연결 확인 (서버 시작 시 1회)"""
+        try:
+            await self.backend.open()
+            await self._run(lambda cursor: cursor.execute("SELECT 1"))
+            print(f"✅ DB 연결 성공 (비동기, {self.backend.name})")
+            return True
+        except Exception as e:
+            print(f"❌ DB 연결 실패: {e}")
+            return False
+
+    def transaction(self):
+        """
+        트랜잭션 범위 (여러 쿼리를 한 번에 확정할 때)
+
+        사용 예:
+            async with db.transaction() as cursor:
+                await cursor.execute(...)
+        """
+        return self.backend.transaction()
+
+    async def _run(self, work):
+        """
+        await work(cursor)를 트랜잭션 안에서 실행 (연결 오류면 재시도)
+        commit 도중 끊긴 경우도 재시도하지 않도록 work 안의 오류만 재시도
+        """
+        for attempt in range(self.retries + 1):
+            failed_in_work = False
+            try:
+                async with self.backend.transaction() as cursor:
+                    try:
+                        return await work(cursor)
+                    except BaseException:
+                        failed_in_work = True
+                        raise
+            except Exception as e:
+                retry = failed_in_work and self.backend.is_connection_error(e)
+                if retry and attempt < self.retries:
+                    print(f"⚠️ DB 연결 오류 → 재연결 후 재시도 ({attempt + 1}/{self.retries}): {e}")
+                    await asyncio.sleep(self.retry_delay * (2 ** attempt))
+                    continue
+                raise
+
+    # ========== 저장 / 조회 ==========
+
+    async def save_analysis(self, senior_id, analysis_result, sensing_id=None):
+        """
+        분석 결과를 DB에 저장
+
+        Returns:
+            voice_id: 성공 시 저장된 voice_id
+            None: 실패 시
+        """
+        if sensing_id is None:
+            sensing_id = 0
+
+        async def work(cursor):
+            # tb_voice_log → voice_id → tb_analysis (한 트랜잭션)
+            await cursor.execute(VOICE_LOG_SQL, voice_log_params(senior_id, sensing_id, analysis_result))
+            voice_id = cursor.lastrowid
+            await cursor.execute(ANALYSIS_SQL, analysis_params(voice_id, analysis_result))
+            return voice_id
+
+        try:
+            voice_id = await self._run(work)
+        except Exception as e:
+            print(f"\n❌ DB 저장 실패: {e}")
+            return None
+
+        # 채점 특징 + 점수 (재채점용, 실패해도 분석 저장은 유지)
+        await self._save_scores(voice_id, analysis_result)
+
+        print_saved(voice_id, sensing_id, analysis_result)
+        return voice_id
+
+    async def _save_scores(self, voice_id, analysis_result):
+        """tb_voice_score에 채점 특징/점수 저장"""
+        try:
+            params = voice_score_params(voice_id, analysis_result)
+            await self._run(lambda cursor: cursor.execute(VOICE_SCORE_SQL, params))
+        except Exception as e:
+            # 테이블이 없으면 python db_migrate.py 필요
+            print(f"⚠️ 점수 저장 생략 (tb_voice_score): {e}")
+
+    async def get_recent_analyses(self, senior_id, limit=10):
+        """최근 분석 결과 조회 (튜플 리스트, VoiceDBHandler와 같은 컬럼 순서)"""
+        async def work(cursor):
+            await cursor.execute(RECENT_ANALYSES_SQL, (senior_id, limit))
+            return list(await cursor.fetchall())
+
+        try:
+            return await self._run(work)
+        except Exception as e:
+            print(f"❌ 조회 실패: {e}")
+            return []
+
+    async def latest_sensing(self, senior_id=None):
+        """
+        최신 센서 데이터의 sensing_id (없으면 None)
+
+        Args:
+            senior_id: 어르신 ID (센서 상태 캐시에서 조회, None이면 전체 최신 1건)
+
+        Raises:
+            조회 실패 시 DB 예외
+        """
+        if senior_id is not None:
+            state = await self._run(lambda cursor: self.sensor_state.refresh_async(cursor, senior_id))
+            return state.latest_sensing_id
+
+        async def work(cursor):
+            await cursor.execute(LATEST_SENSING_SQL)
+            row = await cursor.fetchone()
+            return row[0] if row else None
+
+        return await self._run(work)
+
+    def stats(self):
+        """풀 상태 (/health 용)"""
+        return self.backend.stats()
+
+    def sensor_state_stats(self):
+        """센서 상태 캐시 (/health 용)"""
+        return self.sensor_state.stats()
+
+    async def close(self):
+        """풀 종료"""
+        await self.backend.close()
+        print("✅ DB 연결 종료")
+
+
+def build_async_db_handler(config):
+    """ASYNC_DB_CONFIG → AsyncVoiceDBHandler"""
+    if config['backend'] == 'sqlite':
+        backend = SQLiteBackend(config['sqlite_path'])
+    else:
+        backend = MySQLBackend(DB_CONFIG, DB_POOL_CONFIG)
+    return AsyncVoiceDBHandler(backend, retries=config.get('retries', 2))
+
+
+# ========== 테스트 (MySQL 없이 SQLite로) ==========
+if __name__ == "__main__":
+    import time
+
+    def fake_result(i):
+        return {
+            'features': {
+                'whisper': {
+                    'text': f"오늘 점심은 맛있게 먹었어요 {i}",
+                    'response_time': 1.2, 'duration': 3.4, 'wpm': 90.0,
+                    'word_count': 5, 'avg_silence': 0.4, 'vpr': 4.0
+                },
+                'vocabulary': {'ttr': 0.8},
+                'emotion': {'final_emotion': '기쁨', 'audio_conf': 0.7, 'candidates': {'기쁨': 0.7, '중립': 0.3}}
+            },
+            'scores': {'average': 80.0, 'weighted_average': 81.0}
+        }
+
+    async def main():
+        db = build_async_db_handler({'backend': 'sqlite', 'sqlite_path': ':memory:'})
+        if not await db.connect():
+            return
+
+        async with db.transaction() as cursor:
+            await cursor.execute("INSERT INTO tb_device (senior_id, device_name) VALUES (%s, %s)", (1, '거실'))
+            await cursor.execute("INSERT INTO tb_sensor (device_id, sensor_type) VALUES (%s, %s)", (1, 'motion'))
+            await cursor.execute("INSERT INTO tb_sensing (sensor_id, sensing_type, sensing_value) VALUES (%s, %s, %s)",
+                                 (1, 'motion', '1'))
+
+        # 동시 저장 20건 (이벤트 루프는 계속 돌아감)
+        start = time.perf_counter()
+        voice_ids = await asyncio.gather(*(db.save_analysis(1, fake_result(i), 1) for i in range(20)))
+        elapsed = (time.perf_counter() - start) * 1000
+
+        recent = await db.get_recent_analyses(senior_id=1, limit=5)
+        print(f"\n저장 {len([v for v in voice_ids if v])}건 ({elapsed:.1f}ms), voice_id 중복 없음: {len(set(voice_ids)) == 20}")
+        print(f"최근 분석 {len(recent)}건: {[r[4] for r in recent]}")
+        print(f"최신 sensing_id: {await db.latest_sensing()} (어르신 1: {await db.latest_sensing(senior_id=1)})")
+        print(f"센서 상태 캐시: {db.sensor_state_stats()}")
+        print(f"상태: {db.stats()}")
+        await db.close()
+
+    asyncio.run(main())
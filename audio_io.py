@@ -0,0 +1,134 @@
+"""
+오디오 입력 모듈
+- 업로드/녹음 음성을 한 번만 디코딩해서 Whisper, 감정, 피치 분석이 공유
+- 파일 경로, 원본 바이트(업로드), numpy 배열 모두 지원
+"""
+
+import io
+import os
+import glob
+import hashlib
+import tempfile
+
+import numpy as np
+
+
+# 모든 분석 모델(Whisper, wav2vec2)이 16kHz 입력을 사용
+TARGET_SR = 16000
+
+
+class AudioData:
+    """
+    디코딩된 오디오 (메모리 상주)
+
+    Attributes:
+        pcm: float32 모노 PCM 배열 (-1.0 ~ 1.0)
+        sample_rate: 샘플링 레이트
+        duration: 길이 (초)
+        source_hash: 원본 바이트의 SHA-256 (같은 업로드 식별용)
+        source_name: 원본 이름 (파일 경로 등, 로그용)
+    """
+
+    def __init__(self, pcm, sample_rate, source_hash, source_name=None):
+        self.pcm = np.ascontiguousarray(pcm, dtype=np.float32)
+        self.sample_rate = sample_rate
+        self.duration = len(self.pcm) / sample_rate if sample_rate else 0.0
+        self.source_hash = source_hash
+        self.source_name = source_name
+
+    def __len__(self):
+        return len(self.pcm)
+
+    def __repr__(self):
+        name = self.source_name or self.source_hash[:12]
+        return f"AudioData({name}, {self.duration:.2f}s, {self.sample_rate}Hz)"
+
+
+def load_audio(source, sr=TARGET_SR, name=None):
+    """
+    음성 입력을 AudioData로 변환 (디코딩 + 리샘플링 1회)
+
+    Args:
+        source: AudioData | 파일 경로(str) | bytes/bytearray | file-like | np.ndarray
+            - np.ndarray는 이미 sr로 샘플링된 PCM으로 간주
+        sr: 목표 샘플링 레이트 (기본 16000)
+        name: 로그용 이름 (없으면 경로 또는 해시 사용)
+
+    Returns:
+        AudioData
+    """
+    if isinstance(source, AudioData):
+        return source
+
+    if isinstance(source, np.ndarray):
+        pcm = np.asarray(source, dtype=np.float32)
+        source_hash = hashlib.sha256(pcm.tobytes()).hexdigest()
+        return AudioData(pcm, sr, source_hash, name)
+
+    suffix = ""
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        with open(path, "rb") as f:
+            data = f.read()
+        name = name or path
+        suffix = os.path.splitext(path)[1]
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source)
+    elif hasattr(source, "read"):
+        data = source.read()
+        name = name or getattr(source, "filename", None) or getattr(source, "name", None)
+        if isinstance(name, str):
+            suffix = os.path.splitext(name)[1]
+    else:
+        raise TypeError(f"지원하지 않는 오디오 입력 타입: {type(source).__name__}")
+
+    source_hash = hashlib.sha256(data).hexdigest()
+    pcm = _decode_bytes(data, sr, suffix)
+    return AudioData(pcm, sr, source_hash, name)
+
+
+def _decode_bytes(data, sr, suffix=""):
+    """
+    바이트 → float32 PCM 디코딩
+
+    soundfile(WAV/FLAC/OGG)로 메모리에서 바로 디코딩하고,
+    webm/m4a처럼 soundfile이 못 읽는 포맷만 임시 파일을 거쳐 audioread로 처리
+    """
+    import librosa
+
+    try:
+        y, _ = librosa.load(io.BytesIO(data), sr=sr)
+        return y
+    except Exception:
+        pass
+
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix or ".bin") as tmp_file:
+            tmp_file.write(data)
+            tmp_path = tmp_file.name
+        y, _ = librosa.load(tmp_path, sr=sr)
+        return y
+    finally:
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def collect_audio_files(paths, pattern="*.wav"):
+    """
+    파일/폴더 목록에서 음성 파일 경로 수집 (테스트 스크립트용)
+
+    Args:
+        paths: 파일 또는 폴더 경로 리스트
+        pattern: 폴더에서 찾을 파일 패턴
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, pattern))))
+        elif os.path.isfile(path):
+            files.append(path)
+    return files
@@ -11,6 +11,8 @@ import numpy as np
 import time
 from datetime import datetime
 
+from vad import calculate_rms, hybrid_threshold
+
 
 class AudioRecorder:
     """실시간 음성 녹음기 (상대적 침묵 감지)"""
@@ -93,13 +95,15 @@ class AudioRecorder:
             print("\n⚠️  배경 소음 측정 실패 - 기본값 사용")
             return 100.0
     
-    def record_until_silence(self, output_filename=None, max_duration=60):
+    def record_until_silence(self, output_filename=None, max_duration=60, on_chunk=None):
         """
         침묵이 감지될 때까지 녹음 (상대적 침묵 감지)
         
         Args:
             output_filename: 저장할 파일 이름 (None이면 자동 생성)
             max_duration: 최대 녹음 시간 (초)
+            on_chunk: 청크(int16 바이트)마다 호출할 콜백 (예: StreamingSession.feed)
+                - 저장되는 WAV와 같은 청크가 같은 순서로 전달됨
         
         Returns:
             filename: 저장된 파일 경로
@@ -162,6 +166,10 @@ class AudioRecorder:
                 data = stream.read(self.chunk_size, exception_on_overflow=False)
                 frames.append(data)
                 
+                # 스트리밍 분석으로 전달 (녹음 중 미리 분석)
+                if on_chunk:
+                    on_chunk(data)
+                
                 # RMS 계산
                 rms = self._calculate_rms(data)
                 
@@ -172,10 +180,7 @@ class AudioRecorder:
                     # 동적 임계값 업데이트 (하이브리드 방식!)
                     if self.auto_calibrate and self.background_rms:
                         # 배경의 2배 vs 최대값의 20% 중 더 높은 값
-                        self.current_threshold = max(
-                            self.background_rms * 2.0,  # 배경 기반
-                            self.max_rms * 0.2          # 발화 기반
-                        )
+                        self.current_threshold = hybrid_threshold(self.background_rms, self.max_rms)
                 
                 # 침묵 판정
                 is_silent = rms < self.current_threshold
@@ -254,26 +259,8 @@ class AudioRecorder:
             rms: RMS 값
         """
         try:
-            audio_array = np.frombuffer(audio_data, dtype=np.int16)
-            
-            # 빈 배열 체크
-            if len(audio_array) == 0:
-                return 0.0
-            
-            # RMS 계산
-            mean_square = np.mean(audio_array.astype(np.float64)**2)
-            
-            # NaN/inf 체크
-            if np.isnan(mean_square) or np.isinf(mean_square) or mean_square < 0:
-                return 0.0
-            
-            rms = np.sqrt(mean_square)
-            
-            # 최종 NaN 체크
-            if np.isnan(rms) or np.isinf(rms):
-                return 0.0
-            
-            return float(rms)
+            # VAD 모듈과 같은 계산 (빈 배열/NaN → 0.0)
+            return calculate_rms(audio_data)
         
         except Exception:
             # 에러 발생 시 안전한 값 반환
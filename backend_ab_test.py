@@ -0,0 +1,165 @@
+"""
+추론 백엔드 동등성 A/B 테스트
+A: PyTorch fp32 (기준)
+B: int8 동적 양자화 또는 ONNX Runtime
+
+같은 음성 파일을 두 백엔드로 분석해서
+STT 결과(문자 오류율), 감정 레이블, 확신도, 종합 점수가 허용 오차 안인지 확인
+
+사용법: python backend_ab_test.py [int8|onnx] [파일 또는 폴더 ...]
+"""
+
+import os
+import sys
+import time
+
+from audio_io import load_audio, collect_audio_files
+from analyzer import SpeechAnalyzer
+from config.models import MODELS
+from model_registry import ModelRegistry
+
+
+DEFAULT_DIRS = ["./recordings", "./data"]
+
+# 허용 오차
+TOLERANCE = {
+    'cer': 0.10,      # STT 문자 오류율 (기준 텍스트 대비)
+    'conf': 0.05,     # 텍스트/음성 감정 확신도 차이
+    'score': 2.0,     # 종합 점수 차이 (점)
+}
+
+
+def build_analyzer(backend):
+    """지정한 백엔드로 모든 모델을 로드한 SpeechAnalyzer"""
+    options = MODELS['inference_options']
+    options['backend'] = backend
+    options['overrides'] = {}
+
+    # 같은 Whisper 크기끼리 비교 (기본 tier만 로드)
+    policy = MODELS['stt_policy']
+    policy['enabled_tiers'] = [policy['default_tier']]
+
+    analyzer = SpeechAnalyzer(registry=ModelRegistry(warmup=False))
+    analyzer.load_models()
+    return analyzer
+
+
+def char_error_rate(reference, hypothesis):
+    """문자 오류율 (공백 제외 편집 거리 / 기준 길이)"""
+    ref = reference.replace(" ", "")
+    hyp = hypothesis.replace(" ", "")
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    prev = list(range(len(hyp) + 1))
+    for i, rc in enumerate(ref, 1):
+        cur = [i]
+        for j, hc in enumerate(hyp, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (rc != hc)))
+        prev = cur
+    return prev[-1] / len(ref)
+
+
+def analyze_timed(analyzer, audio):
+    """분석 결과 + 소요 시간(ms)"""
+    start = time.perf_counter()
+    result = analyzer.analyze(audio)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def compare(ref, cand):
+    """두 분석 결과 비교 → 지표 + 통과 여부"""
+    ref_emotion = ref['features']['emotion']
+    cand_emotion = cand['features']['emotion']
+
+    row = {
+        'cer': char_error_rate(ref['features']['whisper']['text'], cand['features']['whisper']['text']),
+        'text_label': ref_emotion['text_emotion'] == cand_emotion['text_emotion'],
+        'audio_label': ref_emotion['audio_emotion'] == cand_emotion['audio_emotion'],
+        'final_label': ref_emotion['final_emotion'] == cand_emotion['final_emotion'],
+        'text_conf_diff': abs(ref_emotion['text_conf'] - cand_emotion['text_conf']),
+        'audio_conf_diff': abs(ref_emotion['audio_conf'] - cand_emotion['audio_conf']),
+        'score_diff': abs(ref['scores']['average'] - cand['scores']['average']),
+    }
+
+    row['passed'] = (
+        row['cer'] <= TOLERANCE['cer']
+        and row['text_label'] and row['audio_label'] and row['final_label']
+        and row['text_conf_diff'] <= TOLERANCE['conf']
+        and row['audio_conf_diff'] <= TOLERANCE['conf']
+        and row['score_diff'] <= TOLERANCE['score']
+    )
+    return row
+
+
+def run_ab_test(files, backend):
+    """파일별 비교 결과 리스트 반환"""
+    audios = [load_audio(path) for path in files]
+
+    # A: 기준 (fp32) 먼저 전부 분석 → 모델 해제 후 B 로드 (메모리 절약)
+    reference = build_analyzer('torch')
+    ref_results = [analyze_timed(reference, audio) for audio in audios]
+    del reference
+
+    candidate = build_analyzer(backend)
+    cand_results = [analyze_timed(candidate, audio) for audio in audios]
+
+    rows = []
+    for path, audio, (ref, ref_ms), (cand, cand_ms) in zip(files, audios, ref_results, cand_results):
+        row = compare(ref, cand)
+        row.update({
+            'file': path,
+            'duration': audio.duration,
+            'ref_ms': ref_ms,
+            'cand_ms': cand_ms,
+        })
+        rows.append(row)
+
+    return rows
+
+
+def print_report(rows, backend):
+    """비교 결과 출력"""
+    print("\n" + "="*104)
+    print(f"📊 추론 백엔드 A/B 결과 (A: torch fp32, B: {backend})")
+    print("="*104)
+    print(f"{'파일':<30} {'길이':>6} {'A(ms)':>9} {'B(ms)':>9} {'속도':>6} "
+          f"{'CER':>6} {'레이블':>6} {'Δ텍스트':>7} {'Δ음성':>7} {'Δ점수':>6} {'결과':>4}")
+    print("-"*104)
+
+    for r in rows:
+        speedup = r['ref_ms'] / r['cand_ms'] if r['cand_ms'] > 0 else 0.0
+        labels = "OK" if r['text_label'] and r['audio_label'] and r['final_label'] else "다름"
+        print(
+            f"{os.path.basename(r['file']):<30} {r['duration']:>5.1f}s "
+            f"{r['ref_ms']:>9.1f} {r['cand_ms']:>9.1f} {speedup:>5.1f}x "
+            f"{r['cer'] * 100:>5.1f}% {labels:>6} {r['text_conf_diff']:>7.3f} {r['audio_conf_diff']:>7.3f} "
+            f"{r['score_diff']:>6.2f} {'✅' if r['passed'] else '❌':>4}"
+        )
+
+    if not rows:
+        print("분석할 파일이 없습니다.")
+        return True
+
+    passed = sum(1 for r in rows if r['passed'])
+    total_ref = sum(r['ref_ms'] for r in rows)
+    total_cand = sum(r['cand_ms'] for r in rows)
+
+    print("-"*104)
+    print(f"허용 오차: CER ≤ {TOLERANCE['cer'] * 100:.0f}%, 확신도 ≤ {TOLERANCE['conf']}, "
+          f"점수 ≤ {TOLERANCE['score']}점, 감정 레이블 일치")
+    print(f"통과: {passed}/{len(rows)}")
+    print(f"총 시간: A {total_ref:.1f}ms → B {total_cand:.1f}ms ({total_ref / max(total_cand, 1e-9):.1f}x)")
+    return passed == len(rows)
+
+
+# ========== 메인 실행 ==========
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    candidate_backend = args.pop(0) if args and args[0] in ('int8', 'onnx') else 'int8'
+    wav_files = collect_audio_files(args or DEFAULT_DIRS)
+
+    print(f"🎵 테스트 파일 {len(wav_files)}개 (B: {candidate_backend})")
+    results = run_ab_test(wav_files, candidate_backend)
+    ok = print_report(results, candidate_backend)
+    sys.exit(0 if ok else 1)
@@ -1,19 +1,25 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, Response
 from datetime import datetime, timedelta
-import pymysql
 from flask_cors import CORS
-import os
-import tempfile
+import json
 from werkzeug.utils import secure_filename
 from analyzer import SpeechAnalyzer
+from audio_io import load_audio
 from llm_handler import LLMHandler
 from db_handler import VoiceDBHandler
+from db_pool import get_pool
+from alert_dispatcher import get_dispatcher
+from sensor_state import SensorStateStore
+from model_registry import ModelRegistry
+from cache import build_result_cache
+from config.serving import MODEL_REGISTRY_CONFIG, RESULT_CACHE_CONFIG, ALERT_STREAM_CONFIG, SENSOR_STATE_CONFIG
 
 app = Flask(__name__)
 CORS(app)
+model_registry = None  # 모델 지연 로딩 (analyzer 모델 + LLM)
 speech_analyzer = None
-llm_handler = None
 voice_db_handler = None
+sensor_state = SensorStateStore(**SENSOR_STATE_CONFIG)  # 어르신별 활동량 캐시 (활동량 API + VoiceDBHandler 공용, 1개만 유지)
 
 
 # 👇 [여기부터] 이 3줄을 꼭 추가해! (Ngrok 로그인 유지용)
@@ -23,16 +29,13 @@ app.config['SESSION_COOKIE_SECURE'] = True     # HTTPS에서만 작동하도록
 # 👆 [여기까지]
 
 
-# 데이터베이스 연결 설정
+# 데이터베이스 연결 설정 (접속 정보: config/db_config.py)
 def get_db():
-    return pymysql.connect(
-        host='192.168.0.31',  # <-- 워크벤치에 넣은 칼리 IP 주소로 수정!
-        user='root',
-        password='1234', 
-        db='care_db',
-        charset='utf8mb4',
-        cursorclass=pymysql.cursors.DictCursor
-    )
+    """
+    커넥션 풀에서 연결 빌리기 (DictCursor)
+    conn.close()는 연결을 닫지 않고 풀에 반납 → 라우트 코드는 그대로
+    """
+    return get_pool().connection()
 
 
 
@@ -217,6 +220,22 @@ def login():
         conn.close()
 
 
+# ==========================================
+# 활동량 집계 (일간/주간/월간 공용)
+# ==========================================
+
+def count_sensing_by_day(cursor, senior_id, sensor_id, days):
+    """
+    오늘(DB 날짜, 예전 CURDATE()와 같음)까지 최근 days일 동안 움직임 센서의 일별 감지 횟수 (빈 날은 0, 최근 28일까지)
+    - sensor_state 캐시에서 바로 계산 (새 행만 주기적으로 반영, 캐시에 없으면 DB에서 1번 재구성)
+
+    Returns:
+        [1일째 횟수, 2일째 횟수, ...] (오래된 날 → 오늘)
+    """
+    state = sensor_state.refresh(cursor, senior_id)
+    return state.daily_counts(sensor_state.today - timedelta(days=days - 1), days, sensor_id)
+
+
 # ==========================================
 # 👇 bomi.py 맨 아래에 추가 (활동량 조회 API)
 # ==========================================
@@ -233,7 +252,7 @@ def activity_daily():
         # 1. 사용자의 '모션 센서' ID 찾기 (motion 타입)
         # (복잡한 조인 대신 서브쿼리 활용)
         sql_sensor = """
-            SELECT s.sensor_id 
+            SELECT s.sensor_id, sn.senior_id
             FROM tb_sensor s
             JOIN tb_device d ON s.device_id = d.device_id
             JOIN tb_senior sn ON d.senior_id = sn.senior_id
@@ -247,17 +266,11 @@ def activity_daily():
         count = 0
         if sensor:
             sensor_id = sensor['sensor_id'] if isinstance(sensor, dict) else sensor[0]
+            senior_id = sensor['senior_id'] if isinstance(sensor, dict) else sensor[1]
             
             # 2. '오늘' 해당 센서가 감지된 횟수 조회 (tb_sensing 테이블)
             # (만약 tb_sensing 테이블이 없다면 이 부분에서 에러가 날 수 있으니 테이블 확인 필요!)
-            sql_count = """
-                SELECT COUNT(*) as cnt 
-                FROM tb_sensing 
-                WHERE sensor_id = %s AND DATE(created_at) = CURDATE()
-            """
-            cursor.execute(sql_count, (sensor_id,))
-            result = cursor.fetchone()
-            count = result['cnt'] if isinstance(result, dict) else result[0]
+            count = count_sensing_by_day(cursor, senior_id, sensor_id, 1)[0]
             
         return jsonify({"count": count})
         
@@ -284,7 +297,7 @@ def simulate_data():
     try:
         # 1. 사용자의 '모션 센서' 찾기
         sql_sensor = """
-            SELECT s.sensor_id 
+            SELECT s.sensor_id, sn.senior_id
             FROM tb_sensor s
             JOIN tb_device d ON s.device_id = d.device_id
             JOIN tb_senior sn ON d.senior_id = sn.senior_id
@@ -299,18 +312,21 @@ def simulate_data():
         
         if sensor:
             s_id = sensor['sensor_id'] if isinstance(sensor, dict) else sensor[0]
+            senior_id = sensor['senior_id'] if isinstance(sensor, dict) else sensor[1]
             
             # 2. [핵심] 가짜 데이터(움직임 감지)를 진짜 DB에 저장!
             # (tb_sensing 테이블에 데이터가 쌓여야 횟수가 올라갑니다)
             sql_insert = "INSERT INTO tb_sensing (sensor_id, value, created_at) VALUES (%s, 1, NOW())"
             cursor.execute(sql_insert, (s_id,))
             conn.commit()
+            # 캐시에 바로 반영 (시각은 DB가 넣은 NOW() 그대로)
+            sensing_id = cursor.lastrowid
+            cursor.execute("SELECT created_at FROM tb_sensing WHERE sensing_id = %s", (sensing_id,))
+            created_at = cursor.fetchone()['created_at']
+            sensor_state.record_insert(senior_id, sensing_id, s_id, 'motion', created_at)
             
             # 3. 오늘 총 횟수 다시 세기
-            sql_count = "SELECT COUNT(*) as cnt FROM tb_sensing WHERE sensor_id = %s AND DATE(created_at) = CURDATE()"
-            cursor.execute(sql_count, (s_id,))
-            result = cursor.fetchone()
-            current_count = result['cnt'] if isinstance(result, dict) else result[0]
+            current_count = count_sensing_by_day(cursor, senior_id, s_id, 1)[0]
             
         return jsonify({"count": current_count})
         
@@ -339,7 +355,7 @@ def activity_weekly():
     try:
         # 1. 모션 센서 ID 찾기
         sql_sensor = """
-            SELECT s.sensor_id 
+            SELECT s.sensor_id, sn.senior_id
             FROM tb_sensor s
             JOIN tb_device d ON s.device_id = d.device_id
             JOIN tb_senior sn ON d.senior_id = sn.senior_id
@@ -354,25 +370,11 @@ def activity_weekly():
         weekly_counts = [0] * 7
         
         if sensor:
-            s_id = sensor['sensor_id'] if isinstance(sensor, dict) else sensor[0]
-            
-            # 2. 오늘 포함 최근 7일치 데이터 조회 (루프 돌며 확실하게 계산)
-            today = datetime.now().date()
+            sensor_id = sensor['sensor_id'] if isinstance(sensor, dict) else sensor[0]
+            senior_id = sensor['senior_id'] if isinstance(sensor, dict) else sensor[1]
             
-            for i in range(7):
-                # 6일 전부터 ~ 오늘까지 날짜 계산
-                target_date = today - timedelta(days=(6 - i))
-                
-                sql_count = """
-                    SELECT COUNT(*) as cnt 
-                    FROM tb_sensing 
-                    WHERE sensor_id = %s AND DATE(created_at) = %s
-                """
-                cursor.execute(sql_count, (s_id, target_date))
-                result = cursor.fetchone()
-                count = result['cnt'] if isinstance(result, dict) else result[0]
-                
-                weekly_counts[i] = count
+            # 2. 오늘 포함 최근 7일치 데이터 (캐시, 빈 날은 0)
+            weekly_counts = count_sensing_by_day(cursor, senior_id, sensor_id, 7)
 
         return jsonify({"data": weekly_counts})
         
@@ -398,7 +400,7 @@ def activity_monthly():
     try:
         # 1. 모션 센서 ID 찾기
         sql_sensor = """
-            SELECT s.sensor_id 
+            SELECT s.sensor_id, sn.senior_id
             FROM tb_sensor s
             JOIN tb_device d ON s.device_id = d.device_id
             JOIN tb_senior sn ON d.senior_id = sn.senior_id
@@ -413,29 +415,13 @@ def activity_monthly():
         monthly_counts = [0] * 4
         
         if sensor:
-            s_id = sensor['sensor_id'] if isinstance(sensor, dict) else sensor[0]
-            today = datetime.now().date()
+            sensor_id = sensor['sensor_id'] if isinstance(sensor, dict) else sensor[0]
+            senior_id = sensor['senior_id'] if isinstance(sensor, dict) else sensor[1]
             
-            # 2. 최근 4주간 데이터 조회
-            # (i=0: 이번주, i=1: 지난주 ... i=3: 3주전)
-            # 그래프는 왼쪽(오래된 것) -> 오른쪽(최신) 순서이므로 역순으로 저장해야 함
-            for i in range(4):
-                # 주차별 시작일과 종료일 계산 (7일 단위)
-                end_date = today - timedelta(days=(i * 7))
-                start_date = end_date - timedelta(days=6)
-                
-                sql_count = """
-                    SELECT COUNT(*) as cnt 
-                    FROM tb_sensing 
-                    WHERE sensor_id = %s 
-                    AND DATE(created_at) BETWEEN %s AND %s
-                """
-                cursor.execute(sql_count, (s_id, start_date, end_date))
-                result = cursor.fetchone()
-                count = result['cnt'] if isinstance(result, dict) else result[0]
-                
-                # 리스트의 뒤에서부터 채워넣기 (그래프 순서 맞추기 위함)
-                monthly_counts[3 - i] = count
+            # 2. 최근 4주(28일) 일별 횟수 (캐시) → 7일씩 합산
+            # 그래프는 왼쪽(오래된 것) -> 오른쪽(최신) 순서 (마지막 칸 = 오늘 포함 최근 7일)
+            daily_counts = count_sensing_by_day(cursor, senior_id, sensor_id, 28)
+            monthly_counts = [sum(daily_counts[i * 7:(i + 1) * 7]) for i in range(4)]
 
         return jsonify({"data": monthly_counts})
         
@@ -636,9 +622,43 @@ def add_device():
         
         
 
+# ==========================================
+# 알림 API 공용 (보호자별 조회)
+# 인덱스: tb_alert (guardian_id, received_yes, sented_at)
+#   → migrations/003_index_tb_alert_guardian_unread.sql
+# ==========================================
+
+def find_guardian_id(cursor, username):
+    """보호자 아이디(user_id) → guardian_id (없으면 None)"""
+    cursor.execute("SELECT guardian_id FROM tb_guardian WHERE user_id = %s", (username,))
+    guardian = cursor.fetchone()
+    return guardian['guardian_id'] if guardian else None
+
+
+def parse_int(value):
+    """요청 값(since_alert_id, limit 등) → int (없거나 잘못되면 None)"""
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def format_alert_times(alerts):
+    """sented_at 날짜 포맷팅"""
+    for a in alerts:
+        if isinstance(a['sented_at'], datetime):
+            a['sented_at'] = a['sented_at'].strftime('%Y-%m-%d %H:%M:%S')
+    return alerts
+
+
 # [최종 수정] 실시간 알림 확인 (읽음 처리 로직 삭제!)
+# GET 파라미터: username (보호자 아이디), since_alert_id (이 ID보다 새 알림만)
+# (username이 없으면 예전처럼 전체 알림 중 최신 1개)
 @app.route('/api/check-alert')
 def check_alert():
+    username = request.args.get('username')
+    since_alert_id = parse_int(request.args.get('since_alert_id'))
+
     conn = get_db()
     if not conn:
         return jsonify({"error": "DB 연결 실패"}), 500
@@ -646,22 +666,32 @@ def check_alert():
     try:
         cursor = conn.cursor()
         
-        # 1. 가장 최근의 '안 읽은(0)' 알림 1개만 조회
+        # 1. 이 보호자의 가장 최근 '안 읽은(0)' 알림 1개만 조회
         # (읽음 처리를 안 하므로, 계속 같은 알림을 가져올 수 있지만 프론트엔드에서 ID 비교로 걸러냄)
-        sql = """
+        where, params = ["received_yes = 0"], []
+        if username:
+            guardian_id = find_guardian_id(cursor, username)
+            if guardian_id is None:
+                return jsonify(None)
+            where.insert(0, "guardian_id = %s")
+            params.append(guardian_id)
+        if since_alert_id is not None:
+            where.append("alert_id > %s")
+            params.append(since_alert_id)
+
+        sql = f"""
             SELECT alert_id, alert_type, alert_content, sented_at 
             FROM tb_alert 
-            WHERE received_yes = 0 
+            WHERE {" AND ".join(where)}
             ORDER BY sented_at DESC 
             LIMIT 1
         """
-        cursor.execute(sql)
+        cursor.execute(sql, params)
         alert = cursor.fetchone()
         
         if alert:
             # 2. 날짜 포맷팅
-            if isinstance(alert['sented_at'], datetime):
-                alert['sented_at'] = alert['sented_at'].strftime('%Y-%m-%d %H:%M:%S')
+            format_alert_times([alert])
             
             # ❌ [삭제됨] 여기서 UPDATE를 하면 팝업 뜨자마자 읽음 처리되어 버림!
             # update_sql = "UPDATE tb_alert SET received_yes = 1 WHERE alert_id = %s"
@@ -680,35 +710,93 @@ def check_alert():
         conn.close()
 
 
+# 실시간 알림 스트림 (SSE: /api/check-alert 폴링 대체)
+# 서버의 알림 분배기 1개가 새 알림만 조회 → 이 보호자의 알림만 탭으로 전달
+@app.route('/api/alert-stream')
+def alert_stream():
+    username = request.args.get('username')
+    last_id = parse_int(request.headers.get('Last-Event-ID') or request.args.get('last_id'))
+
+    # 보호자 ID 찾기 (로그인한 보호자의 알림만 전달, 다른 가족 알림이 섞이지 않게 전체 구독은 받지 않음)
+    if not username:
+        return jsonify({"error": "username이 필요합니다"}), 400
+    conn = get_db()
+    if not conn:
+        return jsonify({"error": "DB 연결 실패"}), 500
+    try:
+        guardian_id = find_guardian_id(conn.cursor(), username)
+    finally:
+        conn.close()
+    if guardian_id is None:
+        return jsonify({"error": "사용자를 찾을 수 없습니다"}), 404
+
+    dispatcher = get_dispatcher()
+    sub = dispatcher.subscribe(guardian_id, last_alert_id=last_id)
+    heartbeat_sec = ALERT_STREAM_CONFIG['heartbeat_sec']
+
+    def stream():
+        try:
+            yield "retry: 3000\n\n"  # 연결이 끊기면 3초 후 브라우저가 자동 재연결
+            while True:
+                alert = sub.get(timeout=heartbeat_sec)
+                if alert is None:
+                    yield ": ping\n\n"  # 연결 유지 (프록시 타임아웃 방지)
+                    continue
+                yield f"id: {alert['alert_id']}\ndata: {json.dumps(alert, ensure_ascii=False)}\n\n"
+        finally:
+            dispatcher.unsubscribe(sub)  # 탭을 닫으면 구독 해제
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
 # ==========================================
 # 👇 bomi.py 맨 아래에 추가 (최근 알림 목록 조회)
 # ==========================================
 
 @app.route('/api/alert-list', methods=['POST'])
 def get_alert_list():
-    # 필요하다면 user_id를 받아서 특정 사용자의 알림만 줄 수도 있음
-    # data = request.get_json()
+    """
+    보호자의 최근 알림 목록 (이미 읽은 것도 포함)
+
+    POST Body (JSON):
+        username: 보호자 아이디 (없으면 예전처럼 전체 알림)
+        since_alert_id: 이 ID보다 새 알림만 (이미 받은 목록 이후만 가져올 때)
+        limit: 최대 개수 (기본 10, 최대 50)
+    """
+    data = request.get_json(silent=True) or {}
+    username = data.get('username')
+    since_alert_id = parse_int(data.get('since_alert_id'))
+    limit = min(parse_int(data.get('limit')) or 10, 50)
     
     conn = get_db()
     cursor = conn.cursor()
     
     try:
-        # 최근 알림 5~10개 조회 (이미 읽은 것도 포함)
-        sql = """
+        where, params = [], []
+        if username:
+            guardian_id = find_guardian_id(cursor, username)
+            if guardian_id is None:
+                return jsonify([])
+            where.append("guardian_id = %s")
+            params.append(guardian_id)
+        if since_alert_id is not None:
+            where.append("alert_id > %s")
+            params.append(since_alert_id)
+
+        sql = f"""
             SELECT alert_id, alert_type, alert_content, sented_at, received_yes 
             FROM tb_alert 
+            {"WHERE " + " AND ".join(where) if where else ""}
             ORDER BY sented_at DESC 
-            LIMIT 10
+            LIMIT %s
         """
-        cursor.execute(sql)
+        cursor.execute(sql, (*params, limit))
         alerts = cursor.fetchall()
-        
-        # 날짜 포맷팅
-        for a in alerts:
-            if isinstance(a['sented_at'], datetime):
-                a['sented_at'] = a['sented_at'].strftime('%Y-%m-%d %H:%M:%S')
                 
-        return jsonify(alerts)
+        return jsonify(format_alert_times(alerts))
         
     except Exception as e:
         print(f"❌ 알림 목록 조회 에러: {e}")
@@ -723,18 +811,38 @@ def get_alert_list():
 
 @app.route('/api/alert-read-all', methods=['POST'])
 def mark_all_read():
+    """
+    보호자의 안 읽은 알림 모두 읽음 처리
+
+    POST Body (JSON):
+        username: 보호자 아이디 (필수, 다른 가족의 알림은 건드리지 않음)
+        until_alert_id: 이 ID까지만 읽음 처리 (화면에 보이는 목록까지, 선택)
+    """
+    data = request.get_json(silent=True) or {}
+    username = data.get('username')
+    until_alert_id = parse_int(data.get('until_alert_id'))
+    if not username:
+        return jsonify({"error": "username이 필요합니다"}), 400
+
     conn = get_db()
     cursor = conn.cursor()
     
     try:
-        # [수정] 조건을 빼고, 현재 테이블에 있는 모든 알림을 확실하게 '읽음' 처리
-        sql = "UPDATE tb_alert SET received_yes = 1"  
-        # (만약 특정 사용자만 하고 싶다면 WHERE절이 필요하지만, 지금은 전체 처리가 확실함)
-        
-        cursor.execute(sql)
+        guardian_id = find_guardian_id(cursor, username)
+        if guardian_id is None:
+            return jsonify({"error": "사용자를 찾을 수 없습니다"}), 404
+
+        # 이 보호자의 안 읽은 알림만 (guardian_id, received_yes) 인덱스 범위로 수정
+        sql = "UPDATE tb_alert SET received_yes = 1 WHERE guardian_id = %s AND received_yes = 0"
+        params = [guardian_id]
+        if until_alert_id is not None:
+            sql += " AND alert_id <= %s"
+            params.append(until_alert_id)
+        
+        updated = cursor.execute(sql, params)
         conn.commit()
         
-        return jsonify({"message": "모든 알림 읽음 처리 완료"})
+        return jsonify({"message": "모든 알림 읽음 처리 완료", "updated": updated})
         
     except Exception as e:
         conn.rollback()
@@ -779,37 +887,29 @@ def check_duplicate():
 # ========================================
 def initialize_voice_models():
     """
-    서버 시작 시 음성 분석 모델 로드
+    서버 시작 시 음성 분석 모델 등록 (로딩은 백그라운드 → 서버는 바로 시작)
     bomi.py의 if __name__ == '__main__': 부분에서 호출
     """
-    global speech_analyzer, llm_handler, voice_db_handler
+    global model_registry, speech_analyzer, voice_db_handler
     
     print("\n" + "="*60)
-    print("🎤 음성 분석 모델 로딩 중...")
+    print("🎤 음성 분석 모델 등록 중...")
     print("="*60)
     
-    # 1. 음성 분석기
-    try:
-        print("\n[1/3] SpeechAnalyzer 로드 중... (2-3분 소요)")
-        speech_analyzer = SpeechAnalyzer()
-        print("✅ SpeechAnalyzer 로드 완료!")
-    except Exception as e:
-        print(f"⚠️ SpeechAnalyzer 로드 실패: {e}")
-        speech_analyzer = None
-    
-    # 2. LLM 핸들러
-    try:
-        print("\n[2/3] LLMHandler 로드 중...")
-        llm_handler = LLMHandler()
-        print("✅ LLMHandler 로드 완료!")
-    except Exception as e:
-        print(f"⚠️ LLMHandler 로드 실패: {e}")
-        llm_handler = None
+    # 1. SpeechAnalyzer + LLM 등록 (무거운 로딩은 백그라운드에서 + 워밍업)
+    print("\n[1/2] 모델 등록 (백그라운드 로딩)...")
+    model_registry = ModelRegistry(**MODEL_REGISTRY_CONFIG)
+    speech_analyzer = SpeechAnalyzer(
+        registry=model_registry,
+        result_cache=build_result_cache(RESULT_CACHE_CONFIG)
+    )
+    model_registry.register('llm', LLMHandler)
+    model_registry.start()
     
-    # 3. DB 핸들러
+    # 2. DB 핸들러
     try:
-        print("\n[3/3] VoiceDBHandler 초기화 중...")
-        voice_db_handler = VoiceDBHandler()
+        print("\n[2/2] VoiceDBHandler 초기화 중...")
+        voice_db_handler = VoiceDBHandler(sensor_state=sensor_state)
         if voice_db_handler.connect():
             print("✅ VoiceDBHandler 초기화 완료!")
         else:
@@ -820,14 +920,12 @@ def initialize_voice_models():
         voice_db_handler = None
     
     print("\n" + "="*60)
-    print("✅ 음성 분석 모델 준비 완료!")
+    print("✅ 음성 분석 준비 완료! (모델은 백그라운드 로딩 중 - /api/voice-health에서 확인)")
     print("="*60 + "\n")
 
 # ========================================
 # 음성 분석 API 엔드포인트
 # ========================================
-from flask import Response
-import json
 @app.route('/api/analyze', methods=['POST'])
 def analyze_voice():
     """
@@ -850,6 +948,8 @@ def analyze_voice():
     # 1. 모델 체크
     if not speech_analyzer:
         return jsonify({'error': '음성 분석기가 초기화되지 않았습니다'}), 503
+    if not speech_analyzer.is_ready():
+        return jsonify({'error': '모델 로딩 중입니다. 잠시 후 다시 시도해주세요.'}), 503
     
     # 2. 파일 체크
     if 'audio_file' not in request.files:
@@ -880,33 +980,33 @@ def analyze_voice():
     print(f"센싱 ID: {sensing_id}")
     print(f"AI 응답 생성: {generate_response_flag}")
     
-    # 4. 임시 파일 저장
+    # 4. 업로드 바이트 읽기 (임시 파일 없이 메모리에서 디코딩)
     try:
         filename = secure_filename(audio_file.filename)
-        suffix = os.path.splitext(filename)[1]
+        audio_bytes = audio_file.read()
         
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-            audio_file.save(tmp_file)
-            tmp_path = tmp_file.name
+        if not audio_bytes:
+            return jsonify({'error': '빈 음성 파일입니다'}), 400
         
-        print(f"✅ 임시 파일 저장: {tmp_path}")
+        print(f"✅ 음성 파일 수신: {filename} ({len(audio_bytes)} bytes)")
     
     except Exception as e:
-        return jsonify({'error': f'파일 저장 실패: {str(e)}'}), 500
+        return jsonify({'error': f'파일 수신 실패: {str(e)}'}), 500
     
     # ============================================================
     # Phase 2: 제너레이터 함수 (실시간 전송)
     # ============================================================
     def generate():
         try:
-            # === Step 1: 파일 저장 완료 ===
-            yield f"data: {json.dumps({'step': 1, 'message': '파일 저장 완료'}, ensure_ascii=False)}\n\n"
+            # === Step 1: 파일 수신 + 디코딩 (1회) ===
+            audio = load_audio(audio_bytes, name=filename)
+            yield f"data: {json.dumps({'step': 1, 'message': '파일 수신 완료'}, ensure_ascii=False)}\n\n"
             
             # === Step 2: 음성 분석 시작 ===
             yield f"data: {json.dumps({'step': 2, 'message': 'STT 음성 인식 중...'}, ensure_ascii=False)}\n\n"
             
             print("\n[분석 시작...]")
-            analysis_result = speech_analyzer.analyze(tmp_path)
+            analysis_result = speech_analyzer.analyze(audio)
             
             whisper = analysis_result['features']['whisper']
             emotion = analysis_result['features']['emotion']
@@ -926,12 +1026,12 @@ def analyze_voice():
             
             # === Step 5: AI 응답 생성 ===
             ai_response = None
-            if generate_response_flag and llm_handler:
+            if generate_response_flag and model_registry.is_ready('llm'):
                 yield f"data: {json.dumps({'step': 5, 'message': 'AI 응답 생성 중...'}, ensure_ascii=False)}\n\n"
                 
                 try:
                     print("\n[AI 응답 생성 중...]")
-                    ai_response = llm_handler.chat(
+                    ai_response = model_registry.get('llm').chat(
                         whisper['text'],
                         emotion_info=emotion,
                         scores=scores
@@ -963,14 +1063,7 @@ def analyze_voice():
                 except Exception as e:
                     print(f"❌ DB 저장 에러: {e}")
             
-            # === Step 7: 임시 파일 삭제 ===
-            try:
-                os.remove(tmp_path)
-                print(f"🗑️ 임시 파일 삭제: {tmp_path}")
-            except Exception as e:
-                print(f"⚠️ 파일 삭제 실패: {e}")
-            
-            # === Step 8: 최종 결과 반환 ===
+            # === Step 7: 최종 결과 반환 ===
             result = {
                 'step': 'complete',
                 'success': True,
@@ -990,13 +1083,16 @@ def analyze_voice():
                         'word_count': whisper['word_count'],
                         'wpm': whisper['wpm'],
                         'duration': whisper['duration'],
-                        'response_time': whisper['response_time']
+                        'response_time': whisper['response_time'],
+                        'stt_tier': whisper['stt_tier'],  # 사용한 Whisper 크기
+                        'stt_reason': whisper['stt_policy']['reason']
                     }
                 },
                 'ai_response': ai_response,
                 'metadata': {
                     'senior_id': senior_id,
                     'sensing_id': save_sensing_id if voice_db_handler else None,
+                    'cached': analysis_result.get('cached', False),  # 같은 음성 재전송 → 캐시 결과
                     'timestamp': datetime.now().isoformat()
                 }
             }
@@ -1026,14 +1122,6 @@ def analyze_voice():
                 'error_type': type(e).__name__
             }
             yield f"data: {json.dumps(error_result, ensure_ascii=False)}\n\n"
-            
-            # 임시 파일 정리 (에러 시에도)
-            try:
-                if os.path.exists(tmp_path):
-                    os.remove(tmp_path)
-                    print(f"🗑️ 에러 발생으로 임시 파일 삭제")
-            except:
-                pass
     
     # ============================================================
     # Phase 3: SSE 응답 반환
@@ -1053,11 +1141,18 @@ def analyze_voice():
 # ========================================
 @app.route('/api/voice-health', methods=['GET'])
 def voice_health():
-    """음성 분석 시스템 상태 확인"""
+    """음성 분석 시스템 상태 확인 (모델별 로딩 상태 포함)"""
     return jsonify({
-        'analyzer': speech_analyzer is not None,
-        'llm': llm_handler is not None,
+        'analyzer': speech_analyzer is not None and speech_analyzer.is_ready(),
+        'models': model_registry.status() if model_registry else {},
+        'stt': speech_analyzer.stt_policy.stats() if speech_analyzer else None,
+        'result_cache': speech_analyzer.result_cache.stats() if speech_analyzer and speech_analyzer.result_cache else None,
+        'text_cache': speech_analyzer.text_cache_stats() if speech_analyzer else None,
+        'llm': model_registry is not None and model_registry.is_ready('llm'),
         'db': voice_db_handler is not None,
+        'db_pool': get_pool().stats(),
+        'alert_stream': get_dispatcher().stats(),
+        'sensor_state': sensor_state.stats(),
         'timestamp': datetime.now().isoformat()
     })
 
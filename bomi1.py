@@ -1,6 +1,5 @@
 from flask import Flask, render_template, jsonify, request, Response
 from datetime import datetime, timedelta
-import pymysql
 from flask_cors import CORS
 import os
 import tempfile
@@ -14,6 +13,7 @@ from concurrent.futures import ThreadPoolExecutor
 from analyzer import SpeechAnalyzer
 from llm_handler import LLMHandler
 from db_handler import VoiceDBHandler
+from db_pool import get_pool
 
 app = Flask(__name__)
 CORS(app)
@@ -38,16 +38,13 @@ EXECUTOR = ThreadPoolExecutor(max_workers=2)  # 팀PC 성능에 따라 1~2 권
 FAST_REPLY_TEXT = "네, 어르신. 말씀 잘 들었어요. 잠시만요. 바로 도와드릴게요."
 
 
-# 데이터베이스 연결 설정
+# 데이터베이스 연결 설정 (접속 정보: config/db_config.py)
 def get_db():
-    return pymysql.connect(
-        host='192.168.0.31',  # <-- 워크벤치에 넣은 칼리 IP 주소로 수정!
-        user='root',
-        password='1234',
-        db='care_db',
-        charset='utf8mb4',
-        cursorclass=pymysql.cursors.DictCursor
-    )
+    """
+    커넥션 풀에서 연결 빌리기 (DictCursor)
+    conn.close()는 연결을 닫지 않고 풀에 반납 → 라우트 코드는 그대로
+    """
+    return get_pool().connection()
 
 
 @app.route('/')
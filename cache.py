@@ -0,0 +1,372 @@
+"""
+분석 캐시
+1. ResultCache: 음성 분석 결과
+   - 같은 음성(원본 바이트 SHA-256)을 다시 보내면 분석 없이 바로 결과 반환
+     (클라이언트 타임아웃 후 재시도, test_client.py 반복 전송)
+   - 1단계: 프로세스 메모리 (TTL + 최대 개수 LRU)
+   - 2단계: 디스크 (선택, 서버 재시작 후에도 유지, 여러 워커 프로세스가 공유)
+   - 같은 키를 동시에 요청하면 1번만 분석하고 나머지는 결과를 기다림 (재시도 멱등성)
+   - 키에 모델/점수 설정 지문을 포함 → 설정이 바뀌면 예전 결과는 자동으로 무시
+2. TextCache: 짧은 문장의 토큰화/텍스트 감정 결과
+   - "네", "괜찮아", "밥 먹었어"처럼 반복되는 짧은 발화는 모델 재실행 생략
+   - 정규화(NFC + 공백 정리)한 문장을 키로 사용, 적중률 통계 제공
+
+설정: config/serving.py의 RESULT_CACHE_CONFIG, config/models.py의 MODELS['text_cache_options']
+"""
+
+import copy
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from config.models import MODELS
+from config.scoring import SCORING_CRITERIA
+
+
+def config_fingerprint():
+    """분석 결과에 영향을 주는 설정(모델/옵션/점수 기준)의 해시 (12자리)"""
+    data = json.dumps({'models': MODELS, 'scoring': SCORING_CRITERIA}, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:12]
+
+
+class LRUCache:
+    """
+    스레드 안전 TTL + LRU 캐시 (메모리)
+
+    Args:
+        max_entries: 최대 항목 수 (넘으면 가장 오래 안 쓴 것부터 제거)
+        ttl_sec: 유효 시간 (None이면 만료 없음)
+    """
+
+    def __init__(self, max_entries=256, ttl_sec=None):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self._data = OrderedDict()  # key → (만료 시각, 값)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """값 반환 (없거나 만료되면 default)"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                expires_at, value = item
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """값 저장 (최대 개수 초과 시 LRU 제거)"""
+        expires_at = time.monotonic() + self.ttl_sec if self.ttl_sec else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """적중률 등 통계 (/health 용)"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+                'evictions': self.evictions
+            }
+
+
+class ResultCache:
+    """
+    음성 분석 결과 캐시 (메모리 LRU + 선택적 디스크)
+
+    사용 예:
+        cache = ResultCache(max_entries=256, ttl_sec=3600, disk_dir="./cache/results")
+        key = cache.make_key(audio.source_hash)
+        result = cache.get_or_compute(key, lambda: analyzer.analyze(audio))
+    """
+
+    def __init__(self, max_entries=256, ttl_sec=3600, disk_dir=None, disk_max_entries=5000):
+        """
+        Args:
+            max_entries: 메모리 최대 결과 수
+            ttl_sec: 결과 유효 시간 (초)
+            disk_dir: 디스크 캐시 폴더 (None이면 메모리만)
+            disk_max_entries: 디스크 최대 파일 수 (넘으면 오래된 것부터 삭제)
+        """
+        self.ttl_sec = ttl_sec
+        self.memory = LRUCache(max_entries, ttl_sec)
+        self.disk_dir = disk_dir
+        self.disk_max_entries = disk_max_entries
+        self.fingerprint = config_fingerprint()
+
+        self._pending = {}              # key → Future (분석 진행 중)
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+        self.shared = 0                 # 진행 중인 분석 결과를 기다려서 받은 횟수
+        self._disk_writes = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def make_key(self, source_hash, variant=None):
+        """
+        캐시 키 = 원본 해시 + 설정 지문 (+ 변형, 예: 직접 지정한 STT tier)
+        """
+        parts = [source_hash, self.fingerprint]
+        if variant:
+            parts.append(str(variant))
+        return ":".join(parts)
+
+    # ========== 조회 / 저장 ==========
+
+    def get(self, key):
+        """
+        결과 조회 (메모리 → 디스크 순서)
+
+        Returns:
+            결과 딕셔너리 사본 (없으면 None)
+        """
+        result = self.memory.get(key)
+        if result is None and self.disk_dir:
+            result = self._disk_get(key)
+            if result is not None:
+                self.disk_hits += 1
+                self.memory.put(key, result)
+
+        # 호출자가 결과를 수정해도 캐시는 그대로
+        return copy.deepcopy(result) if result is not None else None
+
+    def put(self, key, result):
+        """결과 저장 (메모리 + 디스크)"""
+        result = copy.deepcopy(result)
+        self.memory.put(key, result)
+        if self.disk_dir:
+            self._disk_put(key, result)
+
+    def get_or_compute(self, key, compute, should_store=None):
+        """
+        캐시에 있으면 반환, 없으면 compute()로 분석 후 저장
+        같은 키를 이미 다른 스레드가 분석 중이면 그 결과를 기다림
+
+        Args:
+            should_store: should_store(result)가 False면 저장하지 않음
+                (진행 중인 같은 분석을 기다리던 스레드에는 그대로 전달)
+
+        Returns:
+            (result, cached) - cached: 캐시/진행 중 분석에서 받았으면 True
+        """
+        result = self.get(key)
+        if result is not None:
+            return result, True
+
+        with self._lock:
+            future = self._pending.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._pending[key] = future
+
+        if not owner:
+            self.shared += 1
+            return copy.deepcopy(future.result()), True
+
+        try:
+            result = compute()
+            if should_store is None or should_store(result):
+                self.put(key, result)
+            # 기다리는 스레드는 사본을 받음 → 호출자가 result를 수정해도(예: 'cached') 충돌 없음
+            future.set_result(copy.deepcopy(result))
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def stats(self):
+        """캐시 통계 (/health 용)"""
+        stats = self.memory.stats()
+        stats.update({
+            'ttl_sec': self.ttl_sec,
+            'disk': self.disk_dir is not None,
+            'disk_hits': self.disk_hits,
+            'shared': self.shared,
+            'pending': len(self._pending),
+            'fingerprint': self.fingerprint
+        })
+        return stats
+
+    # ========== 디스크 ==========
+
+    def _disk_path(self, key):
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.disk_dir, name[:2], name + ".pkl")
+
+    def _disk_get(self, key):
+        path = self._disk_path(key)
+        try:
+            if self.ttl_sec and time.time() - os.path.getmtime(path) > self.ttl_sec:
+                os.remove(path)
+                return None
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ 디스크 캐시 읽기 실패: {e}")
+            return None
+
+    def _disk_put(self, key, result):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)  # 다른 프로세스가 쓰다 만 파일을 읽지 않도록
+
+            self._disk_writes += 1
+            if self._disk_writes % 100 == 0:
+                self._disk_prune()
+        except Exception as e:
+            print(f"⚠️ 디스크 캐시 저장 실패: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _disk_prune(self):
+        """만료 파일 + 최대 개수 초과분(오래된 것부터) 삭제"""
+        files = []
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if name.endswith(".pkl"):
+                    path = os.path.join(root, name)
+                    try:
+                        files.append((os.path.getmtime(path), path))
+                    except OSError:
+                        pass
+
+        files.sort()
+        now = time.time()
+        excess = len(files) - self.disk_max_entries
+        for i, (mtime, path) in enumerate(files):
+            if i < excess or (self.ttl_sec and now - mtime > self.ttl_sec):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def normalize_text(text):
+    """캐시 키용 문장 정규화 (유니코드 NFC + 앞뒤/연속 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class TextCache(LRUCache):
+    """
+    짧은 문장 → 모델 출력 캐시 (프로세스 내 모든 요청/스레드가 공유)
+
+    사용 예:
+        cache = TextCache("tokens", max_entries=4096, max_chars=40)
+        tokens = cache.get_or_compute(text, tokenizer.tokenize)
+        outs = cache.get_many(texts, model_batch_fn)   # 못 찾은 문장만 배치 실행
+    """
+
+    def __init__(self, name, max_entries=4096, max_chars=40, ttl_sec=None):
+        """
+        Args:
+            name: 통계 표시용 이름
+            max_entries: 최대 문장 수
+            max_chars: 이보다 긴 문장은 캐시하지 않음 (반복될 가능성 낮음)
+            ttl_sec: 유효 시간 (None이면 만료 없음 - 모델이 같으면 결과도 같음)
+        """
+        super().__init__(max_entries, ttl_sec)
+        self.name = name
+        self.max_chars = max_chars
+        self.skipped = 0  # 길어서 캐시 안 한 문장 수
+
+    def _key(self, text):
+        key = normalize_text(text)
+        return key if len(key) <= self.max_chars else None
+
+    def get_or_compute(self, text, compute):
+        """캐시에 있으면 반환, 없으면 compute(정규화 문장) 실행 후 저장"""
+        key = self._key(text)
+        if key is None:
+            self.skipped += 1
+            return compute(text)
+
+        value = self.get(key)
+        if value is None:
+            value = compute(key)
+            self.put(key, value)
+        return value
+
+    def get_many(self, texts, compute_batch):
+        """
+        여러 문장 조회 (못 찾은 문장은 중복 없이 모아서 compute_batch 1번 실행)
+
+        Args:
+            texts: 문장 리스트
+            compute_batch: 문장 리스트 → 결과 리스트 (같은 순서)
+
+        Returns:
+            결과 리스트 (texts 순서)
+        """
+        keys = [self._key(t) for t in texts]
+        results = [self.get(k) if k is not None else None for k in keys]
+
+        todo = {}  # 계산할 문장 → 결과 위치들
+        for i, (text, key, value) in enumerate(zip(texts, keys, results)):
+            if value is None:
+                if key is None:
+                    self.skipped += 1
+                todo.setdefault(key if key is not None else text, []).append(i)
+
+        if todo:
+            computed = compute_batch(list(todo))
+            for (text, positions), value in zip(todo.items(), computed):
+                if keys[positions[0]] is not None:
+                    self.put(text, value)
+                for i in positions:
+                    results[i] = value
+        return results
+
+    def stats(self):
+        stats = super().stats()
+        stats.update({'name': self.name, 'max_chars': self.max_chars, 'skipped': self.skipped})
+        return stats
+
+
+def build_result_cache(config):
+    """RESULT_CACHE_CONFIG → ResultCache (enabled=False면 None)"""
+    options = dict(config)
+    if not options.pop('enabled', True):
+        return None
+    return ResultCache(**options)
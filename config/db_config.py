@@ -17,3 +17,21 @@ DEFAULT_SENIOR_ID = 1
 
 # 센싱 ID (임시 - 나중에 센서와 연동)
 DEFAULT_SENSING_ID = 1
+
+# 커넥션 풀 (db_pool.ConnectionPool, Flask 라우트 + VoiceDBHandler 공유)
+DB_POOL_CONFIG = {
+    'min_size': 1,               # 유휴 정리 후에도 남겨둘 연결 수
+    'max_size': 10,              # 최대 연결 수 (MySQL max_connections보다 충분히 작게)
+    'acquire_timeout': 5.0,      # 빈 연결 대기 시간 (초)
+    'idle_timeout': 300.0,       # 이 시간 넘게 안 쓴 연결은 닫음 (초)
+    'max_lifetime': 3600.0,      # 연결 최대 수명 (MySQL wait_timeout보다 짧게, 초)
+    'health_check_after': 30.0,  # 이 시간 넘게 쉰 연결은 꺼낼 때 ping (초)
+    'reap_interval': 60.0,       # 유휴 정리 주기 (초)
+}
+
+# FastAPI 서버용 비동기 DB (async_db_handler.AsyncVoiceDBHandler)
+ASYNC_DB_CONFIG = {
+    'backend': 'mysql',                          # 'mysql' (aiomysql 풀) | 'sqlite' (로컬 테스트용 대체 DB)
+    'sqlite_path': './data/care_db_local.sqlite3',  # backend='sqlite'일 때 파일 (':memory:' 가능)
+    'retries': 2,                                # 연결 오류 시 재시도 횟수
+}
@@ -1,7 +1,35 @@
 MODELS = {
     # STT (Whisper)
     'whisper': "openai/whisper-medium",
-    
+
+    # STT tier (요청마다 stt_policy가 선택, 함께 로드)
+    'stt_tiers': {
+        'tiny': "openai/whisper-tiny",
+        'base': "openai/whisper-base",
+        'small': "openai/whisper-small",
+        'medium': "openai/whisper-medium",
+    },
+
+    # STT tier 선택 정책 (stt_policy.STTTierPolicy)
+    'stt_policy': {
+        'enabled_tiers': ['tiny', 'base', 'small', 'medium'],  # 로드할 tier (작은 것부터 로딩)
+        'default_tier': 'medium',      # 여유 있을 때 쓰는 tier (기존 동작)
+        'latency_slo_ms': 8000,        # 요청당 지연 목표
+        'overhead_ms': 300,            # 디코딩/VAD/감정 등 STT 외 고정 비용
+        'max_queue_depth': {           # 대기 건수가 이보다 많으면 그 tier 건너뜀
+            'medium': 4,
+            'small': 12,
+            'base': 24,
+        },
+        'rtf': {                       # 실시간 계수 초기값 (처리시간 ÷ 음성길이, CPU 기준)
+            'tiny': 0.05,
+            'base': 0.1,
+            'small': 0.3,
+            'medium': 0.8,
+        },
+        'rtf_ema': 0.2,                # 실측 RTF 반영 비율 (이동 평균)
+    },
+
     # 어휘 분석 (KcELECTRA)
     'tokenizer': "beomi/KcELECTRA-base-v2022",
     
@@ -12,6 +40,72 @@ MODELS = {
     'emotion_text': "MelissaJ/koelectra-emotion-6-emotion-base",  # ← 여기만 바꿈!
     'emotion_audio': "jungjongho/wav2vec2-xlsr-korean-speech-emotion-recognition",
     
+    # 추론 백엔드 (GPU 없는 서버는 int8 또는 onnx 권장)
+    'inference_options': {
+        'backend': 'torch',             # 'torch' (fp32) | 'int8' (동적 양자화) | 'onnx' (ONNX Runtime)
+        'overrides': {},                # 모델별 지정, 예: {'whisper': 'int8', 'emotion_text': 'onnx'}
+        'onnx_cache_dir': './model_cache/onnx',  # ONNX 변환 결과 캐시
+        'num_threads': None,            # CPU 추론 스레드 수 (None이면 기본값)
+    },
+    
+    # Whisper 청크 STT (30초 넘는 발화도 전체 인식)
+    'whisper_options': {
+        'chunk_length_s': 30,          # Whisper 입력 윈도우 (모델 최대 30초)
+        'stride_length_s': 5,          # 윈도우 양쪽 겹침 (경계 단어 잘림 방지)
+        'return_timestamps': 'word',   # 단어별 타임스탬프
+        'segment_gap_sec': 0.8,        # 단어 간격이 이보다 길면 구간 분리
+    },
+    
+    # 음성 구간 검출 (VAD: 에너지 + 영교차율)
+    'vad_options': {
+        'frame_ms': 25,                     # 프레임 길이
+        'hop_ms': 10,                       # 프레임 간격
+        'zcr_threshold': 0.25,              # 이 이상이면 무성음(마찰음/잡음)
+        'min_silence_sec': 0.3,             # 이보다 짧은 끊김은 침묵으로 안 봄
+        'min_speech_sec': 0.1,              # 이보다 짧은 소리는 잡음으로 제거
+        'pad_sec': 0.2,                     # Whisper 입력 구간 앞뒤 여유
+        'pause_bins': [0.3, 0.5, 1.0, 2.0], # 침묵 분포 구간 (초)
+        'no_pause_vpr': 5.0,                # 발화 사이 침묵이 없는(한 번에 이어 말한) 답변의 VPR
+                                            # (활력도 정상 범위 2~10 안의 중립값)
+    },
+    
+    # 스트리밍 분석 (StreamingSession: 녹음 중 구간별 미리 분석)
+    'streaming_options': {
+        'commit_silence_sec': 0.6,   # 이만큼 조용하면 구간 확정 → Whisper 시작
+        'max_phrase_sec': 25.0,      # 구간 최대 길이 (Whisper 30초 윈도우 안)
+    },
+    
+    # 음성 감정 입력 길이 (60초 고정 패딩 대신 실제 길이 사용)
+    'emotion_audio_options': {
+        'window_sec': 10.0,   # 이보다 긴 발화는 10초 윈도우로 나눠서 평균
+        'hop_sec': 5.0,       # 윈도우 간격 (50% 겹침)
+        'min_sec': 1.0,       # 너무 짧은 발화는 1초까지만 패딩
+        'max_sec': 60.0,      # 분석 최대 길이 (기존과 동일)
+    },
+    
+    # 짧은 문장 캐시 (토큰화 / 텍스트 감정 확률, cache.TextCache)
+    'text_cache_options': {
+        'max_entries': 4096,   # 캐시별 최대 문장 수 (LRU)
+        'max_chars': 40,       # 이보다 긴 문장은 캐시 안 함 ("네", "괜찮아" 같은 짧은 반복 발화용)
+    },
+    
+    # 배치 추론 크기 (SpeechAnalyzer.analyze_batch)
+    'batch_options': {
+        'whisper_batch_size': 8,
+        'text_batch_size': 32,
+        'audio_batch_size': 8,
+    },
+    
+    # 피치(F0) 추정 (Pitch Z-score용)
+    'pitch_options': {
+        'backend': 'yin',       # 'yin' (빠름, 기본) | 'pyin' (기준, 느림)
+        'fmin': 60.0,           # 노인 음성 F0 범위 (Hz)
+        'fmax': 400.0,
+        'frame_length': 1024,
+        'hop_length': 256,
+        'yin_threshold': 0.1,
+    },
+    
     'llm_options': {
         'load_in_4bit': True,
         'device_map': 'auto',
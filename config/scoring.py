@@ -1,8 +1,15 @@
 """
 점수 계산 기준 및 함수
 - 기존 7가지 (감정 포함) + VPR 추가
+- ScoringEngine: 여러 발화를 NumPy로 한 번에 채점 + 가중치(weight) 적용
+  (요청별 채점과 tb_voice_log 과거 데이터 재채점에 같이 사용)
 """
 
+import hashlib
+import json
+
+import numpy as np
+
 SCORING_CRITERIA = {
     # 말의 속도 (WPM: Words Per Minute)
     'speed': {
@@ -82,6 +89,160 @@ def calculate_score(value, optimal_min, optimal_max):
         return max(0.0, 100.0 - penalty)
 
 
+def emotion_stability_score(emotion_info):
+    """
+    감정 안정도 점수 계산 (SpeechAnalyzer 채점용, 반올림 없음)
+    
+    Args:
+        emotion_info: EmotionEnsemble.predict() 결과
+    
+    Returns:
+        score: 0-100 점수
+    """
+    if not emotion_info or 'final_emotion' not in emotion_info:
+        return 70.0
+    
+    final_emotion = emotion_info.get('final_emotion', '중립')
+    confidence = emotion_info.get('audio_conf', 0.5)
+    
+    # 감정 분류
+    POSITIVE = ['기쁨', '행복', 'happiness', 'happy']
+    NEUTRAL = ['중립', 'neutral']
+    
+    # 점수 계산
+    if any(pos in final_emotion.lower() for pos in POSITIVE):
+        score = 80.0 + (confidence * 20.0)
+    elif any(neu in final_emotion.lower() for neu in NEUTRAL):
+        score = 70.0 + (confidence * 10.0)
+    else:  # 부정 감정
+        score = 60.0 - (confidence * 60.0)
+    
+    return max(0.0, min(100.0, score))
+
+
+# 점수 항목 → 채점에 쓰는 특징 이름 (순서 = 점수 딕셔너리 순서)
+SCORE_FEATURES = {
+    'speed': 'wpm',
+    'duration': 'duration',
+    'response': 'response_time',
+    'word_count': 'word_count',
+    'vocabulary': 'ttr',
+    'silence': 'avg_silence',
+    'emotion': 'emotion_score',   # 이미 0-100 점수 (감정 안정도) → 그대로 사용
+    'vitality': 'vpr',
+}
+
+# 범위 채점 없이 특징값을 그대로 점수로 쓰는 항목
+PASSTHROUGH_SCORES = ('emotion',)
+
+
+def score_features(whisper_results, vocab_results, emotion_results):
+    """분석 결과 → 채점용 특징값 (ScoringEngine 입력, tb_voice_score.features_json)"""
+    return {
+        'wpm': whisper_results['wpm'],
+        'duration': whisper_results['duration'],
+        'response_time': whisper_results['response_time'],
+        'word_count': whisper_results['word_count'],
+        'ttr': vocab_results['ttr'],
+        'avg_silence': whisper_results['avg_silence'],
+        'emotion_score': emotion_stability_score(emotion_results),  # 감정 점수 (기존)
+        'vpr': whisper_results['vpr']  # VPR 점수 (추가!)
+    }
+
+
+class ScoringEngine:
+    """
+    벡터화 채점 엔진
+
+    - 특징 행렬 (발화 n개 × 항목 8개) → 점수 행렬을 한 번에 계산
+    - calculate_score()와 같은 연산 순서 → 발화 1개 결과가 기존 스칼라 계산과 동일
+    - average: 기존 단순 평균, weighted_average: SCORING_CRITERIA의 weight 적용
+
+    사용 예:
+        engine = ScoringEngine()
+        scores = engine.score({'wpm': 120, 'duration': 5.0, ...})
+        scores_list = engine.score_batch([features1, features2, ...])
+    """
+
+    def __init__(self, criteria=None):
+        """
+        Args:
+            criteria: SCORING_CRITERIA 형식 (None이면 설정값)
+        """
+        criteria = criteria or SCORING_CRITERIA
+        self.names = tuple(SCORE_FEATURES)
+        self.features = tuple(SCORE_FEATURES[name] for name in self.names)
+
+        self.optimal_min = np.array([criteria[n]['optimal_min'] for n in self.names], dtype=np.float64)
+        self.optimal_max = np.array([criteria[n]['optimal_max'] for n in self.names], dtype=np.float64)
+        self.weights = np.array([criteria[n].get('weight', 1.0) for n in self.names], dtype=np.float64)
+        self.passthrough = np.array([n in PASSTHROUGH_SCORES for n in self.names])
+
+    def feature_matrix(self, rows):
+        """특징 딕셔너리 리스트 → (n, 8) 행렬"""
+        X = np.empty((len(rows), len(self.features)), dtype=np.float64)
+        for j, f in enumerate(self.features):
+            X[:, j] = [row[f] for row in rows]
+        return X
+
+    def score_matrix(self, X):
+        """
+        특징 행렬 → 항목별 점수 행렬 (0-100)
+
+        calculate_score()를 원소별로 적용한 것과 같은 결과
+        """
+        X = np.asarray(X, dtype=np.float64)
+        lo, hi = self.optimal_min, self.optimal_max
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            below = np.where(lo == 0, 0.0, np.maximum(0.0, X / lo * 100.0))
+            above = np.fmax(0.0, 100.0 - (X - hi) / hi * 100)   # NaN → 0점 (기존과 동일)
+
+        inside = (X >= lo) & (X <= hi)
+        scores = np.where(X < lo, below, np.where(inside, 100.0, above))
+        return np.where(self.passthrough, X, scores)
+
+    def averages(self, S):
+        """
+        점수 행렬 → (단순 평균, 가중 평균)
+        항목 순서대로 더해서 기존 sum(scores.values())와 같은 결과
+        """
+        total = S[:, 0].copy()
+        weighted = S[:, 0] * self.weights[0]
+        for j in range(1, S.shape[1]):
+            total += S[:, j]
+            weighted += S[:, j] * self.weights[j]
+        return total / S.shape[1], weighted / self.weights.sum()
+
+    def score_batch(self, rows):
+        """
+        특징 딕셔너리 리스트 → 점수 딕셔너리 리스트
+
+        Returns:
+            [{'speed', ..., 'vitality', 'average', 'weighted_average'}, ...]
+        """
+        if not rows:
+            return []
+
+        S = self.score_matrix(self.feature_matrix(rows))
+        average, weighted = self.averages(S)
+
+        keys = self.names + ('average', 'weighted_average')
+        table = np.column_stack([S, average, weighted]).tolist()  # 파이썬 float로 한 번에 변환
+        return [dict(zip(keys, values)) for values in table]
+
+    def score(self, features):
+        """발화 1개 채점"""
+        return self.score_batch([features])[0]
+
+
+def criteria_version(criteria=None):
+    """채점 기준 지문 (12자리) - 기준이 바뀌면 값이 바뀜 (재채점 대상 판별)"""
+    criteria = criteria or SCORING_CRITERIA
+    data = json.dumps(criteria, sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:12]
+
+
 def calculate_emotion_score(emotion_info):
     """
     감정 안정도 점수 계산
@@ -0,0 +1,41 @@
+"""
+서버 추론 설정
+"""
+
+# /analyze 마이크로 배치 스케줄러 (server_async.py)
+SCHEDULER_CONFIG = {
+    'max_batch_size': 4,      # 한 번에 묶을 최대 요청 수
+    'max_wait_ms': 20,        # 첫 요청 후 배치를 모으는 최대 시간
+    'max_queue_depth': 32,    # 대기열 최대 길이 (초과 시 503)
+    'num_workers': 1,         # 동시 실행 배치 수 (GPU 1개면 1 권장)
+}
+
+# 모델 레지스트리 (server_async.py, server.py, bomi.py)
+MODEL_REGISTRY_CONFIG = {
+    'warmup': True,           # 로드 직후 가짜 입력으로 1회 추론 (첫 요청 지연 제거)
+}
+
+# 분석 결과 캐시 (같은 음성 재전송 시 분석 생략, cache.ResultCache)
+RESULT_CACHE_CONFIG = {
+    'enabled': True,
+    'max_entries': 256,       # 메모리에 보관할 최대 결과 수 (LRU)
+    'ttl_sec': 3600,          # 결과 유효 시간
+    'disk_dir': None,         # 디스크 캐시 폴더 (예: './cache/results', None이면 메모리만)
+    'disk_max_entries': 5000, # 디스크 최대 결과 수
+}
+
+# 실시간 알림 스트림 (alert_dispatcher.AlertDispatcher → bomi.py /api/alert-stream)
+ALERT_STREAM_CONFIG = {
+    'poll_interval_sec': 2.0,  # 새 알림 확인 주기 (탭 수와 상관없이 서버 전체에서 1번)
+    'heartbeat_sec': 15.0,     # 알림이 없을 때 연결 유지용 주석 전송 주기
+    'queue_size': 100,         # 구독자별 대기 알림 수 (넘으면 오래된 것부터 버림)
+    'replay_limit': 50,        # 재연결 시 놓친 알림 최대 재전송 수
+}
+
+# 어르신별 센서 상태 캐시 (sensor_state.SensorStateStore → /latest-sensing, bomi.py 활동량 API)
+SENSOR_STATE_CONFIG = {
+    'refresh_sec': 2.0,        # 새 센싱 행 확인 주기 (서버 전체에서 1번)
+    'window_days': 28,         # 보관할 일별 횟수 기간 (월간 그래프)
+    'max_seniors': 1000,       # 캐시할 최대 어르신 수 (LRU)
+    'fetch_limit': 5000,       # 새 행 조회 1번에 읽을 최대 행 수
+}
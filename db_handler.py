@@ -1,199 +1,245 @@
 """
 MySQL DB 핸들러
 음성 분석 결과를 DB에 저장
+
+- 연결은 db_pool 공유 풀에서 호출마다 빌리고 반납 → 여러 스레드/비동기 작업에서 동시에 사용 가능
+- 호출마다 새 커서 + 트랜잭션 (성공하면 commit, 실패하면 rollback)
+- 연결이 끊긴 경우(서버 재시작, wait_timeout 등) 새 연결로 자동 재시도
 """
 
+import time
+from contextlib import contextmanager
+
 import pymysql
 from config.db_config import DB_CONFIG
+from config.serving import SENSOR_STATE_CONFIG
+from db_pool import get_pool
+from db_queries import (
+    VOICE_LOG_SQL, ANALYSIS_SQL, VOICE_SCORE_SQL, RECENT_ANALYSES_SQL, LATEST_SENSING_SQL,
+    voice_log_params, analysis_params, voice_score_params, print_saved
+)
+from sensor_state import SensorStateStore
+
+
+# 재시도해도 되는 연결 오류 (연결 실패 / server has gone away / 연결 끊김)
+RETRYABLE_ERRORS = (2003, 2006, 2013, 2055)
+
+
+def _is_connection_error(e):
+    if isinstance(e, pymysql.err.InterfaceError):
+        return True
+    return isinstance(e, pymysql.err.OperationalError) and bool(e.args) and e.args[0] in RETRYABLE_ERRORS
 
 
 class VoiceDBHandler:
-    """음성 분석 결과 DB 저장 핸들러"""
-    
-    def __init__(self):
-        """초기화"""
-        self.connection = None
-        self.cursor = None
-    
+    """음성 분석 결과 DB 저장 핸들러 (스레드 안전)"""
+
+    def __init__(self, pool=None, retries=2, retry_delay=0.2, sensor_state=None):
+        """
+        초기화
+
+        Args:
+            pool: db_pool.ConnectionPool (None이면 공유 풀, 넘긴 풀은 close() 때 함께 닫음)
+            retries: 연결 오류 시 재시도 횟수
+            retry_delay: 재시도 간격 (초, 재시도마다 2배)
+            sensor_state: sensor_state.SensorStateStore (None이면 새로 생성)
+        """
+        self.pool = pool or get_pool()
+        self._owns_pool = pool is not None  # 공유 풀은 다른 라우트/핸들러도 쓰므로 닫지 않음
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.sensor_state = sensor_state or SensorStateStore(**SENSOR_STATE_CONFIG)
+
     def connect(self):
-        """DB 연결"""
+        """DB 연결 확인 (서버 시작 시 1회)"""
         try:
-            self.connection = pymysql.connect(
-                host=DB_CONFIG['host'],
-                port=DB_CONFIG['port'],
-                user=DB_CONFIG['user'],
-                password=DB_CONFIG['password'],
-                database=DB_CONFIG['database'],
-                charset=DB_CONFIG['charset']
-            )
-            self.cursor = self.connection.cursor()
+            self._run(lambda cursor: cursor.execute("SELECT 1"))
             print(f"✅ DB 연결 성공: {DB_CONFIG['database']}")
             return True
         except Exception as e:
             print(f"❌ DB 연결 실패: {e}")
             return False
-    
+
+    # ========== 트랜잭션 ==========
+
+    @contextmanager
+    def transaction(self):
+        """
+        트랜잭션 범위 (여러 쿼리를 한 번에 확정할 때)
+
+        사용 예:
+            with db_handler.transaction() as cursor:
+                cursor.execute(...)
+                cursor.execute(...)
+            # 블록이 끝나면 commit, 예외가 나면 rollback
+        """
+        conn = self.pool.connection()
+        try:
+            with conn.cursor(pymysql.cursors.Cursor) as cursor:
+                yield cursor
+            conn.commit()
+        except Exception as e:
+            if _is_connection_error(e):
+                conn.discard()   # 끊긴 연결은 풀에 돌려놓지 않음
+            raise
+        finally:
+            conn.close()         # 반납 (commit 안 된 작업은 rollback)
+
+    def _run(self, work):
+        """
+        work(cursor)를 트랜잭션 안에서 실행 (연결 오류면 재시도)
+
+        commit 도중 연결이 끊긴 경우는 재시도하지 않음
+        (서버에 반영됐는지 알 수 없어서 INSERT가 두 번 들어갈 수 있음)
+        """
+        for attempt in range(self.retries + 1):
+            conn = None
+            try:
+                conn = self.pool.connection()
+                with conn.cursor(pymysql.cursors.Cursor) as cursor:
+                    result = work(cursor)
+            except Exception as e:
+                if conn is not None:
+                    if _is_connection_error(e):
+                        conn.discard()
+                    else:
+                        conn.close()
+                if _is_connection_error(e) and attempt < self.retries:
+                    delay = self.retry_delay * (2 ** attempt)
+                    print(f"⚠️ DB 연결 오류 → 재연결 후 재시도 ({attempt + 1}/{self.retries}): {e}")
+                    time.sleep(delay)
+                    continue
+                raise
+
+            try:
+                conn.commit()
+            except Exception:
+                conn.discard()
+                raise
+            conn.close()
+            return result
+
+    # ========== 저장 / 조회 ==========
+
     def save_analysis(self, senior_id, analysis_result, sensing_id=None):
         """
         분석 결과를 DB에 저장
-        
+
         Args:
             senior_id: 시니어 ID
             analysis_result: analyzer.analyze() 결과
             sensing_id: 센싱 ID (없으면 None → 0으로 저장)
-        
+
         Returns:
             voice_id: 성공 시 저장된 voice_id
             None: 실패 시
         """
-        if not self.connection:
-            print("❌ DB 연결이 없습니다!")
-            return None
-        
-        try:
-            # ========== 수정: None → 0 변환 ==========
-            if sensing_id is None:
-                sensing_id = 0
-            # =========================================
-            
-            # 데이터 추출
-            whisper = analysis_result['features']['whisper']
-            emotion = analysis_result['features']['emotion']
-            
-            # ========================================
-            # 1단계: tb_voice_log에 저장
-            # ========================================
-            voice_sql = """
-                INSERT INTO tb_voice_log 
-                (senior_id, sensing_id, voice_text, response_time_sec, utterance_length)
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            
-            self.cursor.execute(voice_sql, (
-                senior_id,
-                sensing_id,  # ← 0 또는 실제 값!
-                whisper['text'],
-                round(whisper['response_time'], 1),
-                round(whisper['duration'], 1)
-            ))
-            
-            # 방금 삽입한 voice_id 가져오기
-            voice_id = self.cursor.lastrowid
-            
-            # ========================================
+        # ========== 수정: None → 0 변환 ==========
+        if sensing_id is None:
+            sensing_id = 0
+        # =========================================
+
+        def work(cursor):
+            # 1단계: tb_voice_log에 저장 → 방금 삽입한 voice_id
+            cursor.execute(VOICE_LOG_SQL, voice_log_params(senior_id, sensing_id, analysis_result))
+            voice_id = cursor.lastrowid
+
             # 2단계: tb_analysis에 저장
-            # ========================================
-            
-            # 감정 비율 추출 (candidates에서)
-            candidates = emotion.get('candidates', {})
-            
-            analysis_sql = """
-                INSERT INTO tb_analysis 
-                (voice_idx, emotion_label, stt_text, behavior_policy,
-                 hap_ratio, sad_ratio, neu_ratio, ang_ratio, 
-                 anxi_ratio, emba_ratio, heart_ratio)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            self.cursor.execute(analysis_sql, (
-                voice_id,
-                emotion['final_emotion'],
-                whisper['text'],
-                None,  # behavior_policy (나중에 추가)
-                candidates.get('기쁨', 0.0),      # hap_ratio
-                candidates.get('슬픔', 0.0),      # sad_ratio
-                candidates.get('중립', 0.0),      # neu_ratio (MelissaJ는 없을 수도)
-                candidates.get('분노', 0.0),      # ang_ratio
-                candidates.get('불안', 0.0),      # anxi_ratio
-                candidates.get('당황', 0.0),      # emba_ratio
-                candidates.get('상처', 0.0)       # heart_ratio
-            ))
-            
-            # 커밋 (저장 확정!)
-            self.connection.commit()
-            
-            print(f"\n💾 DB 저장 성공!")
-            print(f"   voice_id: {voice_id}")
-            if sensing_id > 0:
-                print(f"   sensing_id: {sensing_id} (센서 연결됨!)")
-            else:
-                print(f"   sensing_id: 0 (센서 없음)")
-            print(f"   텍스트: {whisper['text'][:30]}...")
-            print(f"   감정: {emotion['final_emotion']}")
-            
+            cursor.execute(ANALYSIS_SQL, analysis_params(voice_id, analysis_result))
             return voice_id
-            
+
+        try:
+            # 두 INSERT를 한 트랜잭션으로 (실패하면 둘 다 롤백)
+            voice_id = self._run(work)
         except Exception as e:
             print(f"\n❌ DB 저장 실패: {e}")
-            self.connection.rollback()  # 실패하면 롤백!
             return None
-    
+
+        # 3단계: 채점 특징 + 점수 (재채점용, 실패해도 분석 저장은 유지)
+        self._save_scores(voice_id, analysis_result)
+
+        print_saved(voice_id, sensing_id, analysis_result)
+        return voice_id
+
+    def _save_scores(self, voice_id, analysis_result):
+        """
+        tb_voice_score에 채점 특징/점수 저장
+        (채점 기준이 바뀌면 rescore_job.py가 이 특징값으로 다시 채점)
+        """
+        try:
+            params = voice_score_params(voice_id, analysis_result)
+            self._run(lambda cursor: cursor.execute(VOICE_SCORE_SQL, params))
+        except Exception as e:
+            # 테이블이 없으면 python db_migrate.py 필요
+            print(f"⚠️ 점수 저장 생략 (tb_voice_score): {e}")
+
     def get_recent_analyses(self, senior_id, limit=10):
         """
         최근 분석 결과 조회
-        
+
         Args:
             senior_id: 시니어 ID
             limit: 조회 개수
-        
+
         Returns:
             분석 결과 리스트
         """
-        if not self.connection:
-            return []
-        
+        def work(cursor):
+            cursor.execute(RECENT_ANALYSES_SQL, (senior_id, limit))
+            return cursor.fetchall()
+
         try:
-            sql = """
-                SELECT 
-                    v.voice_id,
-                    v.voice_text,
-                    v.created_at,
-                    v.sensing_id,
-                    a.emotion_label,
-                    a.hap_ratio,
-                    a.sad_ratio,
-                    a.ang_ratio
-                FROM tb_voice_log v
-                LEFT JOIN tb_analysis a ON v.voice_id = a.voice_idx
-                WHERE v.senior_id = %s
-                ORDER BY v.created_at DESC
-                LIMIT %s
-            """
-            
-            self.cursor.execute(sql, (senior_id, limit))
-            results = self.cursor.fetchall()
-            
-            return results
-            
+            return self._run(work)
         except Exception as e:
             print(f"❌ 조회 실패: {e}")
             return []
-    
+
+    def latest_sensing(self, senior_id=None):
+        """
+        최신 센서 데이터의 sensing_id (없으면 None)
+
+        Args:
+            senior_id: 어르신 ID (센서 상태 캐시에서 조회, None이면 전체 최신 1건)
+
+        Raises:
+            pymysql.err.Error: 재시도 후에도 조회 실패
+        """
+        if senior_id is not None:
+            return self._run(lambda cursor: self.sensor_state.refresh(cursor, senior_id)).latest_sensing_id
+
+        def work(cursor):
+            cursor.execute(LATEST_SENSING_SQL)
+            row = cursor.fetchone()
+            return row[0] if row else None
+
+        return self._run(work)
+
     def close(self):
-        """DB 연결 종료"""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            self.connection.close()
-            print("✅ DB 연결 종료")
+        """
+        DB 연결 종료 (빌린 연결은 호출마다 반납되므로 풀만 정리)
+        공유 풀(get_pool())은 bomi.py 라우트, 알림 디스패처 등이 계속 쓰므로 닫지 않음
+        """
+        if self._owns_pool:
+            self.pool.close()
+        print("✅ DB 연결 종료")
 
 
 # ========== 테스트 ==========
 if __name__ == "__main__":
     # DB 핸들러 생성
     db = VoiceDBHandler()
-    
+
     # 연결 테스트
     if db.connect():
         print("DB 연결 테스트 성공!")
-        
+
         # 최근 분석 조회 테스트
         recent = db.get_recent_analyses(senior_id=1, limit=5)
         print(f"\n최근 분석 {len(recent)}건:")
         for r in recent:
             sensing_status = f"센서 {r[3]}" if r[3] else "센서 없음"
             print(f"  - {r[2]}: {r[4]} ({sensing_status}) - {r[1][:20]}...")
-        
+
         db.close()
     else:
         print("DB 연결 실패! db_config.py를 확인하세요.")
@@ -0,0 +1,104 @@
+"""
+DB 마이그레이션 실행
+- migrations/*.sql 파일을 이름 순서대로 1번씩 적용
+- 적용 기록: tb_schema_migrations (이미 적용한 파일은 건너뜀)
+
+사용법:
+    python db_migrate.py            # 적용 안 된 마이그레이션 실행
+    python db_migrate.py --status   # 적용 현황만 출력
+"""
+
+import glob
+import os
+import sys
+
+import pymysql
+from config.db_config import DB_CONFIG
+
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+
+def connect():
+    return pymysql.connect(
+        host=DB_CONFIG['host'],
+        port=DB_CONFIG['port'],
+        user=DB_CONFIG['user'],
+        password=DB_CONFIG['password'],
+        database=DB_CONFIG['database'],
+        charset=DB_CONFIG['charset']
+    )
+
+
+def split_statements(sql):
+    """SQL 파일 → 문장 리스트 (-- 주석 제거, ; 기준)"""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [stmt.strip() for stmt in "\n".join(lines).split(";") if stmt.strip()]
+
+
+def migration_files():
+    return sorted(glob.glob(os.path.join(MIGRATIONS_DIR, "*.sql")))
+
+
+def applied_versions(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tb_schema_migrations (
+            version     VARCHAR(255) NOT NULL PRIMARY KEY,
+            applied_at  DATETIME     NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT version FROM tb_schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def migrate(status_only=False):
+    """
+    적용 안 된 마이그레이션 실행
+
+    Returns:
+        새로 적용한 파일 이름 리스트
+    """
+    conn = connect()
+    applied = []
+    try:
+        with conn.cursor() as cursor:
+            done = applied_versions(cursor)
+            conn.commit()
+
+            for path in migration_files():
+                version = os.path.basename(path)
+                if version in done:
+                    print(f"   ✓ {version}")
+                    continue
+                if status_only:
+                    print(f"   • {version} (미적용)")
+                    continue
+
+                print(f"   ⏳ {version} 적용 중...")
+                with open(path, encoding="utf-8") as f:
+                    statements = split_statements(f.read())
+
+                # MySQL DDL은 자동 커밋 → 파일 단위로 기록 (실패 시 그 파일부터 다시)
+                for stmt in statements:
+                    cursor.execute(stmt)
+                cursor.execute("INSERT INTO tb_schema_migrations (version) VALUES (%s)", (version,))
+                conn.commit()
+                applied.append(version)
+                print(f"   ✅ {version}")
+    finally:
+        conn.close()
+
+    return applied
+
+
+# ========== 메인 실행 ==========
+if __name__ == "__main__":
+    status = "--status" in sys.argv[1:]
+    print(f"🗂️ 마이그레이션 ({DB_CONFIG['database']})")
+    try:
+        new = migrate(status_only=status)
+    except Exception as e:
+        print(f"❌ 마이그레이션 실패: {e}")
+        sys.exit(1)
+    if not status:
+        print(f"완료: {len(new)}개 적용")
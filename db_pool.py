@@ -0,0 +1,341 @@
+"""
+MySQL 커넥션 풀 (pymysql)
+- 요청마다 새로 연결(TCP + 인증)하지 않고 열린 연결을 재사용
+- 최대 연결 수 제한 (다 쓰고 있으면 acquire_timeout까지 대기)
+- 상태 점검: 오래 쉬었던 연결은 꺼내기 전에 ping → 끊겼으면 새로 연결
+- 유휴 정리: idle_timeout 넘게 안 쓴 연결은 닫음 (min_size까지는 유지)
+- 최대 수명: max_lifetime 넘은 연결은 반납 시 닫고 교체 (MySQL wait_timeout 대비)
+- 반납 시 rollback → 다음 사용자가 이전 트랜잭션/스냅샷을 물려받지 않음
+
+사용 예:
+    pool = get_pool()             # 프로세스 공유 풀 (DB_CONFIG + DB_POOL_CONFIG)
+    conn = pool.connection()      # pymysql 연결처럼 사용
+    cursor = conn.cursor()
+    ...
+    conn.close()                  # 실제로 닫지 않고 풀에 반납
+
+    with pool.connection() as conn:   # with 블록 끝에서 자동 반납
+        ...
+"""
+
+import threading
+import time
+from collections import deque
+
+import pymysql
+from config.db_config import DB_CONFIG, DB_POOL_CONFIG
+
+
+class PoolExhaustedError(Exception):
+    """acquire_timeout 안에 빈 연결을 못 얻음"""
+    pass
+
+
+class _PoolEntry:
+    """풀 안의 실제 연결 1개"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class PooledConnection:
+    """
+    풀에서 빌린 연결 (pymysql.Connection처럼 사용)
+    close()는 연결을 닫지 않고 풀에 반납
+    """
+
+    def __init__(self, pool, entry):
+        self._pool = pool
+        self._entry = entry
+
+    @property
+    def raw(self):
+        if self._entry is None:
+            raise pymysql.err.InterfaceError("이미 풀에 반납된 연결입니다")
+        return self._entry.raw
+
+    def __getattr__(self, name):
+        # cursor(), commit(), rollback(), ping() 등은 실제 연결로 전달
+        return getattr(self.raw, name)
+
+    def close(self):
+        """풀에 반납 (여러 번 호출해도 안전)"""
+        if self._entry is not None:
+            entry, self._entry = self._entry, None
+            self._pool._release(entry)
+
+    def discard(self):
+        """연결이 망가졌을 때: 반납 대신 닫고 버림"""
+        if self._entry is not None:
+            entry, self._entry = self._entry, None
+            self._pool._discard(entry)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        # 반납을 잊은 연결 회수
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """스레드 안전 pymysql 커넥션 풀"""
+
+    def __init__(self, db_config, min_size=1, max_size=10, acquire_timeout=5.0,
+                 idle_timeout=300.0, max_lifetime=3600.0, health_check_after=30.0,
+                 reap_interval=60.0, cursorclass=pymysql.cursors.DictCursor):
+        """
+        Args:
+            db_config: DB_CONFIG 형식 (host, port, user, password, database, charset)
+            min_size: 유휴 정리 후에도 남겨둘 연결 수
+            max_size: 최대 연결 수 (사용 중 + 유휴)
+            acquire_timeout: 빈 연결을 기다리는 최대 시간 (초)
+            idle_timeout: 이 시간 넘게 안 쓴 유휴 연결은 닫음 (초)
+            max_lifetime: 연결 최대 수명 (초)
+            health_check_after: 이 시간 넘게 쉰 연결은 꺼낼 때 ping (초)
+            reap_interval: 유휴 정리 주기 (초)
+            cursorclass: 기본 커서 (기본 DictCursor, conn.cursor(Cursor)로 바꿔 쓸 수 있음)
+        """
+        self.db_config = db_config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+        self.reap_interval = reap_interval
+        self.cursorclass = cursorclass
+
+        self._idle = deque()              # 유휴 연결 (최근 반납한 것이 오른쪽)
+        self._size = 0                    # 전체 연결 수 (사용 중 + 유휴 + 연결 중)
+        self._cond = threading.Condition()
+        self._closed = False
+        self._reaper = None
+
+        self._stats = {
+            'created': 0,
+            'closed': 0,
+            'acquired': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'health_check_failures': 0,
+            'expired': 0,
+            'reaped': 0,
+            'wait_ms_total': 0.0,
+        }
+
+    # ========== 빌리기 / 반납 ==========
+
+    def connection(self, timeout=None):
+        """
+        연결 빌리기
+
+        Args:
+            timeout: 대기 시간 (None이면 acquire_timeout)
+
+        Raises:
+            PoolExhaustedError: 시간 안에 빈 연결 없음
+            pymysql.err.OperationalError: 새 연결 실패
+        """
+        self._start_reaper()
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+        start = time.perf_counter()
+
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise pymysql.err.InterfaceError("커넥션 풀이 닫혔습니다")
+
+                entry = self._idle.pop() if self._idle else None
+                create = entry is None and self._size < self.max_size
+                if create:
+                    self._size += 1  # 자리 예약 (연결은 락 밖에서)
+
+                if entry is None and not create:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolExhaustedError(
+                            f"DB 연결 대기 시간 초과 ({timeout}초, 최대 {self.max_size}개 사용 중)"
+                        )
+                    if not waited:
+                        self._stats['waits'] += 1
+                        waited = True
+                    self._cond.wait(remaining)
+                    continue
+
+            if create:
+                try:
+                    entry = _PoolEntry(self._connect())
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._healthy(entry):
+                self._discard(entry)
+                continue
+
+            with self._cond:
+                self._stats['acquired'] += 1
+                self._stats['wait_ms_total'] += (time.perf_counter() - start) * 1000
+            entry.last_used = time.monotonic()
+            return PooledConnection(self, entry)
+
+    def _release(self, entry):
+        """반납: 트랜잭션 정리 → 수명 확인 → 유휴 목록으로"""
+        try:
+            entry.raw.rollback()
+        except Exception:
+            self._discard(entry)
+            return
+
+        if time.monotonic() - entry.created_at > self.max_lifetime:
+            with self._cond:
+                self._stats['expired'] += 1
+            self._discard(entry)
+            return
+
+        entry.last_used = time.monotonic()
+        with self._cond:
+            if self._closed:
+                self._close_raw(entry)
+                self._size -= 1
+            else:
+                self._idle.append(entry)
+            self._cond.notify()
+
+    def _discard(self, entry):
+        """연결 닫고 자리 반환"""
+        self._close_raw(entry)
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    # ========== 연결 관리 ==========
+
+    def _connect(self):
+        raw = pymysql.connect(
+            host=self.db_config['host'],
+            port=self.db_config.get('port', 3306),
+            user=self.db_config['user'],
+            password=self.db_config['password'],
+            database=self.db_config['database'],
+            charset=self.db_config.get('charset', 'utf8mb4'),
+            cursorclass=self.cursorclass
+        )
+        with self._cond:
+            self._stats['created'] += 1
+        return raw
+
+    def _healthy(self, entry):
+        """오래 쉬었거나 수명이 다 된 연결 점검"""
+        now = time.monotonic()
+        if now - entry.created_at > self.max_lifetime:
+            with self._cond:
+                self._stats['expired'] += 1
+            return False
+        if now - entry.last_used < self.health_check_after:
+            return True
+        try:
+            entry.raw.ping(reconnect=False)
+            return True
+        except Exception:
+            with self._cond:
+                self._stats['health_check_failures'] += 1
+            return False
+
+    def _close_raw(self, entry):
+        try:
+            entry.raw.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._stats['closed'] += 1
+
+    def reap_idle(self):
+        """idle_timeout 넘은 유휴 연결 닫기 (min_size까지는 유지)"""
+        now = time.monotonic()
+        stale = []
+        with self._cond:
+            # 오래된 것(왼쪽)부터 확인
+            while self._idle and self._size - len(stale) > self.min_size:
+                entry = self._idle[0]
+                if now - entry.last_used < self.idle_timeout:
+                    break
+                stale.append(self._idle.popleft())
+            self._stats['reaped'] += len(stale)
+
+        for entry in stale:
+            self._discard(entry)
+        return len(stale)
+
+    def _start_reaper(self):
+        if self._reaper is not None or not self.reap_interval:
+            return
+        with self._cond:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(target=self._reap_loop, name="db-pool-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self):
+        while not self._closed:
+            time.sleep(self.reap_interval)
+            try:
+                self.reap_idle()
+            except Exception as e:
+                print(f"⚠️ DB 풀 유휴 정리 오류: {e}")
+
+    def close(self):
+        """유휴 연결 모두 닫기 (사용 중인 연결은 반납될 때 닫힘)"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for entry in idle:
+            self._discard(entry)
+
+    # ========== 통계 ==========
+
+    def stats(self):
+        """풀 상태 (/api/voice-health 등에서 확인)"""
+        with self._cond:
+            stats = dict(self._stats)
+            idle = len(self._idle)
+            size = self._size
+
+        acquired = stats.pop('wait_ms_total')
+        stats.update({
+            'size': size,
+            'idle': idle,
+            'in_use': size - idle,
+            'max_size': self.max_size,
+            'avg_acquire_ms': round(acquired / stats['acquired'], 2) if stats['acquired'] else 0.0,
+        })
+        return stats
+
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def get_pool():
+    """프로세스 공유 풀 (첫 호출 때 생성, 연결은 실제로 빌릴 때 생성)"""
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_lock:
+            if _shared_pool is None:
+                _shared_pool = ConnectionPool(DB_CONFIG, **DB_POOL_CONFIG)
+    return _shared_pool
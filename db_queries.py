@@ -0,0 +1,116 @@
+"""
+음성 분석 DB 쿼리 + 파라미터
+동기 핸들러(db_handler.VoiceDBHandler)와 비동기 핸들러(async_db_handler.AsyncVoiceDBHandler)가 함께 사용
+(플레이스홀더는 pymysql/aiomysql 형식 %s, SQLite는 실행할 때 ?로 바꿈)
+"""
+
+import json
+
+from config.scoring import score_features, criteria_version
+
+
+VOICE_LOG_SQL = """
+    INSERT INTO tb_voice_log
+    (senior_id, sensing_id, voice_text, response_time_sec, utterance_length)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+ANALYSIS_SQL = """
+    INSERT INTO tb_analysis
+    (voice_idx, emotion_label, stt_text, behavior_policy,
+     hap_ratio, sad_ratio, neu_ratio, ang_ratio,
+     anxi_ratio, emba_ratio, heart_ratio)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+VOICE_SCORE_SQL = """
+    INSERT INTO tb_voice_score
+    (voice_id, features_json, feature_source, scores_json,
+     average_score, weighted_score, criteria_version)
+    VALUES (%s, %s, 'analysis', %s, %s, %s, %s)
+"""
+
+RECENT_ANALYSES_SQL = """
+    SELECT
+        v.voice_id,
+        v.voice_text,
+        v.created_at,
+        v.sensing_id,
+        a.emotion_label,
+        a.hap_ratio,
+        a.sad_ratio,
+        a.ang_ratio
+    FROM tb_voice_log v
+    LEFT JOIN tb_analysis a ON v.voice_id = a.voice_idx
+    WHERE v.senior_id = %s
+    ORDER BY v.created_at DESC
+    LIMIT %s
+"""
+
+LATEST_SENSING_SQL = """
+    SELECT sensing_id
+    FROM tb_sensing
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+
+
+def voice_log_params(senior_id, sensing_id, analysis_result):
+    """tb_voice_log INSERT 파라미터"""
+    whisper = analysis_result['features']['whisper']
+    return (
+        senior_id,
+        sensing_id,  # ← 0 또는 실제 값!
+        whisper['text'],
+        round(whisper['response_time'], 1),
+        round(whisper['duration'], 1)
+    )
+
+
+def analysis_params(voice_id, analysis_result):
+    """tb_analysis INSERT 파라미터 (감정 비율은 candidates에서)"""
+    whisper = analysis_result['features']['whisper']
+    emotion = analysis_result['features']['emotion']
+    candidates = emotion.get('candidates', {})
+    return (
+        voice_id,
+        emotion['final_emotion'],
+        whisper['text'],
+        None,  # behavior_policy (나중에 추가)
+        candidates.get('기쁨', 0.0),      # hap_ratio
+        candidates.get('슬픔', 0.0),      # sad_ratio
+        candidates.get('중립', 0.0),      # neu_ratio (MelissaJ는 없을 수도)
+        candidates.get('분노', 0.0),      # ang_ratio
+        candidates.get('불안', 0.0),      # anxi_ratio
+        candidates.get('당황', 0.0),      # emba_ratio
+        candidates.get('상처', 0.0)       # heart_ratio
+    )
+
+
+def voice_score_params(voice_id, analysis_result):
+    """tb_voice_score INSERT 파라미터 (재채점용 특징값 + 점수)"""
+    features = analysis_result['features']
+    scores = analysis_result['scores']
+    feature_values = score_features(features['whisper'], features['vocabulary'], features['emotion'])
+    return (
+        voice_id,
+        json.dumps(feature_values),
+        json.dumps(scores),
+        round(scores['average'], 2),
+        round(scores.get('weighted_average', scores['average']), 2),
+        criteria_version()
+    )
+
+
+def print_saved(voice_id, sensing_id, analysis_result):
+    """저장 결과 로그"""
+    whisper = analysis_result['features']['whisper']
+    emotion = analysis_result['features']['emotion']
+    print(f"\n💾 DB 저장 성공!")
+    print(f"   voice_id: {voice_id}")
+    if sensing_id > 0:
+        print(f"   sensing_id: {sensing_id} (센서 연결됨!)")
+    else:
+        print(f"   sensing_id: 0 (센서 없음)")
+    print(f"   텍스트: {whisper['text'][:30]}...")
+    print(f"   감정: {emotion['final_emotion']}")
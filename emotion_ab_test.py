@@ -0,0 +1,127 @@
+"""
+음성 감정 A/B 테스트
+A: 기존 방식 (모든 발화를 60초로 0 패딩)
+B: 길이 기반 방식 (실제 길이 + 긴 발화는 윈도우 평균)
+
+recordings/, data/ 폴더의 WAV 파일로 지연 시간과 레이블 일치율 비교
+
+사용법: python emotion_ab_test.py [파일 또는 폴더 ...]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+from audio_io import load_audio, collect_audio_files
+from emotion_model import EmotionEnsemble
+
+
+DEFAULT_DIRS = ["./recordings", "./data"]
+
+
+def padded_audio_stage(engine, audio):
+    """기존 방식 재현: 60초로 0 패딩 후 wav2vec2 1회 추론"""
+    y = audio.pcm
+    target_len = 16000 * 60  # 60초 (1분)
+    if len(y) > target_len:
+        y = y[:target_len]
+    else:
+        y = np.pad(y, (0, max(0, target_len - len(y))), "constant")
+
+    a_inputs = engine.audio_processor(
+        y,
+        sampling_rate=16000,
+        return_tensors="pt",
+        padding=True
+    ).input_values.to(engine.device)
+
+    with torch.no_grad():
+        audio_probs = F.softmax(engine.audio_model(a_inputs).logits, dim=-1)[0].cpu()
+
+    audio_idx = torch.argmax(audio_probs).item()
+    return {
+        'probs': audio_probs,
+        'label_raw': engine.audio_labels[audio_idx],
+        'conf': audio_probs[audio_idx].item()
+    }
+
+
+def measure(fn, *args, repeat=3):
+    """평균 지연 시간(ms)과 마지막 결과 반환"""
+    result = fn(*args)  # 워밍업
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(*args)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+    return elapsed_ms, result
+
+
+def run_ab_test(files, repeat=3):
+    """파일별 A/B 비교 결과 리스트 반환"""
+    engine = EmotionEnsemble()
+    rows = []
+
+    for path in files:
+        audio = load_audio(path)
+
+        padded_ms, padded = measure(padded_audio_stage, engine, audio, repeat=repeat)
+        length_ms, length_aware = measure(engine._audio_stage, audio, repeat=repeat)
+
+        rows.append({
+            'file': path,
+            'duration': audio.duration,
+            'padded_ms': padded_ms,
+            'length_ms': length_ms,
+            'padded_label': engine._translate_audio(padded['label_raw']),
+            'length_label': engine._translate_audio(length_aware['label_raw']),
+            'padded_conf': padded['conf'],
+            'length_conf': length_aware['conf'],
+            'n_windows': length_aware['n_windows'],
+            'prob_l1': float((padded['probs'] - length_aware['probs']).abs().sum())
+        })
+
+    return rows
+
+
+def print_report(rows):
+    """비교 결과 출력"""
+    print("\n" + "="*100)
+    print("📊 음성 감정 A/B 결과 (A: 60초 패딩, B: 길이 기반)")
+    print("="*100)
+    print(f"{'파일':<36} {'길이':>6} {'A(ms)':>9} {'B(ms)':>9} {'속도':>6} {'A 레이블':>10} {'B 레이블':>10} {'L1':>6}")
+    print("-"*100)
+
+    for r in rows:
+        speedup = r['padded_ms'] / r['length_ms'] if r['length_ms'] > 0 else 0.0
+        print(
+            f"{os.path.basename(r['file']):<36} {r['duration']:>5.1f}s "
+            f"{r['padded_ms']:>9.1f} {r['length_ms']:>9.1f} {speedup:>5.1f}x "
+            f"{r['padded_label']:>10} {r['length_label']:>10} {r['prob_l1']:>6.3f}"
+        )
+
+    if not rows:
+        print("분석할 파일이 없습니다.")
+        return
+
+    agree = sum(1 for r in rows if r['padded_label'] == r['length_label'])
+    total_padded = sum(r['padded_ms'] for r in rows)
+    total_length = sum(r['length_ms'] for r in rows)
+
+    print("-"*100)
+    print(f"레이블 일치율: {agree}/{len(rows)} ({agree / len(rows) * 100:.1f}%)")
+    print(f"총 지연 시간: A {total_padded:.1f}ms → B {total_length:.1f}ms "
+          f"({total_padded / max(total_length, 1e-9):.1f}x)")
+
+
+# ========== 메인 실행 ==========
+if __name__ == "__main__":
+    targets = sys.argv[1:] or DEFAULT_DIRS
+    wav_files = collect_audio_files(targets)
+
+    print(f"🎵 테스트 파일 {len(wav_files)}개")
+    results = run_ab_test(wav_files)
+    print_report(results)
@@ -8,15 +8,20 @@ PDF 기술노트 기반 구현 + MelissaJ 모델 대응
 3. 3가지 상황별 가중치 적용
 4. MelissaJ 6감정 모델 지원
 5. 영어 레이블 강제 한글 매핑 (수정!)
+6. 텍스트/음성/통합 단계 분리 (모델 순전파 1회 + 단계별 시간 리포트)
 """
 
+import time
 import torch
 import torch.nn.functional as F
-import librosa
 import numpy as np
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-from transformers import Wav2Vec2Processor, Wav2Vec2ForSequenceClassification
+from transformers import AutoTokenizer
+from transformers import Wav2Vec2Processor
 from config.models import MODELS
+from inference_backend import load_model
+from audio_io import load_audio
+from pitch_tracker import get_pitch_estimator
+from cache import TextCache
 
 
 class EmotionEnsemble:
@@ -30,6 +35,9 @@ class EmotionEnsemble:
     
     def __init__(self):
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.last_timings = {}  # 마지막 predict()의 단계별 소요 시간 (ms)
+        # 짧은 반복 문장의 텍스트 감정 확률 캐시 (요청/스레드 공유)
+        self.text_cache = TextCache('text_emotion', **MODELS['text_cache_options'])
         print(f"❤️‍🩹 개선된 감정 분석 엔진 초기화 (Device: {self.device})")
 
         try:
@@ -42,9 +50,7 @@ class EmotionEnsemble:
             
             # 1. 텍스트 모델 로딩
             self.text_tokenizer = AutoTokenizer.from_pretrained(text_model_name)
-            self.text_model = AutoModelForSequenceClassification.from_pretrained(
-                text_model_name
-            ).to(self.device)
+            self.text_model, self.text_backend = load_model('emotion_text', self.device)
             
             # ========== 수정: MelissaJ 모델 강제 한글 매핑 ==========
             if "MelissaJ" in text_model_name:
@@ -68,219 +74,529 @@ class EmotionEnsemble:
 
             # 2. 음성 모델 로딩
             self.audio_processor = Wav2Vec2Processor.from_pretrained(audio_model_name)
-            self.audio_model = Wav2Vec2ForSequenceClassification.from_pretrained(
-                audio_model_name
-            ).to(self.device)
+            self.audio_model, self.audio_backend = load_model('emotion_audio', self.device)
             self.audio_labels = self.audio_model.config.id2label
             
+            # layer-norm 계열(xlsr)만 attention_mask 지원 (group-norm 계열은 패딩 0으로 처리)
+            self.audio_uses_mask = getattr(self.audio_model.config, 'feat_extract_norm', 'layer') == 'layer'
+            
+            # 3. 피치 추정기 (기본: 벡터화 YIN)
+            self.pitch_estimator = get_pitch_estimator()
+            print(f"   피치 추정: {self.pitch_estimator.name} "
+                  f"({self.pitch_estimator.fmin:.0f}~{self.pitch_estimator.fmax:.0f}Hz)")
+            
             print("✅ 개선된 멀티모달 감정 모델 준비 완료")
             
         except Exception as e:
             print(f"❌ 모델 로딩 실패: {e}")
             raise e
 
-    def predict(self, audio_path, text):
+    def predict(self, audio, text, vad=None):
         """
         개선된 감정 예측
         
         Args:
-            audio_path: 음성 파일 경로
+            audio: AudioData (SpeechAnalyzer가 디코딩한 것) 또는 음성 파일 경로
             text: STT 결과 텍스트
+            vad: VADResult (있으면 Pitch는 VAD 유성 프레임만 계산)
         
         Returns:
-            감정 분석 결과 딕셔너리
+            감정 분석 결과 딕셔너리 (+ 'timings': 단계별 소요 시간 ms)
+        
+        단계 구성 (각 단계의 텐서는 한 번만 계산하고 이후 단계에서 재사용):
+            1. text  : KoELECTRA 텍스트 감정 확률
+            2. audio : wav2vec2 음성 감정 확률
+            3. pitch : Pitch Z-peak
+            4. fusion: 상황별 가중치 + 최종 결정
         """
+        timings = {}
         try:
-            # === [1단계] 특징 추출 (Feature Extraction) ===
+            audio = load_audio(audio)
             
-            # [Text 분석]
-            inputs = self.text_tokenizer(
-                text, 
-                return_tensors="pt", 
-                truncation=True, 
-                max_length=128
-            ).to(self.device)
-            
-            with torch.no_grad():
-                text_probs = F.softmax(self.text_model(**inputs).logits, dim=-1)
-            
-            text_idx = torch.argmax(text_probs).item()
-            text_emotion_raw = self.text_labels[text_idx]  # ← 이제 한글!
-            text_conf_raw = text_probs[0][text_idx].item()
+            # === [1단계] 특징 추출 (Feature Extraction) ===
+            text_out = self._timed(timings, 'text', self._text_stage, text)
+            audio_out = self._timed(timings, 'audio', self._audio_stage, audio)
+            z_peak = self._timed(
+                timings, 'pitch', self._calculate_pitch_zscore, audio_out['y'], audio.sample_rate,
+                5.0, self._pitch_mask(vad, audio_out['y'])
+            )
             
-            # 디버그: 텍스트 모델의 모든 후보 출력
-            print(f"      [텍스트 감정 후보]")
-            for idx, prob in enumerate(text_probs[0].cpu().numpy()):
-                if prob > 0.05:  # 5% 이상만
-                    emotion_label = self.text_labels.get(idx, f"Unknown_{idx}")
-                    print(f"         {emotion_label}: {prob:.3f}")
-
-            # [Audio 분석]
-            y, sr = librosa.load(audio_path, sr=16000)
-            target_len = 16000 * 60  # 60초 (1분)
-            if len(y) > target_len: 
-                y = y[:target_len]
-            else: 
-                y = np.pad(y, (0, max(0, target_len - len(y))), "constant")
+            # === [2~4단계] 가중치 + 점수 + 결정 ===
+            result = self._timed(timings, 'fusion', self._fusion_stage, text_out, audio_out, z_peak)
             
-            a_inputs = self.audio_processor(
-                y, 
-                sampling_rate=16000, 
-                return_tensors="pt", 
-                padding=True
-            ).input_values.to(self.device)
+            timings['total'] = round(sum(timings.values()), 1)
+            result['timings'] = timings
+            self.last_timings = timings
+            self._print_timings(timings)
             
-            with torch.no_grad():
-                audio_probs = F.softmax(self.audio_model(a_inputs).logits, dim=-1)
-                text_probs = F.softmax(self.text_model(**inputs).logits, dim=-1)
+            return result
             
-            audio_idx = torch.argmax(audio_probs).item()
-            audio_emotion_raw = self.audio_labels[audio_idx]
-            audio_conf_raw = audio_probs[0][audio_idx].item()
+        except Exception as e:
+            print(f"⚠️ 분석 오류: {e}")
+            return self._error_result(timings)
 
-            # [Pitch 분석] - Z-score 계산
-            z_peak = self._calculate_pitch_zscore(y, sr)
-            
-            # === [2단계] 상황별 가중치 적용 (Context-Aware Boosting) ===
-            
-            # 텍스트 감정은 이미 한글! (MelissaJ 강제 매핑)
-            if self.use_korean_6:
-                text_emotion_kr = text_emotion_raw  # 이미 한글!
-            else:
-                text_emotion_kr = self._translate(text_emotion_raw)
-            
-            # 음성 감정은 한글 변환 필요
-            audio_emotion_kr = self._translate_audio(audio_emotion_raw)
+    def predict_batch(self, audios, texts, executor=None, vads=None):
+        """
+        여러 발화 감정 예측 (배치)
+        
+        - 텍스트/음성 모델은 발화들을 묶어서 배치로 1회씩 실행
+        - Pitch는 executor가 있으면 발화별로 병렬 실행
+        - 결과는 발화별 predict()와 같은 구조의 리스트
+        
+        Args:
+            audios: AudioData 리스트
+            texts: STT 결과 텍스트 리스트 (audios와 같은 순서)
+            executor: Pitch 병렬 처리용 concurrent.futures Executor (선택)
+            vads: VADResult 리스트 (선택, audios와 같은 순서)
+        
+        Returns:
+            감정 분석 결과 딕셔너리 리스트 ('timings'는 배치 전체 기준 + 'batch_size')
+        """
+        timings = {}
+        try:
+            audios = [load_audio(a) for a in audios]
+            vads = vads or [None] * len(audios)
             
-            # 가중치 초기화
-            text_boost = 1.0
-            audio_boost = 1.0
-            boost_reason = []
+            text_outs = self._timed(timings, 'text', self._text_stage_batch, texts)
+            audio_outs = self._timed(timings, 'audio', self._audio_stage_batch, audios)
             
-            # ① 톤 역동성 보정 (Pitch Dynamics)
-            if z_peak >= 2.0:
-                # 급격한 변화 → 실제 격양됨
-                audio_boost *= 1.3
-                boost_reason.append(f"톤 역동성 높음(Z={z_peak:.2f}) → 음성×1.3")
-            elif z_peak < 1.0:
-                # 단조로움 → 원래 톤이 높거나 오류
-                audio_boost *= 0.7
-                boost_reason.append(f"톤 역동성 낮음(Z={z_peak:.2f}) → 음성×0.7")
+            def pitch_all():
+                args = [
+                    (out['y'], a.sample_rate, 5.0, self._pitch_mask(v, out['y']))
+                    for out, a, v in zip(audio_outs, audios, vads)
+                ]
+                if executor:
+                    return list(executor.map(lambda yx: self._calculate_pitch_zscore(*yx), args))
+                return [self._calculate_pitch_zscore(*yx) for yx in args]
             
-            # ② 긍정 감정 수호 (Positive Override)
-            if text_emotion_kr in ['기쁨', '행복'] and text_conf_raw >= 0.8:
-                # 명확한 긍정 → 텍스트 우선
-                text_boost *= 1.5
-                boost_reason.append(f"명확한 긍정 표현({text_conf_raw:.2f}) → 텍스트×1.5")
+            z_peaks = self._timed(timings, 'pitch', pitch_all)
             
-            # ③ 가면 우울증 탐지 (Masked Depression)
-            # MelissaJ는 '중립' 없으므로 조건 수정
-            if self.use_korean_6:
-                # 6감정 모델: 기쁨이지만 음성은 부정
-                if text_emotion_kr == '기쁨' and audio_emotion_kr in ['슬픔', '불안']:
-                    audio_boost *= 1.4
-                    boost_reason.append(f"가면 감정 의심(텍스트:{text_emotion_kr}, 음성:{audio_emotion_kr}) → 음성×1.4")
-            else:
-                # 기존 모델: 중립이지만 음성은 부정
-                if text_emotion_kr in ['중립'] and audio_emotion_kr in ['슬픔', '불안', '공포']:
-                    audio_boost *= 1.4
-                    boost_reason.append(f"가면 우울 의심(텍스트:{text_emotion_kr}, 음성:{audio_emotion_kr}) → 음성×1.4")
+            results = self._timed(timings, 'fusion', lambda: [
+                self._fusion_stage(t, a, z) for t, a, z in zip(text_outs, audio_outs, z_peaks)
+            ])
             
-            # === [3단계] 최종 점수 계산 (Scoring) ===
+        except Exception as e:
+            # 배치 실패 시 발화별로 재시도 (각각 오류 처리)
+            print(f"⚠️ 배치 분석 오류: {e} → 발화별 분석으로 전환")
+            return [self.predict(a, t, v) for a, t, v in zip(audios, texts, vads or [None] * len(audios))]
+        
+        timings['total'] = round(sum(timings.values()), 1)
+        timings['batch_size'] = len(results)
+        for result in results:
+            result['timings'] = dict(timings)
+        self.last_timings = timings
+        self._print_timings(timings)
+        
+        return results
+
+    def predict_precomputed(self, audio, text, f0, window_outputs=None):
+        """
+        미리 계산한 음성 윈도우 확률 / F0로 감정 예측 (스트리밍 분석용)
+        
+        Args:
+            audio: AudioData (발화 전체)
+            text: STT 결과 텍스트
+            f0: 구간별 F0를 이어붙인 배열 (무성 프레임 NaN)
+            window_outputs: window_starts() 순서의 (확률, attention_mask) 리스트
+                (window_probs()로 미리 추론, None이면 음성 모델을 지금 1회 실행)
+        
+        Returns:
+            predict()와 같은 구조의 결과 딕셔너리
+        """
+        timings = {}
+        try:
+            audio = load_audio(audio)
             
-            text_score_final = text_conf_raw * text_boost
-            audio_score_final = audio_conf_raw * audio_boost
+            text_out = self._timed(timings, 'text', self._text_stage, text)
+            audio_out = self._timed(timings, 'audio', self._audio_from_windows, audio, window_outputs)
+            z_peak = self._timed(timings, 'pitch', self._zscore_from_f0, f0)
+            result = self._timed(timings, 'fusion', self._fusion_stage, text_out, audio_out, z_peak)
             
-            # Min-Max 정규화 (0.0~1.0)
-            max_score = max(text_score_final, audio_score_final)
+            timings['total'] = round(sum(timings.values()), 1)
+            result['timings'] = timings
+            self.last_timings = timings
+            self._print_timings(timings)
             
-            if max_score > 1.0:
-                text_score_final = text_score_final / max_score
-                audio_score_final = audio_score_final / max_score
+            return result
             
-            # === [4단계] 최종 결정 (Decision) ===
+        except Exception as e:
+            print(f"⚠️ 분석 오류: {e}")
+            return self._error_result(timings)
+
+    def _audio_from_windows(self, audio, window_outputs):
+        """미리 추론한 윈도우 결과 풀링 (없으면 지금 추론)"""
+        if not window_outputs:
+            return self._audio_stage(audio)
+        y = self._prepare_audio(audio)
+        return self._pool_windows([p for p, _ in window_outputs], [m for _, m in window_outputs], y)
+
+    def _error_result(self, timings):
+        """분석 실패 시 기본 결과"""
+        return {
+            'final_emotion': '알수없음',
+            'audio_emotion': '알수없음',
+            'text_emotion': '알수없음',
+            'text_conf': 0.5,
+            'audio_conf': 0.5,
+            'final_conf': 0.5,
+            'z_peak': 0.0,
+            'boost_reason': [],
+            'decision': '오류',
+            'timings': timings
+        }
+
+    def _timed(self, timings, stage, fn, *args):
+        """단계 실행 + 소요 시간(ms) 기록"""
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            timings[stage] = round((time.perf_counter() - start) * 1000, 1)
+
+    def _print_timings(self, timings):
+        """단계별 소요 시간 리포트"""
+        report = " | ".join(
+            f"{stage} {value:.1f}ms" if stage != 'batch_size' else f"batch {value}"
+            for stage, value in timings.items()
+        )
+        print(f"      [단계별 시간] {report}")
+
+    def _text_stage(self, text):
+        """
+        [Text 분석] KoELECTRA 순전파 1회
+        
+        Returns:
+            probs: 감정 확률 (1D, CPU 텐서), idx/label_raw/conf: 최고 후보
+        """
+        return self._text_stage_batch([text])[0]
+
+    def _text_stage_batch(self, texts):
+        """
+        [Text 분석] 캐시에 없는 문장만 모델 실행
+        
+        Returns:
+            _text_stage() 결과 딕셔너리 리스트
+        """
+        # 결과 딕셔너리는 호출자별 사본 (확률 텐서는 읽기 전용으로 공유)
+        return [dict(out) for out in self.text_cache.get_many(texts, self._run_text_model)]
+
+    def _run_text_model(self, texts):
+        """
+        여러 문장을 패딩 + attention_mask로 묶어서 순전파
+        (batch_size 단위로 나눠 실행)
+        """
+        batch_size = MODELS['batch_options']['text_batch_size']
+        outputs = []
+        
+        for start in range(0, len(texts), batch_size):
+            inputs = self.text_tokenizer(
+                list(texts[start:start + batch_size]), 
+                return_tensors="pt", 
+                padding=True,
+                truncation=True, 
+                max_length=128
+            ).to(self.device)
             
-            score_diff = abs(text_score_final - audio_score_final)
+            with torch.no_grad():
+                batch_probs = F.softmax(self.text_model(**inputs).logits, dim=-1).cpu()
             
-            # 안전 가중치 (Safety Bias): 점수 차이가 0.15 미만이면 부정 감정 우선
-            if score_diff < 0.15:
-                # 판단 불확실 → 부정 감정 우선 (안전 지향)
-                if self.use_korean_6:
-                    NEGATIVE = ['분노', '슬픔', '불안', '상처', '당황']
-                else:
-                    NEGATIVE = ['분노', '슬픔', '불안', '공포', '혐오']
+            for text_probs in batch_probs:
+                text_idx = torch.argmax(text_probs).item()
                 
-                if audio_emotion_kr in NEGATIVE:
-                    audio_score_final *= 1.2
-                    boost_reason.append(f"판단 불확실({score_diff:.3f}<0.15) → 음성 부정 우선×1.2")
-                elif text_emotion_kr in NEGATIVE:
-                    text_score_final *= 1.2
-                    boost_reason.append(f"판단 불확실({score_diff:.3f}<0.15) → 텍스트 부정 우선×1.2")
-            
-            # 최종 감정 선택
-            if audio_score_final >= text_score_final:
-                final_emotion = audio_emotion_kr
-                final_conf = audio_score_final
-                decision = "음성 우선"
+                # 디버그: 텍스트 모델의 모든 후보 출력
+                print(f"      [텍스트 감정 후보]")
+                for idx, prob in enumerate(text_probs.numpy()):
+                    if prob > 0.05:  # 5% 이상만
+                        emotion_label = self.text_labels.get(idx, f"Unknown_{idx}")
+                        print(f"         {emotion_label}: {prob:.3f}")
+                
+                outputs.append({
+                    'probs': text_probs,
+                    'idx': text_idx,
+                    'label_raw': self.text_labels[text_idx],  # ← 이제 한글!
+                    'conf': text_probs[text_idx].item()
+                })
+        
+        return outputs
+
+    def _audio_stage(self, audio):
+        """
+        [Audio 분석] wav2vec2 순전파 (이미 디코딩된 PCM 재사용)
+        
+        - 60초 고정 패딩 대신 실제 길이로 추론 (3초 발화 = 3초 연산)
+        - window_sec보다 긴 발화는 겹치는 고정 윈도우로 나눠 한 배치로 추론 후 평균
+        
+        Returns:
+            probs: 감정 확률 (1D, CPU 텐서), idx/label_raw/conf: 최고 후보,
+            attention_mask: 모델 입력 마스크 (윈도우 수 × 샘플 수),
+            n_windows: 윈도우 개수,
+            y: 모델 입력에 사용한 신호 (Pitch 단계에서 재사용)
+        """
+        return self._audio_stage_batch([audio])[0]
+
+    def _audio_stage_batch(self, audios):
+        """
+        [Audio 분석] 여러 발화의 윈도우를 모아서 배치 추론 후 발화별로 평균
+        
+        Returns:
+            _audio_stage() 결과 딕셔너리 리스트
+        """
+        signals = [self._prepare_audio(audio) for audio in audios]
+        windows_per_clip = [self._split_windows(y, audio.sample_rate) for y, audio in zip(signals, audios)]
+        
+        flat_windows = [w for windows in windows_per_clip for w in windows]
+        window_probs, window_masks = self.window_probs(flat_windows, audios[0].sample_rate)
+        
+        outputs = []
+        offset = 0
+        for y, windows in zip(signals, windows_per_clip):
+            n = len(windows)
+            outputs.append(self._pool_windows(
+                window_probs[offset:offset + n], window_masks[offset:offset + n], y
+            ))
+            offset += n
+        
+        return outputs
+
+    def _pool_windows(self, window_probs, window_masks, y):
+        """윈도우별 확률 → 발화 결과 (윈도우 평균 풀링, 발화 안의 윈도우는 모두 같은 길이)"""
+        audio_probs = torch.stack(window_probs).mean(dim=0)
+        audio_idx = torch.argmax(audio_probs).item()
+        
+        return {
+            'probs': audio_probs,
+            'idx': audio_idx,
+            'label_raw': self.audio_labels[audio_idx],
+            'conf': audio_probs[audio_idx].item(),
+            'attention_mask': torch.stack(window_masks),
+            'n_windows': len(window_probs),
+            'y': y
+        }
+
+    def _prepare_audio(self, audio):
+        """분석 최대 길이로 자르고, 너무 짧으면 최소 길이까지만 패딩"""
+        options = MODELS['emotion_audio_options']
+        sr = audio.sample_rate
+        
+        y = audio.pcm[:int(options['max_sec'] * sr)]
+        min_len = int(options['min_sec'] * sr)
+        if len(y) < min_len:
+            # wav2vec2 CNN 최소 입력 길이 확보
+            y = np.pad(y, (0, min_len - len(y)), "constant")
+        return y
+
+    def window_probs(self, windows, sr):
+        """
+        윈도우 리스트 → 윈도우별 감정 확률 / attention_mask
+        
+        - 길이순으로 정렬해서 batch_size 단위로 추론 (패딩 최소화)
+        - attention_mask를 지원하지 않는 group-norm 모델은 같은 길이끼리만 묶음
+          (0 패딩이 결과를 바꾸므로)
+        """
+        batch_size = MODELS['batch_options']['audio_batch_size']
+        order = sorted(range(len(windows)), key=lambda i: len(windows[i]))
+        
+        groups = []
+        for i in order:
+            last = groups[-1] if groups else None
+            same_length = last and len(windows[last[0]]) == len(windows[i])
+            if last and len(last) < batch_size and (self.audio_uses_mask or same_length):
+                last.append(i)
             else:
-                final_emotion = text_emotion_kr
-                final_conf = text_score_final
-                decision = "텍스트 우선"
+                groups.append([i])
+        
+        probs = [None] * len(windows)
+        masks = [None] * len(windows)
+        
+        for group in groups:
+            a_inputs = self.audio_processor(
+                [windows[i] for i in group], 
+                sampling_rate=sr, 
+                return_tensors="pt", 
+                padding=True,
+                return_attention_mask=True
+            )
+            input_values = a_inputs.input_values.to(self.device)
+            attention_mask = a_inputs.attention_mask.to(self.device)
             
-            emotion_scores = {}
+            with torch.no_grad():
+                if self.audio_uses_mask:
+                    logits = self.audio_model(input_values, attention_mask=attention_mask).logits
+                else:
+                    logits = self.audio_model(input_values).logits
+                group_probs = F.softmax(logits, dim=-1).cpu()
+            
+            for row, i in enumerate(group):
+                probs[i] = group_probs[row]
+                masks[i] = attention_mask[row, :len(windows[i])].cpu()
+        
+        return probs, masks
+
+    def _split_windows(self, y, sr):
+        """
+        긴 발화를 같은 길이의 겹치는 윈도우로 분할
+        (마지막 윈도우는 끝에 맞춰서 패딩 없이 자름)
+        """
+        window = int(MODELS['emotion_audio_options']['window_sec'] * sr)
+        return [y[s:s + window] for s in self.window_starts(len(y), sr)]
+
+    def window_starts(self, n_samples, sr):
+        """_split_windows()의 윈도우 시작 위치 (스트리밍 분석이 같은 구성으로 미리 추론) (샘플)"""
+        options = MODELS['emotion_audio_options']
+        window = int(options['window_sec'] * sr)
+        hop = int(options['hop_sec'] * sr)
+        
+        if n_samples <= window:
+            return [0]
+        
+        starts = list(range(0, n_samples - window + 1, hop))
+        if starts[-1] + window < n_samples:
+            starts.append(n_samples - window)
+        return starts
+
+    def _fusion_stage(self, text_out, audio_out, z_peak):
+        """
+        적응형 감정 통합 (텍스트/음성 단계 결과만 사용, 모델 재실행 없음)
+        """
+        text_emotion_raw = text_out['label_raw']
+        text_conf_raw = text_out['conf']
+        text_probs = text_out['probs']
+        audio_emotion_raw = audio_out['label_raw']
+        audio_conf_raw = audio_out['conf']
+        
+        # === [2단계] 상황별 가중치 적용 (Context-Aware Boosting) ===
+        
+        # 텍스트 감정은 이미 한글! (MelissaJ 강제 매핑)
+        if self.use_korean_6:
+            text_emotion_kr = text_emotion_raw  # 이미 한글!
+        else:
+            text_emotion_kr = self._translate(text_emotion_raw)
         
+        # 음성 감정은 한글 변환 필요
+        audio_emotion_kr = self._translate_audio(audio_emotion_raw)
+        
+        # 가중치 초기화
+        text_boost = 1.0
+        audio_boost = 1.0
+        boost_reason = []
+        
+        # ① 톤 역동성 보정 (Pitch Dynamics)
+        if z_peak >= 2.0:
+            # 급격한 변화 → 실제 격양됨
+            audio_boost *= 1.3
+            boost_reason.append(f"톤 역동성 높음(Z={z_peak:.2f}) → 음성×1.3")
+        elif z_peak < 1.0:
+            # 단조로움 → 원래 톤이 높거나 오류
+            audio_boost *= 0.7
+            boost_reason.append(f"톤 역동성 낮음(Z={z_peak:.2f}) → 음성×0.7")
+        
+        # ② 긍정 감정 수호 (Positive Override)
+        if text_emotion_kr in ['기쁨', '행복'] and text_conf_raw >= 0.8:
+            # 명확한 긍정 → 텍스트 우선
+            text_boost *= 1.5
+            boost_reason.append(f"명확한 긍정 표현({text_conf_raw:.2f}) → 텍스트×1.5")
+        
+        # ③ 가면 우울증 탐지 (Masked Depression)
+        # MelissaJ는 '중립' 없으므로 조건 수정
+        if self.use_korean_6:
+            # 6감정 모델: 기쁨이지만 음성은 부정
+            if text_emotion_kr == '기쁨' and audio_emotion_kr in ['슬픔', '불안']:
+                audio_boost *= 1.4
+                boost_reason.append(f"가면 감정 의심(텍스트:{text_emotion_kr}, 음성:{audio_emotion_kr}) → 음성×1.4")
+        else:
+            # 기존 모델: 중립이지만 음성은 부정
+            if text_emotion_kr in ['중립'] and audio_emotion_kr in ['슬픔', '불안', '공포']:
+                audio_boost *= 1.4
+                boost_reason.append(f"가면 우울 의심(텍스트:{text_emotion_kr}, 음성:{audio_emotion_kr}) → 음성×1.4")
+        
+        # === [3단계] 최종 점수 계산 (Scoring) ===
+        
+        text_score_final = text_conf_raw * text_boost
+        audio_score_final = audio_conf_raw * audio_boost
+        
+        # Min-Max 정규화 (0.0~1.0)
+        max_score = max(text_score_final, audio_score_final)
+        
+        if max_score > 1.0:
+            text_score_final = text_score_final / max_score
+            audio_score_final = audio_score_final / max_score
+        
+        # === [4단계] 최종 결정 (Decision) ===
+        
+        score_diff = abs(text_score_final - audio_score_final)
+        
+        # 안전 가중치 (Safety Bias): 점수 차이가 0.15 미만이면 부정 감정 우선
+        if score_diff < 0.15:
+            # 판단 불확실 → 부정 감정 우선 (안전 지향)
             if self.use_korean_6:
-                # MelissaJ: 한글 레이블로 저장
-                for idx in range(len(text_probs[0])):
-                    emotion_name = self.text_labels[idx]  # '기쁨', '분노', ...
-                    prob_value = float(text_probs[0][idx].item())
-                    emotion_scores[emotion_name] = round(prob_value * 100, 2)  # 퍼센트
+                NEGATIVE = ['분노', '슬픔', '불안', '상처', '당황']
             else:
-                # 기존 모델: 영어 → 한글 변환
-                for idx in range(len(text_probs[0])):
-                    emotion_name_eng = self.text_labels[idx]
-                    emotion_name_kr = self._translate(emotion_name_eng)
-                    prob_value = float(text_probs[0][idx].item())
-                    emotion_scores[emotion_name_kr] = round(prob_value * 100, 2)
-        
-            print(f"      [감정 점수] {emotion_scores}")
-            
-            return {
-                # 원본 결과
-                'text_emotion': text_emotion_kr,  # 이제 한글!
-                'text_conf': text_conf_raw,
-                'audio_emotion': audio_emotion_kr, 
-                'audio_conf': audio_conf_raw,
-                
-                # 개선된 결과
-                'text_score_boosted': float(text_score_final),
-                'audio_score_boosted': float(audio_score_final),
-                'z_peak': float(z_peak),
-                'boost_reason': boost_reason,
-                'decision': decision,
-                
-                'candidates': emotion_scores,
-                
-                # 최종 결과
-                'final_emotion': final_emotion,
-                'final_conf': float(final_conf)
-            }
-            
-        except Exception as e:
-            print(f"⚠️ 분석 오류: {e}")
-            return {
-                'final_emotion': '알수없음',
-                'audio_emotion': '알수없음',
-                'text_emotion': '알수없음',
-                'text_conf': 0.5,
-                'audio_conf': 0.5,
-                'final_conf': 0.5,
-                'z_peak': 0.0,
-                'boost_reason': [],
-                'decision': '오류'
-            }
+                NEGATIVE = ['분노', '슬픔', '불안', '공포', '혐오']
+            
+            if audio_emotion_kr in NEGATIVE:
+                audio_score_final *= 1.2
+                boost_reason.append(f"판단 불확실({score_diff:.3f}<0.15) → 음성 부정 우선×1.2")
+            elif text_emotion_kr in NEGATIVE:
+                text_score_final *= 1.2
+                boost_reason.append(f"판단 불확실({score_diff:.3f}<0.15) → 텍스트 부정 우선×1.2")
+        
+        # 최종 감정 선택
+        if audio_score_final >= text_score_final:
+            final_emotion = audio_emotion_kr
+            final_conf = audio_score_final
+            decision = "음성 우선"
+        else:
+            final_emotion = text_emotion_kr
+            final_conf = text_score_final
+            decision = "텍스트 우선"
+        
+        emotion_scores = {}
+    
+        if self.use_korean_6:
+            # MelissaJ: 한글 레이블로 저장
+            for idx in range(len(text_probs)):
+                emotion_name = self.text_labels[idx]  # '기쁨', '분노', ...
+                prob_value = float(text_probs[idx].item())
+                emotion_scores[emotion_name] = round(prob_value * 100, 2)  # 퍼센트
+        else:
+            # 기존 모델: 영어 → 한글 변환
+            for idx in range(len(text_probs)):
+                emotion_name_eng = self.text_labels[idx]
+                emotion_name_kr = self._translate(emotion_name_eng)
+                prob_value = float(text_probs[idx].item())
+                emotion_scores[emotion_name_kr] = round(prob_value * 100, 2)
+    
+        print(f"      [감정 점수] {emotion_scores}")
+        
+        return {
+            # 원본 결과
+            'text_emotion': text_emotion_kr,  # 이제 한글!
+            'text_conf': text_conf_raw,
+            'audio_emotion': audio_emotion_kr, 
+            'audio_conf': audio_conf_raw,
+            
+            # 개선된 결과
+            'text_score_boosted': float(text_score_final),
+            'audio_score_boosted': float(audio_score_final),
+            'z_peak': float(z_peak),
+            'boost_reason': boost_reason,
+            'decision': decision,
+            
+            'candidates': emotion_scores,
+            
+            # 최종 결과
+            'final_emotion': final_emotion,
+            'final_conf': float(final_conf)
+        }
 
-    def _calculate_pitch_zscore(self, y, sr, sigma_min=5.0):
+    def _pitch_mask(self, vad, y):
+        """VAD 유성 프레임 → 피치 추정기 프레임 마스크 (VAD 없으면 None)"""
+        if vad is None:
+            return None
+        hop = self.pitch_estimator.hop_length
+        return vad.frame_mask(hop, 1 + len(y) // hop)
+
+    def _calculate_pitch_zscore(self, y, sr, sigma_min=5.0, voiced_mask=None):
         """
         Pitch Z-score 계산
         
@@ -288,6 +604,7 @@ class EmotionEnsemble:
             y: 오디오 신호
             sr: 샘플링 레이트
             sigma_min: 최소 표준편차 임계값 (기본 5.0 Hz)
+            voiced_mask: 프레임별 유성 여부 (None이면 추정기가 RMS로 계산)
         
         Returns:
             z_peak: 최대 Z-score 절댓값
@@ -296,40 +613,38 @@ class EmotionEnsemble:
             Z_peak = max(|F0(t) - μ_F0| / max(σ_F0, σ_min))
         """
         try:
-            # F0 추출 (Fundamental Frequency)
-            f0, voiced_flag, voiced_probs = librosa.pyin(
-                y, 
-                fmin=librosa.note_to_hz('C2'),  # 최소 65.4 Hz
-                fmax=librosa.note_to_hz('C7'),  # 최대 2093 Hz
-                sr=sr
-            )
-            
-            # NaN 제거 (무성음 구간)
-            f0_valid = f0[~np.isnan(f0)]
-            
-            if len(f0_valid) < 10:
-                # 유효한 피치가 너무 적으면 0 반환
-                return 0.0
-            
-            # 평균과 표준편차 계산
-            mu_f0 = np.mean(f0_valid)
-            sigma_f0 = np.std(f0_valid)
-            
-            # 안전 상수 적용 (표준편차가 너무 작으면 sigma_min 사용)
-            sigma_safe = max(sigma_f0, sigma_min)
-            
-            # Z-score 계산
-            z_scores = np.abs((f0_valid - mu_f0) / sigma_safe)
-            
-            # 최댓값 반환 (순간적인 격양 포착)
-            z_peak = np.max(z_scores)
-            
-            return z_peak
+            # F0 추출 (Fundamental Frequency) - 유성 프레임만
+            f0 = self.pitch_estimator.estimate(y, sr, voiced_mask=voiced_mask)
+            return self._zscore_from_f0(f0, sigma_min)
             
         except Exception as e:
             print(f"⚠️ Pitch Z-score 계산 오류: {e}")
             return 0.0
 
+    def _zscore_from_f0(self, f0, sigma_min=5.0):
+        """F0 배열(무성 프레임 NaN) → Z_peak (스트리밍 분석에서 구간별 F0를 모아서 사용)"""
+        # NaN 제거 (무성음 구간)
+        f0_valid = f0[~np.isnan(f0)]
+        
+        if len(f0_valid) < 10:
+            # 유효한 피치가 너무 적으면 0 반환
+            return 0.0
+        
+        # 평균과 표준편차 계산
+        mu_f0 = np.mean(f0_valid)
+        sigma_f0 = np.std(f0_valid)
+        
+        # 안전 상수 적용 (표준편차가 너무 작으면 sigma_min 사용)
+        sigma_safe = max(sigma_f0, sigma_min)
+        
+        # Z-score 계산
+        z_scores = np.abs((f0_valid - mu_f0) / sigma_safe)
+        
+        # 최댓값 반환 (순간적인 격양 포착)
+        z_peak = np.max(z_scores)
+        
+        return z_peak
+
     def _translate_audio(self, label):
         """
         음성 감정 레이블만 한글 변환
@@ -0,0 +1,158 @@
+"""
+추론 백엔드 선택 (GPU 없는 CPU 서버용)
+- torch : PyTorch fp32 (기본, 기존 동작)
+- int8  : PyTorch 동적 양자화 (nn.Linear → int8, CPU 전용)
+- onnx  : ONNX Runtime (optimum으로 1회 변환 후 캐시 폴더에서 재사용)
+
+설정: config/models.py의 MODELS['inference_options']
+
+변환(캐시) 미리 해두기:
+    python inference_backend.py export [whisper emotion_text emotion_audio]
+"""
+
+import os
+import sys
+
+import torch
+from transformers import (
+    AutoModelForSequenceClassification,
+    Wav2Vec2ForSequenceClassification,
+    WhisperForConditionalGeneration,
+)
+
+from config.models import MODELS
+
+
+BACKENDS = ('torch', 'int8', 'onnx')
+
+# 모델 키 → (PyTorch 클래스, optimum ONNX Runtime 클래스 이름)
+MODEL_KINDS = {
+    'whisper': (WhisperForConditionalGeneration, 'ORTModelForSpeechSeq2Seq'),
+    'emotion_text': (AutoModelForSequenceClassification, 'ORTModelForSequenceClassification'),
+    'emotion_audio': (Wav2Vec2ForSequenceClassification, 'ORTModelForAudioClassification'),
+}
+
+
+def get_backend(model_key, device="cpu"):
+    """
+    모델별 백엔드 결정 (overrides > backend)
+    int8/onnx는 CPU 전용 → GPU에서는 torch 사용
+    """
+    options = MODELS['inference_options']
+    backend = options['overrides'].get(model_key, options['backend'])
+
+    if backend not in BACKENDS:
+        raise ValueError(f"알 수 없는 추론 백엔드: {backend} (가능: {list(BACKENDS)})")
+
+    if backend != 'torch' and device != "cpu":
+        print(f"   ⚠️ [{model_key}] {backend} 백엔드는 CPU 전용 → torch 사용 ({device})")
+        return 'torch'
+    return backend
+
+
+def load_model(model_key, device="cpu", backend=None, model_name=None):
+    """
+    설정된 백엔드로 모델 로드
+
+    Args:
+        model_key: 'whisper' | 'emotion_text' | 'emotion_audio' (MODELS 키)
+        device: "cpu" | "cuda"
+        backend: 직접 지정 (None이면 설정값)
+        model_name: 모델 이름 직접 지정 (None이면 MODELS[model_key], 예: STT tier)
+
+    Returns:
+        (model, backend) - model은 transformers 모델과 같은 방식으로 호출 가능
+    """
+    backend = backend or get_backend(model_key, device)
+    model_name = model_name or MODELS[model_key]
+    torch_cls, _ = MODEL_KINDS[model_key]
+
+    _set_num_threads()
+    print(f"   ⚙️  [{model_key}] 추론 백엔드: {backend} ({model_name})")
+
+    if backend == 'onnx':
+        return _load_onnx(model_key, model_name), backend
+
+    model = torch_cls.from_pretrained(model_name).to(device)
+    model.eval()
+
+    if backend == 'int8':
+        # Linear 층만 int8 (가중치 양자화 + 활성값은 실행 시 동적 양자화)
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    return model, backend
+
+
+def onnx_cache_path(model_key, model_name=None):
+    """ONNX 변환 결과 저장 폴더"""
+    safe_name = (model_name or MODELS[model_key]).replace("/", "__")
+    return os.path.join(MODELS['inference_options']['onnx_cache_dir'], safe_name)
+
+
+def export_onnx(model_key, model_name=None):
+    """
+    ONNX 변환 + 캐시 저장 (이미 있으면 건너뜀)
+
+    Returns:
+        캐시 폴더 경로
+    """
+    model_name = model_name or MODELS[model_key]
+    path = onnx_cache_path(model_key, model_name)
+    if os.path.isdir(path) and any(f.endswith(".onnx") for f in os.listdir(path)):
+        return path
+
+    ort_cls = _ort_class(model_key)
+    print(f"   🔄 [{model_key}] ONNX 변환 중... ({model_name} → {path})")
+    model = ort_cls.from_pretrained(model_name, export=True)
+    model.save_pretrained(path)
+    print(f"   ✅ [{model_key}] ONNX 변환 완료")
+    return path
+
+
+def _load_onnx(model_key, model_name=None):
+    """캐시된 ONNX 모델 로드 (없으면 변환부터)"""
+    import onnxruntime
+
+    path = export_onnx(model_key, model_name)
+
+    session_options = onnxruntime.SessionOptions()
+    num_threads = MODELS['inference_options']['num_threads']
+    if num_threads:
+        session_options.intra_op_num_threads = num_threads
+
+    return _ort_class(model_key).from_pretrained(
+        path,
+        provider="CPUExecutionProvider",
+        session_options=session_options
+    )
+
+
+def _ort_class(model_key):
+    """optimum ONNX Runtime 모델 클래스 (optimum 미설치 시 안내)"""
+    try:
+        import optimum.onnxruntime as ort_models
+    except ImportError:
+        raise ImportError("onnx 백엔드는 optimum[onnxruntime]이 필요합니다: pip install optimum[onnxruntime]")
+    return getattr(ort_models, MODEL_KINDS[model_key][1])
+
+
+def _set_num_threads():
+    """CPU 추론 스레드 수 (설정값이 있을 때만)"""
+    num_threads = MODELS['inference_options']['num_threads']
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+
+# ========== 메인 실행: ONNX 변환/캐시 ==========
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "export":
+        print("사용법: python inference_backend.py export [whisper emotion_text emotion_audio]")
+        sys.exit(1)
+
+    for key in sys.argv[2:] or list(MODEL_KINDS):
+        if key == 'whisper':
+            # 사용하는 STT tier 전부
+            for tier in MODELS['stt_policy']['enabled_tiers']:
+                export_onnx(key, MODELS['stt_tiers'][tier])
+        else:
+            export_onnx(key)
@@ -0,0 +1,162 @@
+"""
+추론 스케줄러 (Dynamic Micro-Batching)
+- FastAPI 요청을 몇 ms 동안 모아서 한 배치로 실행
+- 모델 추론은 워커 스레드에서 실행 (이벤트 루프 블로킹 X)
+- 대기열이 가득 차면 QueueFullError → 서버에서 503 응답
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFullError(Exception):
+    """대기열 초과 (서버 과부하)"""
+    pass
+
+
+class MicroBatchScheduler:
+    """
+    마이크로 배치 추론 스케줄러
+
+    사용 예:
+        scheduler = MicroBatchScheduler(analyzer.analyze_batch, max_batch_size=4)
+        await scheduler.start()
+        result = await scheduler.submit(audio)
+    """
+
+    def __init__(self, batch_fn, max_batch_size=4, max_wait_ms=20, max_queue_depth=32, num_workers=1):
+        """
+        Args:
+            batch_fn: 입력 리스트 → 결과 리스트 함수 (예: SpeechAnalyzer.analyze_batch)
+            max_batch_size: 한 배치 최대 요청 수
+            max_wait_ms: 첫 요청 이후 배치를 모으는 최대 대기 시간 (ms)
+            max_queue_depth: 대기열 최대 길이 (초과 시 QueueFullError)
+            num_workers: 동시에 실행할 배치 수 (워커 스레드 수)
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_queue_depth = max_queue_depth
+        self.num_workers = num_workers
+
+        self.queue = None
+        self.executor = None
+        self.workers = []
+
+        # 통계
+        self.total_requests = 0
+        self.total_batches = 0
+        self.rejected = 0
+        self.in_flight = 0
+
+    async def start(self):
+        """워커 시작 (이벤트 루프 안에서 호출)"""
+        self.queue = asyncio.Queue(maxsize=self.max_queue_depth)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.num_workers,
+            thread_name_prefix="inference"
+        )
+        self.workers = [
+            asyncio.create_task(self._worker_loop(i))
+            for i in range(self.num_workers)
+        ]
+        print(f"✅ 추론 스케줄러 시작 (배치 {self.max_batch_size}, "
+              f"대기 {self.max_wait * 1000:.0f}ms, 대기열 {self.max_queue_depth}, 워커 {self.num_workers})")
+
+    async def stop(self):
+        """워커 종료 + 대기 중인 요청 취소"""
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+        while self.queue and not self.queue.empty():
+            _, future, _ = self.queue.get_nowait()
+            if not future.done():
+                future.cancel()
+
+        if self.executor:
+            self.executor.shutdown(wait=False)
+
+    async def submit(self, item):
+        """
+        요청 1건 제출 후 결과 대기
+
+        Raises:
+            QueueFullError: 대기열이 가득 찬 경우
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((item, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFullError(f"대기열 초과 ({self.max_queue_depth}건)")
+
+        self.total_requests += 1
+        return await future
+
+    @property
+    def queue_depth(self):
+        """대기 중인 요청 수"""
+        return self.queue.qsize() if self.queue else 0
+
+    def stats(self):
+        """스케줄러 상태 (/health 용)"""
+        return {
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "max_queue_depth": self.max_queue_depth,
+            "max_batch_size": self.max_batch_size,
+            "total_requests": self.total_requests,
+            "total_batches": self.total_batches,
+            "avg_batch_size": round(self.total_requests / self.total_batches, 2) if self.total_batches else 0.0,
+            "rejected": self.rejected
+        }
+
+    async def _collect_batch(self):
+        """첫 요청을 기다린 뒤 max_wait 동안 최대 max_batch_size까지 모음"""
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _worker_loop(self, worker_id):
+        """배치 수집 → 워커 스레드에서 실행 → 각 요청 future 완료"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await self._collect_batch()
+
+            # 대기 중 취소된 요청 제외 (클라이언트 연결 끊김 등)
+            batch = [entry for entry in batch if not entry[1].done()]
+            if not batch:
+                continue
+
+            items = [item for item, _, _ in batch]
+            self.in_flight += len(batch)
+            self.total_batches += 1
+            waited_ms = (time.perf_counter() - batch[0][2]) * 1000
+            print(f"⚙️  [워커 {worker_id}] 배치 실행: {len(batch)}건 (첫 요청 대기 {waited_ms:.0f}ms)")
+
+            try:
+                results = await loop.run_in_executor(self.executor, self.batch_fn, items)
+                for (_, future, _), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                print(f"❌ [워커 {worker_id}] 배치 실패: {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                self.in_flight -= len(batch)
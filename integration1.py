@@ -15,6 +15,7 @@ from audio_recorder import AudioRecorder
 from analyzer import SpeechAnalyzer
 from llm_handler import LLMHandler
 from db_handler import VoiceDBHandler
+from streaming_analyzer import StreamingSession
 
 
 class ElderCareSystemAdvanced:
@@ -39,6 +40,7 @@ class ElderCareSystemAdvanced:
         # ✅ 비동기 LLM 옵션
         llm_timeout_sec=45,          # LLM 최종답 기다릴 최대 시간(세션 턴 내)
         quick_reply_enabled=True,    # 즉시 1차응답 사용 여부
+        streaming=True,              # 녹음 중 스트리밍 분석 (발화 종료 후 지연 최소화)
     ):
         """
         시스템 초기화
@@ -53,6 +55,7 @@ class ElderCareSystemAdvanced:
 
             llm_timeout_sec: LLM 최종 응답 대기 최대 시간
             quick_reply_enabled: 즉시(규칙기반) 1차 응답 활성화
+            streaming: 녹음하면서 구간별로 STT/감정 분석 (False면 녹음 후 파일 분석)
         """
         print("=" * 60)
         print("🏥 노인 케어 시스템 초기화 중 (비동기 LLM + 즉시응답)...")
@@ -140,6 +143,7 @@ class ElderCareSystemAdvanced:
         # 옵션
         self.llm_timeout_sec = llm_timeout_sec
         self.quick_reply_enabled = quick_reply_enabled
+        self.streaming = streaming
 
         print("\n✅ 시스템 초기화 완료! (즉시응답 + 비동기 LLM 준비)")
 
@@ -243,14 +247,34 @@ class ElderCareSystemAdvanced:
         print("\n[1/5] 🎤 음성 녹음")
         print("말씀하세요. 침묵이 10초 지속되면 자동 종료됩니다.")
 
-        recording_path = self.recorder.record_until_silence(
-            output_filename=f"./recordings/turn_{self.turn_count:03d}.wav" if save_recording else None,
-            max_duration=120
-        )
+        session = StreamingSession(
+            self.analyzer,
+            sample_rate=self.recorder.sample_rate,
+            name=f"turn_{self.turn_count:03d}"
+        ) if self.streaming else None
 
-        # 2. STT + 분석
-        print("\n[2/5] 📝 음성 분석 중 (개선된 감정)...")
-        analysis_result = self.analyzer.analyze(recording_path)
+        analysis_result = None
+        try:
+            recording_path = self.recorder.record_until_silence(
+                output_filename=f"./recordings/turn_{self.turn_count:03d}.wav" if save_recording else None,
+                max_duration=120,
+                on_chunk=session.feed if session else None
+            )
+
+            # 2. STT + 분석 (스트리밍이면 녹음 중 처리한 결과를 마무리만)
+            print("\n[2/5] 📝 음성 분석 중 (개선된 감정)...")
+            if session:
+                try:
+                    analysis_result = session.finish()
+                except Exception as e:
+                    print(f"⚠️  스트리밍 분석 실패: {e} → 파일 분석으로 전환")
+        finally:
+            # 녹음 실패/Ctrl+C에도 청크 스레드와 모델 작업 정리
+            if session:
+                session.close()
+
+        if analysis_result is None:
+            analysis_result = self.analyzer.analyze(recording_path)
 
         user_text = analysis_result['features']['whisper']['text']
         scores = analysis_result['scores']
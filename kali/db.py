@@ -0,0 +1,152 @@
+"""
+칼리(센서 PC) 스크립트 공용 DB 연결
+- 프로세스가 살아 있는 동안 연결 1개를 계속 사용 (매번 connect/close 하지 않음)
+- 연결이 끊기면(DB 재시작, wait_timeout 등) 다음 쿼리에서 자동 재연결 후 1번 재시도
+  (쓰기는 먼저 ping으로 연결을 확인하고, 서버에 보내지 못한 게 확실할 때만 재시도 → 같은 행이 두 번 들어가지 않음)
+- autocommit + 세션 시간대(+09:00) 설정은 재연결할 때마다 다시 적용
+
+사용 예:
+    db = PersistentConnection()
+    rows = db.query("SELECT ... WHERE id > %s", (last_id,))
+    db.executemany("INSERT INTO ... VALUES (%s, %s)", rows)
+"""
+
+import time
+from datetime import timedelta, timezone
+
+import pymysql
+
+
+# 센서 PC의 로컬 MySQL
+DB_CONFIG = {
+    'host': 'localhost',
+    'port': 3306,
+    'user': 'root',
+    'password': '1234',
+    'database': 'care_db',
+    'charset': 'utf8mb4',
+}
+
+# 세션 시간대 (init_sql의 time_zone과 같음, 스크립트에서 시각을 직접 넣을 때 사용)
+KST = timezone(timedelta(hours=9))
+
+# 움직임 센서 → 어르신 → 보호자 (monitor_still.py, motion_daemon.py)
+MOTION_SENSOR_SQL = """
+    SELECT s.sensor_id, sn.senior_id, sn.guardian_id
+    FROM tb_sensor s
+    JOIN tb_device d ON s.device_id = d.device_id
+    JOIN tb_senior sn ON d.senior_id = sn.senior_id
+    WHERE s.sensor_type = 'motion'
+"""
+
+# 재연결 후 다시 시도할 오류 (연결 실패 / server has gone away / 연결 끊김)
+RETRYABLE_ERRORS = (2003, 2006, 2013, 2055)
+# 문장을 서버에 보내지 못한 게 확실한 오류 (연결 실패 / 보내기 실패) → 쓰기도 다시 시도해도 안전
+# 2013/2055(실행 중 연결 끊김)는 서버가 이미 실행했을 수 있음
+UNSENT_ERRORS = (2003, 2006)
+
+
+def _is_connection_error(e, codes=RETRYABLE_ERRORS):
+    if isinstance(e, pymysql.err.InterfaceError):
+        return True  # 이미 닫힌 연결 (보내기 전)
+    return isinstance(e, pymysql.err.OperationalError) and bool(e.args) and e.args[0] in codes
+
+
+def is_unknown_write_result(e):
+    """쓰기 도중 연결이 끊겨 서버에서 실행됐는지 알 수 없는 오류인지 (다시 넣으면 중복될 수 있음)"""
+    return _is_connection_error(e) and not _is_connection_error(e, UNSENT_ERRORS)
+
+
+class PersistentConnection:
+    """자동 재연결되는 장기 연결 (스레드 1개에서 사용)"""
+
+    def __init__(self, config=None, init_sql=("SET time_zone = '+09:00'",)):
+        """
+        Args:
+            config: DB 접속 정보 (None이면 DB_CONFIG)
+            init_sql: 연결할 때마다 실행할 세션 설정
+        """
+        self.config = config or DB_CONFIG
+        self.init_sql = init_sql
+        self.conn = None
+        self.reconnects = 0
+
+    def connect(self):
+        """새 연결 (기존 연결은 닫음)"""
+        self.close()
+        self.conn = pymysql.connect(
+            host=self.config['host'],
+            port=self.config.get('port', 3306),
+            user=self.config['user'],
+            password=self.config['password'],
+            database=self.config['database'],
+            charset=self.config.get('charset', 'utf8mb4'),
+            autocommit=True
+        )
+        with self.conn.cursor() as cursor:
+            for sql in self.init_sql:
+                cursor.execute(sql)
+        return self.conn
+
+    def _run(self, work, idempotent=True):
+        """
+        work(cursor) 실행 (연결 오류면 재연결 후 1번 재시도)
+
+        Args:
+            idempotent: False(INSERT/UPDATE)면 실행 전에 ping으로 끊긴 연결을 먼저 재연결하고,
+                        실행을 시작한 뒤에는 UNSENT_ERRORS일 때만 재시도
+        """
+        for attempt in range(2):
+            started = False
+            try:
+                if self.conn is None:
+                    self.connect()
+                elif not idempotent:
+                    self.conn.ping(reconnect=False)  # 오래 쉬어 끊긴 연결은 보내기 전에 확인
+                with self.conn.cursor() as cursor:
+                    started = True
+                    return work(cursor)
+            except Exception as e:
+                safe = idempotent or not started or _is_connection_error(e, UNSENT_ERRORS)
+                if not (safe and _is_connection_error(e)) or attempt == 1:
+                    raise
+                print(f"\n⚠️ DB 연결 끊김 → 재연결: {e}")
+                self.close()
+                self.reconnects += 1
+                time.sleep(0.5)
+
+    def query(self, sql, params=None):
+        """SELECT → 행 리스트 (튜플)"""
+        def work(cursor):
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        return self._run(work)
+
+    def query_one(self, sql, params=None):
+        """SELECT → 첫 행 (없으면 None)"""
+        def work(cursor):
+            cursor.execute(sql, params)
+            return cursor.fetchone()
+        return self._run(work)
+
+    def execute(self, sql, params=None):
+        """INSERT/UPDATE → (영향받은 행 수, lastrowid)"""
+        def work(cursor):
+            count = cursor.execute(sql, params)
+            return count, cursor.lastrowid
+        return self._run(work, idempotent=False)
+
+    def executemany(self, sql, seq_params):
+        """여러 행 한 번에 INSERT (왕복 1번) → 영향받은 행 수"""
+        seq_params = list(seq_params)
+        if not seq_params:
+            return 0
+        return self._run(lambda cursor: cursor.executemany(sql, seq_params), idempotent=False)
+
+    def close(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+            self.conn = None
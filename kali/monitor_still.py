@@ -1,74 +1,223 @@
-import pymysql
+"""
+어르신 미동 감시 서비스 (여러 어르신 동시 감시)
+- DB 연결 1개를 계속 사용 (kali/db.py, 끊기면 자동 재연결)
+- 마지막으로 읽은 sensing_id(high-water mark) 이후 새 행만 조회
+  → 센서별 마지막 활동 시각을 메모리에서 갱신 (tb_sensing 전체 MAX 조회 / 문자열 비교 없음)
+- 움직임 센서 → 어르신 → 보호자 매핑은 DB에서 읽음 (주기적으로 새로고침)
+- 미동 시간이 기준을 넘은 어르신의 알림은 모아서 한 번에 INSERT
+- 같은 미동 구간에서는 알림 1번 (다시 움직이면 초기화, 재시작 시 DB의 최근 알림으로 복원)
+  → 알림 내용에 어르신 ID를 넣어, 어르신이 여럿인 보호자도 어르신별로 따로 복원
+
+사용법:
+    python monitor_still.py [--threshold 60] [--interval 1] [--senior 3 --senior 5]
+"""
+
+import argparse
+import re
 import time
-import os
 
-def monitor():
+from db import PersistentConnection, MOTION_SENSOR_SQL
+
+
+ACTIVE_VALUES = ('1', '2')       # 활동으로 보는 sensing_value (1: 활동, 2: 긴급)
+ALERT_TYPE = 'No Movement'
+ALERT_CONTENT = '⚠️ [어르신 {senior_id}] {threshold_sec}초 이상 미동 없음 (확인 요망)'
+ALERT_SENIOR_RE = re.compile(r'\[어르신 (\d+)\]')   # 알림 내용 → senior_id (재시작 시 복원용)
+MAPPING_REFRESH_SEC = 60         # 센서/어르신 매핑 새로고침 주기
+FETCH_LIMIT = 5000               # 한 번에 읽을 최대 새 행 수
+
+ALERT_SQL = """
+    INSERT INTO tb_alert
+    (guardian_id, alert_type, alert_content, alert_channel, sented_at, received_yes)
+    VALUES (%s, %s, %s, 'WEB', NOW(), 0)
+"""
+
+
+class StillnessMonitor:
+    """어르신별 미동 시간 추적 + 알림"""
+
+    def __init__(self, db, threshold_sec=60, senior_ids=None):
+        """
+        Args:
+            db: PersistentConnection
+            threshold_sec: 이 시간 넘게 움직임이 없으면 알림 (초)
+            senior_ids: 감시할 어르신 ID (None이면 움직임 센서가 있는 모든 어르신)
+        """
+        self.db = db
+        self.threshold_sec = threshold_sec
+        self.senior_ids = set(senior_ids) if senior_ids else None
+
+        self.high_water_mark = None   # 마지막으로 읽은 sensing_id
+        self.sensor_owner = {}        # sensor_id → senior_id
+        self.guardian_of = {}         # senior_id → guardian_id
+        self.last_activity = {}       # senior_id → 마지막 활동 시각 (DB 시각)
+        self.alerted = set()          # 이번 미동 구간에 이미 알림 보낸 senior_id
+        self._mapping_loaded_at = 0.0
+
+    # ========== 초기화 ==========
+
+    def load_mapping(self):
+        """움직임 센서 → 어르신 → 보호자 매핑 (새 센서/어르신 반영)"""
+        sensor_owner, guardian_of = {}, {}
+        for sensor_id, senior_id, guardian_id in self.db.query(MOTION_SENSOR_SQL):
+            if self.senior_ids is None or senior_id in self.senior_ids:
+                sensor_owner[sensor_id] = senior_id
+                guardian_of[senior_id] = guardian_id
+
+        new_sensors = [sid for sid in sensor_owner if sid not in self.sensor_owner]
+        self.sensor_owner, self.guardian_of = sensor_owner, guardian_of
+        self._mapping_loaded_at = time.monotonic()
+
+        if new_sensors:
+            self._load_last_activity(new_sensors)
+        return len(new_sensors)
+
+    def _load_last_activity(self, sensor_ids):
+        """
+        센서별 마지막 활동 시각 (새로 감시하는 센서만 1번)
+        (sensor_id, created_at) 인덱스 범위 조회 → migrations/002
+        """
+        # 활동 시각보다 먼저 잡아야 그 사이에 들어온 행이 빠지지 않음
+        if self.high_water_mark is None:
+            self._init_high_water_mark()
+
+        placeholders = ", ".join(["%s"] * len(sensor_ids))
+        rows = self.db.query(f"""
+            SELECT sensor_id, MAX(created_at)
+            FROM tb_sensing
+            WHERE sensor_id IN ({placeholders})
+              AND sensing_value IN (%s, %s)
+            GROUP BY sensor_id
+        """, (*sensor_ids, *ACTIVE_VALUES))
+        for sensor_id, last_at in rows:
+            self._touch(self.sensor_owner[sensor_id], last_at)
+
+        # 재시작 직후 같은 미동 구간에 알림이 또 가지 않도록 어르신별 최근 알림 복원
+        # (보호자의 알림을 내용별로 묶고, 내용의 어르신 ID로 구분 → 다른 어르신 알림에 막히지 않음)
+        guardians = {self.guardian_of[self.sensor_owner[sid]] for sid in sensor_ids}
+        placeholders = ", ".join(["%s"] * len(guardians))
+        rows = self.db.query(f"""
+            SELECT guardian_id, alert_content, MAX(sented_at)
+            FROM tb_alert
+            WHERE guardian_id IN ({placeholders}) AND alert_type = %s
+            GROUP BY guardian_id, alert_content
+        """, (*guardians, ALERT_TYPE))
+        last_alert = {}
+        for guardian_id, content, sent_at in rows:
+            match = ALERT_SENIOR_RE.search(content or '')
+            if not match:
+                continue  # 어르신 ID가 없는 예전 알림
+            senior_id = int(match.group(1))
+            if self.guardian_of.get(senior_id) != guardian_id:
+                continue  # 다른 보호자에게 연결돼 있던 때의 알림
+            if senior_id not in last_alert or sent_at > last_alert[senior_id]:
+                last_alert[senior_id] = sent_at
+        for senior_id in {self.sensor_owner[sid] for sid in sensor_ids}:
+            sent_at = last_alert.get(senior_id)
+            last_at = self.last_activity.get(senior_id)
+            if sent_at and last_at and sent_at > last_at:
+                self.alerted.add(senior_id)
+
+    def _init_high_water_mark(self):
+        row = self.db.query_one("SELECT COALESCE(MAX(sensing_id), 0) FROM tb_sensing")
+        self.high_water_mark = row[0]
+
+    def _touch(self, senior_id, at):
+        if at is None:
+            return
+        previous = self.last_activity.get(senior_id)
+        if previous is None or at > previous:
+            self.last_activity[senior_id] = at
+            self.alerted.discard(senior_id)  # 다시 움직임 → 다음 미동 구간 알림 가능
+
+    # ========== 주기 실행 ==========
+
+    def poll_new_sensing(self):
+        """high-water mark 이후 새 센싱 행 → 마지막 활동 시각 갱신"""
+        if self.high_water_mark is None:
+            self._init_high_water_mark()
+            return 0
+
+        rows = self.db.query("""
+            SELECT sensing_id, sensor_id, sensing_value, created_at
+            FROM tb_sensing
+            WHERE sensing_id > %s
+            ORDER BY sensing_id
+            LIMIT %s
+        """, (self.high_water_mark, FETCH_LIMIT))
+
+        for sensing_id, sensor_id, value, created_at in rows:
+            senior_id = self.sensor_owner.get(sensor_id)
+            if senior_id is not None and str(value) in ACTIVE_VALUES:
+                self._touch(senior_id, created_at)
+        if rows:
+            self.high_water_mark = rows[-1][0]
+        return len(rows)
+
+    def check_idle(self, now):
+        """
+        기준을 넘은 어르신 알림 (모아서 INSERT 1번)
+
+        Returns:
+            {senior_id: 미동 시간(초)}
+        """
+        idle = {
+            senior_id: (now - last_at).total_seconds()
+            for senior_id, last_at in self.last_activity.items()
+            if senior_id in self.guardian_of
+        }
+
+        due = [sid for sid, sec in idle.items() if sec >= self.threshold_sec and sid not in self.alerted]
+        if due:
+            self.db.executemany(ALERT_SQL, [
+                (self.guardian_of[sid], ALERT_TYPE,
+                 ALERT_CONTENT.format(senior_id=sid, threshold_sec=self.threshold_sec))
+                for sid in due
+            ])
+            self.alerted.update(due)
+            print(f"\n>>> [알림 발생] 어르신 {due} 미동 {self.threshold_sec}초 경과! DB에 '미동 없음' 기록 완료.")
+        return idle
+
+    def step(self):
+        """1회 실행: 매핑 새로고침(주기) → 새 행 반영 → 미동 확인"""
+        if time.monotonic() - self._mapping_loaded_at > MAPPING_REFRESH_SEC:
+            self.load_mapping()
+        self.poll_new_sensing()
+        now = self.db.query_one("SELECT NOW()")[0]
+        return self.check_idle(now)
+
+
+def monitor(threshold_sec=60, interval_sec=1.0, senior_ids=None):
     print("========================================")
     print("   👴 어르신 미동 감시 시스템 가동 중   ")
-    print("        (60초 움직임 없을 시 알람)      ")
+    print(f"        ({threshold_sec}초 움직임 없을 시 알람)      ")
     print("========================================")
 
-    alert_sent_this_event = False  # 알람 발송 여부 체크용 변수
+    db = PersistentConnection()
+    watcher = StillnessMonitor(db, threshold_sec, senior_ids)
 
     while True:
         try:
-            conn = pymysql.connect(
-                host='localhost',
-                user='root',
-                password='1234',
-                db='care_db',
-                charset='utf8mb4',
-                autocommit=True
-            )
-            cursor = conn.cursor()
-            cursor.execute("SET time_zone = '+09:00';")
-
-            # 1. 마지막 활동 확인
-            check_sql = """
-                SELECT TIMESTAMPDIFF(SECOND, MAX(created_at), NOW()) 
-                FROM tb_sensing 
-                WHERE sensing_value >= '1'
-            """
-            cursor.execute(check_sql)
-            result = cursor.fetchone()
-            diff = result[0] if result and result[0] is not None else 0
-
-            # 2. 상태별 터미널 출력 로직
-            if diff < 60:
-                # 움직임이 감지되어 초가 초기화되면 변수도 초기화
-                alert_sent_this_event = False 
-                print(f"[정상] 현재 미동 없음 시간: {diff}초...    ", end="\r")
-            
-            else:
-                # 60초 도달 시점에 딱 한 번만 DB 저장 및 로그 출력
-                if not alert_sent_this_event:
-                    # 중복 방지 체크 (DB 기준)
-                    cursor.execute("""
-                        SELECT COUNT(*) FROM tb_alert 
-                        WHERE alert_type = 'No Movement' 
-                        AND sented_at > DATE_SUB(NOW(), INTERVAL 1 MINUTE)
-                    """)
-                    
-                    if cursor.fetchone()[0] == 0:
-                        alert_sql = """
-                            INSERT INTO tb_alert 
-                            (guardian_id, alert_type, alert_content, alert_channel, sented_at, received_yes) 
-                            VALUES (8, 'No Movement', '⚠️ 60초 이상 미동 없음 (확인 요망)', 'WEB', NOW(), 0)
-                        """
-                        cursor.execute(alert_sql)
-                        print(f"\n>>> [알림 발생] 60초 경과! DB에 '미동 없음' 기록 완료. (웹 팝업 대기 중)")
-                    
-                    alert_sent_this_event = True  # 이번 미동 이벤트에서는 더 이상 저장/출력 안 함
-                
-                # 60초 이후에는 터미널에서 초만 조용히 업데이트
-                print(f"🚨 [경보 상태] 미동 없음 지속 중: {diff}초...      ", end="\r")
-
-            conn.close()
-            
+            idle = watcher.step()
+
+            # 상태 출력 (한 줄 갱신)
+            alarmed = sum(1 for sid, sec in idle.items() if sec >= threshold_sec)
+            longest = max(idle.values(), default=0)
+            label = "🚨 [경보 상태]" if alarmed else "[정상]"
+            print(f"{label} 감시 {len(watcher.guardian_of)}명 | 미동 경보 {alarmed}명 | "
+                  f"최장 미동 {longest:.0f}초 | 재연결 {db.reconnects}회      ", end="\r")
+
         except Exception as e:
             print(f"\n오류 발생: {e}")
-        
-        time.sleep(1)
+
+        time.sleep(interval_sec)
+
 
 if __name__ == "__main__":
-    monitor()
+    parser = argparse.ArgumentParser(description="어르신 미동 감시")
+    parser.add_argument("--threshold", type=int, default=60, help="미동 알림 기준 (초)")
+    parser.add_argument("--interval", type=float, default=1.0, help="확인 주기 (초)")
+    parser.add_argument("--senior", type=int, action="append", help="감시할 어르신 ID (여러 번 지정 가능, 기본: 전체)")
+    args = parser.parse_args()
+
+    monitor(args.threshold, args.interval, args.senior)
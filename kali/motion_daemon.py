@@ -0,0 +1,224 @@
+"""
+움직임 센서 수집 데몬 (상주 프로세스)
+- 예전: Motion 이벤트마다 motion_logger.py 프로세스 실행 → 파이썬 시작 + DB 연결 + INSERT 1건 + 전체 MAX 조회
+- 지금: 이 데몬이 계속 떠 있고, motion_logger.py는 픽셀 변화량만 유닉스 소켓으로 보냄
+    · 같은 센서의 연속 이벤트는 메모리에서 5초 간격으로 거름 (더 심각한 단계로 바뀌면 바로 통과)
+    · tb_sensing 행은 모아서 executemany 1번 (DB 연결 1개 계속 사용, kali/db.py)
+      → 시각은 저장할 때의 DB NOW()가 아니라 이벤트를 받은 시각 (묶음 주기 / DB 장애로 늦게 저장돼도 그대로)
+    · 긴급(2)은 기다리지 않고 바로 저장 + 센서에 연결된 보호자에게 알림 (고정값 8 대신 DB 매핑)
+- 판정 기준(픽셀 변화량)은 기존과 동일: 20000 이상 긴급, 4000 이상 활동, 그 외 안정
+
+사용법:
+    python motion_daemon.py [--socket /tmp/motion_daemon.sock] [--flush-interval 1.0]
+    (Motion 설정: on_motion_detected python3 motion_logger.py %D [센서ID])
+"""
+
+import argparse
+import os
+import signal
+import socket
+import time
+from datetime import datetime
+
+from db import KST, PersistentConnection, MOTION_SENSOR_SQL, is_unknown_write_result
+
+
+SOCKET_PATH = "/tmp/motion_daemon.sock"   # motion_logger.py의 SOCKET_PATH와 같아야 함
+DEFAULT_SENSOR_ID = 14                    # 센서 ID를 안 보내면 사용 (기존 motion_logger.py 값)
+COOL_DOWN = 5.0                           # 같은 센서 로그 최소 간격 (초)
+MAX_BUFFER = 10000                        # DB 장애 시 메모리에 쌓아둘 최대 행 수
+
+# 값은 모두 %s로 넘김 (pymysql executemany가 여러 행 INSERT 1문장으로 묶으려면 VALUES가 %s만 있어야 함)
+SENSING_SQL = """
+    INSERT INTO tb_sensing (sensor_id, sensing_type, sensing_value, created_at)
+    VALUES (%s, %s, %s, %s)
+"""
+
+ALERT_SQL = """
+    INSERT INTO tb_alert
+    (guardian_id, alert_type, alert_content, alert_channel, sented_at, received_yes)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+ALERT_TYPE = 'Emergency'
+ALERT_CONTENT = '🚨 긴급 상황: 급격한 움직임 발생!'
+
+
+def classify(pixel_change):
+    """픽셀 변화량 → (sensing_value, 상태, 메시지)"""
+    if pixel_change >= 20000:
+        return "2", "🚨 긴급 상황", "급격한 움직임 감지!"
+    elif pixel_change >= 4000:
+        return "1", "🏃 활동 중", "어르신 움직임 포착"
+    else:
+        return "0", "✅ 안정 상태", "평온한 상태입니다."
+
+
+def parse_event(payload):
+    """소켓 메시지 "픽셀변화량 [센서ID]" → (pixel_change, sensor_id)"""
+    parts = payload.decode("utf-8", errors="ignore").split()
+    try:
+        pixel_change = int(parts[0])
+    except (IndexError, ValueError):
+        pixel_change = 0
+    try:
+        sensor_id = int(parts[1])
+    except (IndexError, ValueError):
+        sensor_id = DEFAULT_SENSOR_ID
+    return pixel_change, sensor_id
+
+
+class MotionIngestor:
+    """이벤트 거르기 + 묶음 저장"""
+
+    def __init__(self, db, cool_down=COOL_DOWN, batch_size=100):
+        self.db = db
+        self.cool_down = cool_down
+        self.batch_size = batch_size
+
+        self.sensing_rows = []     # SENSING_SQL 파라미터 (sensor_id, 'motion', sensing_value, 이벤트 시각)
+        self.alert_rows = []       # ALERT_SQL 파라미터 (guardian_id, ..., 이벤트 시각, 0)
+        self.last_logged = {}      # sensor_id → (시각, sensing_value)
+        self.last_active = {}      # sensor_id → 마지막 활동(1, 2) 시각
+        self.guardian_of_sensor = {}
+
+        self.received = 0
+        self.debounced = 0
+        self.written = 0
+
+    def load_mapping(self):
+        """센서 → 보호자 (긴급 알림 대상)"""
+        self.guardian_of_sensor = {
+            sensor_id: guardian_id for sensor_id, _, guardian_id in self.db.query(MOTION_SENSOR_SQL)
+        }
+
+    def handle(self, pixel_change, sensor_id, now=None):
+        """
+        이벤트 1건 처리
+
+        Returns:
+            저장 대상이면 sensing_value, 걸러졌으면 None
+        """
+        now = now or time.time()
+        self.received += 1
+        value, status_label, msg = classify(pixel_change)
+
+        # 1. 중복 거르기 (5초 안의 같은/낮은 단계 이벤트는 버림)
+        last = self.last_logged.get(sensor_id)
+        if last and now - last[0] < self.cool_down and value <= last[1]:
+            self.debounced += 1
+            return None
+        self.last_logged[sensor_id] = (now, value)
+
+        # 2. 저장 대기열에 추가 (이벤트를 받은 시각을 DB 세션 시간대로 함께 저장)
+        created_at = datetime.fromtimestamp(now, KST).replace(tzinfo=None)
+        self.sensing_rows.append((sensor_id, 'motion', value, created_at))
+        if value != "0":
+            self.last_active[sensor_id] = now
+
+        # 3. 긴급 상황(2) → 해당 보호자 알림
+        if value == "2":
+            if sensor_id not in self.guardian_of_sensor:
+                self.load_mapping()
+            guardian_id = self.guardian_of_sensor.get(sensor_id)
+            if guardian_id is not None:
+                self.alert_rows.append((guardian_id, ALERT_TYPE, ALERT_CONTENT, 'WEB', created_at, 0))
+                print(f">>> [경보] {status_label} 데이터가 DB에 기록됩니다! (센서 {sensor_id} → 보호자 {guardian_id})")
+            else:
+                print(f"⚠️ 센서 {sensor_id}에 연결된 보호자가 없어 긴급 알림을 보내지 못했습니다.")
+
+        # 미동 시간 (현재 상태 출력용, 메모리 값)
+        last_active = self.last_active.get(sensor_id)
+        still = f"{now - last_active:.0f}초" if last_active else "기록 없음"
+        print(f"[{status_label}] {msg} (센서 {sensor_id}, 변화량: {pixel_change}) | 미동 지속: {still}")
+        return value
+
+    def should_flush(self):
+        return bool(self.alert_rows) or len(self.sensing_rows) >= self.batch_size
+
+    def flush(self):
+        """대기 중인 행 저장 (실패하면 다음에 다시 시도, 센싱 행이 실패하면 알림도 다음에)"""
+        if not self.sensing_rows and not self.alert_rows:
+            return 0
+        written = self._write(SENSING_SQL, self.sensing_rows)
+        if written is None:
+            return 0
+        self._write(ALERT_SQL, self.alert_rows)
+        self.written += written
+        return written
+
+    def _write(self, sql, rows):
+        """
+        rows 저장 후 비움
+
+        Returns:
+            저장한 행 수, 실패해서 rows를 남겨뒀으면 None
+        """
+        try:
+            count = self.db.executemany(sql, rows)
+        except Exception as e:
+            if not is_unknown_write_result(e):
+                print(f"⚠️ DB 저장 실패 (다음에 재시도, 대기 {len(rows)}건): {e}")
+                del rows[:-MAX_BUFFER]
+                return None
+            # 실행 중 연결이 끊김 → 이미 저장됐을 수 있으므로 다시 넣지 않음 (중복 행 / 중복 알림 방지)
+            print(f"⚠️ DB 저장 중 연결 끊김 (저장 여부 알 수 없음, {len(rows)}건은 다시 넣지 않음): {e}")
+            count = 0
+        rows.clear()
+        return count
+
+
+def serve(socket_path=SOCKET_PATH, flush_interval=1.0, batch_size=100):
+    """소켓에서 이벤트를 받아 저장 (Ctrl+C / SIGTERM 시 남은 행 저장 후 종료)"""
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.bind(socket_path)
+    os.chmod(socket_path, 0o666)  # Motion 실행 사용자도 보낼 수 있게
+
+    db = PersistentConnection()
+    ingestor = MotionIngestor(db, batch_size=batch_size)
+    try:
+        ingestor.load_mapping()
+    except Exception as e:
+        print(f"⚠️ 센서 매핑 조회 실패 (긴급 이벤트 때 다시 시도): {e}")
+
+    running = [True]
+    signal.signal(signal.SIGTERM, lambda *_: running.__setitem__(0, False))
+
+    print("========================================")
+    print("   📷 움직임 수집 데몬 가동 중")
+    print(f"   소켓: {socket_path} (묶음 저장 {flush_interval}초 / {batch_size}건)")
+    print("========================================")
+
+    next_flush = time.monotonic() + flush_interval
+    try:
+        while running[0]:
+            sock.settimeout(max(0.0, next_flush - time.monotonic()))
+            try:
+                payload = sock.recv(256)
+                ingestor.handle(*parse_event(payload))
+            except socket.timeout:
+                pass
+
+            if ingestor.should_flush() or time.monotonic() >= next_flush:
+                ingestor.flush()
+                next_flush = time.monotonic() + flush_interval
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ingestor.flush()
+        sock.close()
+        os.remove(socket_path)
+        db.close()
+        print(f"\n✅ 종료 (수신 {ingestor.received}건, 걸러짐 {ingestor.debounced}건, 저장 {ingestor.written}건)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="움직임 센서 수집 데몬")
+    parser.add_argument("--socket", default=SOCKET_PATH, help="유닉스 소켓 경로")
+    parser.add_argument("--flush-interval", type=float, default=1.0, help="묶음 저장 주기 (초)")
+    parser.add_argument("--batch-size", type=int, default=100, help="이만큼 쌓이면 바로 저장")
+    args = parser.parse_args()
+
+    serve(args.socket, args.flush_interval, args.batch_size)
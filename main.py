@@ -55,13 +55,14 @@ class AudioFileAnalyzer:
         
         print("\n✅ 시스템 초기화 완료! (감정 기반)\n")
     
-    def analyze_file(self, audio_file, play_response=True):
+    def analyze_file(self, audio_file, play_response=True, analysis_result=None):
         """
         단일 파일 분석 (감정 포함)
         
         Args:
             audio_file: 분석할 WAV 파일 경로
             play_response: TTS로 응답 재생 여부
+            analysis_result: 이미 분석된 결과 (배치 분석에서 전달, 없으면 새로 분석)
         
         Returns:
             result: 분석 결과 + LLM 응답
@@ -71,8 +72,11 @@ class AudioFileAnalyzer:
         print("="*60)
         
         # 1. 음성 분석 (감정 포함!)
-        print("\n[1/3] 📊 음성 분석 중 (감정 포함)...")
-        analysis_result = self.analyzer.analyze(audio_file)
+        if analysis_result is None:
+            print("\n[1/3] 📊 음성 분석 중 (감정 포함)...")
+            analysis_result = self.analyzer.analyze(audio_file)
+        else:
+            print("\n[1/3] 📊 배치 분석 결과 사용")
         
         user_text = analysis_result['features']['whisper']['text']
         scores = analysis_result['scores']
@@ -112,27 +116,37 @@ class AudioFileAnalyzer:
             'ai_response': ai_response
         }
     
-    def batch_analyze(self, audio_files, play_responses=False):
+    def batch_analyze(self, audio_files, play_responses=False, chunk_size=32):
         """
         여러 파일 배치 분석 (감정 포함)
         
         Args:
             audio_files: 파일 경로 리스트
             play_responses: TTS로 응답 재생 여부
+            chunk_size: 한 번에 배치 추론할 파일 수 (메모리 사용량 제한)
         """
         print("\n" + "="*60)
         print("📁 배치 분석 모드 (감정 포함)")
         print("="*60)
         print(f"총 {len(audio_files)}개 파일 분석\n")
         
+        # 음성 분석은 chunk_size개씩 묶어서 배치 추론
+        analyses = []
+        for start in range(0, len(audio_files), chunk_size):
+            analyses.extend(self.analyzer.analyze_batch(audio_files[start:start + chunk_size]))
+        
         results = []
         
-        for i, audio_file in enumerate(audio_files, 1):
+        for i, (audio_file, analysis_result) in enumerate(zip(audio_files, analyses), 1):
             print(f"\n[{i}/{len(audio_files)}] {audio_file}")
             print("-"*40)
             
-            # 분석
-            result = self.analyze_file(audio_file, play_response=play_responses)
+            # LLM 응답 (분석은 배치 결과 재사용)
+            result = self.analyze_file(
+                audio_file,
+                play_response=play_responses,
+                analysis_result=analysis_result
+            )
             
             results.append({
                 'file': audio_file,
@@ -0,0 +1,16 @@
+-- 발화별 채점 특징 + 점수 (재채점 작업 rescore_job.py 대상)
+-- features_json: SpeechAnalyzer._score_features() 결과 (채점 기준이 바뀌면 이 값으로 다시 채점)
+-- feature_source: 'analysis' (분석 시 저장, 정확) | 'legacy' (예전 tb_voice_log/tb_analysis에서 복원)
+-- criteria_version: 채점 기준(SCORING_CRITERIA) 지문 → 기준이 바뀐 행만 재채점
+
+CREATE TABLE IF NOT EXISTS tb_voice_score (
+    voice_id          INT           NOT NULL PRIMARY KEY,
+    features_json     JSON          NOT NULL,
+    feature_source    VARCHAR(16)   NOT NULL,
+    scores_json       JSON          NOT NULL,
+    average_score     DECIMAL(5, 2) NOT NULL,
+    weighted_score    DECIMAL(5, 2) NOT NULL,
+    criteria_version  CHAR(12)      NOT NULL,
+    scored_at         DATETIME      NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_voice_score_version (criteria_version, voice_id)
+) DEFAULT CHARSET = utf8mb4;
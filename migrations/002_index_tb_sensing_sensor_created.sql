@@ -0,0 +1,7 @@
+-- 센서별 기간 조회용 복합 인덱스
+-- sensor_state.py SENIOR_DAYS_SQL: 캐시에 없는 어르신의 28일 일별 활동량 재구성
+--   (tb_sensor/tb_device 조인으로 얻은 sensor_id마다 created_at >= ? 범위 스캔)
+-- kali/monitor_still.py: 새로 감시하는 센서의 마지막 활동 시각 (sensor_id IN (...) 그룹별 MAX)
+-- (예전 DATE(created_at) = ? 조건은 created_at 인덱스를 쓸 수 없었음)
+
+CREATE INDEX idx_sensing_sensor_created ON tb_sensing (sensor_id, created_at);
@@ -0,0 +1,6 @@
+-- 보호자별 알림 조회용 복합 인덱스 (bomi.py /api/check-alert, /api/alert-list, /api/alert-read-all)
+-- WHERE guardian_id = ? AND received_yes = 0 ORDER BY sented_at DESC LIMIT 1 → 인덱스 끝에서 1행만 읽음
+-- UPDATE ... WHERE guardian_id = ? AND received_yes = 0 → 그 보호자의 안 읽은 행만 잠금/수정
+-- (예전에는 tb_alert 전체 정렬/전체 UPDATE → 전체 알림 수에 비례)
+
+CREATE INDEX idx_alert_guardian_unread ON tb_alert (guardian_id, received_yes, sented_at);
@@ -0,0 +1,173 @@
+"""
+모델 레지스트리 (지연 로딩 + 워밍업)
+- 서버는 모델 로딩을 기다리지 않고 바로 시작 (로그인 등 모델 없는 API 즉시 사용 가능)
+- 모델은 백그라운드 스레드에서 하나씩 로드
+- 로드 직후 가짜 입력으로 1회 추론 (워밍업: 첫 요청의 초기화/메모리 할당 비용 제거)
+- 모델별 준비 상태를 /health, /api/voice-health에서 확인
+"""
+
+import threading
+import time
+
+
+class ModelNotReadyError(Exception):
+    """모델이 아직 로딩 중이거나 로딩 실패"""
+    pass
+
+
+class _ModelEntry:
+    """레지스트리 항목 (모델 1개)"""
+
+    def __init__(self, name, loader, warmup=None):
+        self.name = name
+        self.loader = loader
+        self.warmup = warmup
+
+        self.state = ModelRegistry.PENDING
+        self.instance = None
+        self.error = None
+        self.load_sec = None
+        self.warmup_ms = None
+
+        self.lock = threading.Lock()   # 같은 모델 중복 로딩 방지
+        self.done = threading.Event()  # 로딩 완료(성공/실패) 신호
+
+
+class ModelRegistry:
+    """
+    모델 지연 로딩 레지스트리
+
+    사용 예:
+        registry = ModelRegistry()
+        registry.register('whisper', load_whisper, warmup=warmup_whisper)
+        registry.start()                      # 백그라운드 로딩 (즉시 반환)
+        registry.is_ready('whisper')          # 준비 여부
+        model = registry.get('whisper')       # 준비될 때까지 대기 (시작 전이면 직접 로드)
+    """
+
+    PENDING = "pending"
+    LOADING = "loading"
+    WARMING = "warming"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(self, warmup=True):
+        """
+        Args:
+            warmup: 로드 후 워밍업 추론 실행 여부
+        """
+        self.warmup = warmup
+        self._entries = {}
+        self._thread = None
+
+    def register(self, name, loader, warmup=None):
+        """
+        모델 등록 (등록 순서 = 백그라운드 로딩 순서)
+
+        Args:
+            name: 모델 이름 ('whisper', 'emotion', 'llm' ...)
+            loader: 인자 없는 로딩 함수 → 모델 객체
+            warmup: 모델 객체를 받아 가짜 입력으로 1회 추론하는 함수 (선택)
+        """
+        if name not in self._entries:
+            self._entries[name] = _ModelEntry(name, loader, warmup)
+
+    def start(self, names=None):
+        """백그라운드 스레드에서 모델 로딩 시작 (즉시 반환)"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        names = list(names or self._entries)
+        self._thread = threading.Thread(
+            target=self.load_all, args=(names,), name="model-loader", daemon=True
+        )
+        self._thread.start()
+        print(f"🔄 모델 백그라운드 로딩 시작: {', '.join(names)}")
+
+    def load_all(self, names=None):
+        """모델 순서대로 로딩 (현재 스레드에서, 완료까지 대기)"""
+        for name in names or list(self._entries):
+            self._load(name)
+
+    def get(self, name, timeout=None):
+        """
+        모델 객체 반환
+
+        Args:
+            name: 모델 이름
+            timeout: 최대 대기 시간 (초)
+                - None: 준비될 때까지 대기 (아무도 로딩 안 했으면 직접 로드)
+                - 숫자: 그 시간 안에 준비 안 되면 ModelNotReadyError
+
+        Raises:
+            ModelNotReadyError: 로딩 중(timeout 초과) 또는 로딩 실패
+        """
+        entry = self._entries[name]
+
+        if timeout is None:
+            self._load(name)
+        else:
+            entry.done.wait(timeout)
+
+        if entry.state == self.READY:
+            return entry.instance
+        if entry.state == self.FAILED:
+            raise ModelNotReadyError(f"{name} 로딩 실패: {entry.error}")
+        raise ModelNotReadyError(f"{name} 로딩 중 ({entry.state})")
+
+    def is_ready(self, *names):
+        """모델(들)이 모두 준비됐는지"""
+        return all(
+            name in self._entries and self._entries[name].state == self.READY
+            for name in names
+        )
+
+    def status(self):
+        """모델별 상태 (/health 용)"""
+        return {
+            name: {
+                'state': entry.state,
+                'load_sec': entry.load_sec,
+                'warmup_ms': entry.warmup_ms,
+                'error': entry.error
+            }
+            for name, entry in self._entries.items()
+        }
+
+    def _load(self, name):
+        """모델 1개 로딩 + 워밍업 (이미 끝났으면 바로 반환)"""
+        entry = self._entries[name]
+
+        with entry.lock:
+            if entry.done.is_set():
+                return
+
+            try:
+                entry.state = self.LOADING
+                print(f"⏳ [{name}] 로딩 중...")
+                start = time.perf_counter()
+                instance = entry.loader()
+                entry.load_sec = round(time.perf_counter() - start, 1)
+
+                if self.warmup and entry.warmup:
+                    entry.state = self.WARMING
+                    start = time.perf_counter()
+                    try:
+                        entry.warmup(instance)
+                        entry.warmup_ms = round((time.perf_counter() - start) * 1000, 1)
+                    except Exception as e:
+                        # 워밍업 실패는 치명적이지 않음 (첫 요청이 조금 느릴 뿐)
+                        print(f"⚠️ [{name}] 워밍업 실패: {e}")
+
+                entry.instance = instance
+                entry.state = self.READY
+                warm = f", 워밍업 {entry.warmup_ms}ms" if entry.warmup_ms is not None else ""
+                print(f"✅ [{name}] 준비 완료 ({entry.load_sec}초{warm})")
+
+            except Exception as e:
+                entry.error = str(e)
+                entry.state = self.FAILED
+                print(f"❌ [{name}] 로딩 실패: {e}")
+
+            finally:
+                entry.done.set()
@@ -0,0 +1,137 @@
+"""
+피치 추정 A/B 테스트
+A: librosa.pyin (기준)
+B: 벡터화 YIN (기본 백엔드)
+
+속도와 정확도(유성 판정 일치율, 총 피치 오류율, 평균 오차, Z-peak 차이) 비교
+
+사용법: python pitch_ab_test.py [파일 또는 폴더 ...]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from audio_io import load_audio, collect_audio_files
+from pitch_tracker import get_pitch_estimator, frame_signal, rms_voiced_mask
+
+
+DEFAULT_DIRS = ["./recordings", "./data"]
+
+
+def z_peak(f0, sigma_min=5.0):
+    """EmotionEnsemble._calculate_pitch_zscore와 같은 수식"""
+    f0_valid = f0[~np.isnan(f0)]
+    if len(f0_valid) < 10:
+        return 0.0
+    sigma_safe = max(np.std(f0_valid), sigma_min)
+    return float(np.max(np.abs((f0_valid - np.mean(f0_valid)) / sigma_safe)))
+
+
+def compare(reference, candidate):
+    """
+    프레임별 F0 비교
+
+    Returns:
+        voicing_agree: 유성/무성 판정 일치율
+        gpe: 총 피치 오류율 (둘 다 유성인 프레임 중 상대 오차 20% 초과 비율)
+        cents: 정상 프레임 평균 오차 (cent)
+    """
+    n = min(len(reference), len(candidate))
+    ref, cand = reference[:n], candidate[:n]
+    ref_voiced = ~np.isnan(ref)
+    cand_voiced = ~np.isnan(cand)
+
+    voicing_agree = float(np.mean(ref_voiced == cand_voiced)) if n else 0.0
+
+    both = ref_voiced & cand_voiced
+    if not both.any():
+        return voicing_agree, 0.0, 0.0
+
+    rel_err = np.abs(cand[both] - ref[both]) / ref[both]
+    gross = rel_err > 0.2
+    gpe = float(np.mean(gross))
+
+    fine = ~gross
+    cents = float(np.mean(np.abs(1200 * np.log2(cand[both][fine] / ref[both][fine])))) if fine.any() else 0.0
+    return voicing_agree, gpe, cents
+
+
+def run_ab_test(files):
+    """파일별 비교 결과 리스트 반환"""
+    pyin = get_pitch_estimator('pyin')
+    yin = get_pitch_estimator('yin')
+    rows = []
+
+    for path in files:
+        audio = load_audio(path)
+        y, sr = audio.pcm, audio.sample_rate
+
+        # 두 추정기 모두 같은 유성 프레임 기준 사용
+        voiced_mask = rms_voiced_mask(frame_signal(y.astype(np.float64), yin.frame_length, yin.hop_length))
+
+        start = time.perf_counter()
+        f0_ref = pyin.estimate(y, sr, voiced_mask=voiced_mask)
+        pyin_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        f0_yin = yin.estimate(y, sr, voiced_mask=voiced_mask)
+        yin_ms = (time.perf_counter() - start) * 1000
+
+        voicing_agree, gpe, cents = compare(f0_ref, f0_yin)
+
+        rows.append({
+            'file': path,
+            'duration': audio.duration,
+            'pyin_ms': pyin_ms,
+            'yin_ms': yin_ms,
+            'voicing_agree': voicing_agree,
+            'gpe': gpe,
+            'cents': cents,
+            'z_pyin': z_peak(f0_ref),
+            'z_yin': z_peak(f0_yin)
+        })
+
+    return rows
+
+
+def print_report(rows):
+    """비교 결과 출력"""
+    print("\n" + "="*104)
+    print("📊 피치 추정 A/B 결과 (A: pyin, B: YIN)")
+    print("="*104)
+    print(f"{'파일':<32} {'길이':>6} {'A(ms)':>9} {'B(ms)':>8} {'속도':>7} "
+          f"{'유성일치':>8} {'GPE':>6} {'오차(c)':>8} {'Z(A)':>6} {'Z(B)':>6}")
+    print("-"*104)
+
+    for r in rows:
+        speedup = r['pyin_ms'] / r['yin_ms'] if r['yin_ms'] > 0 else 0.0
+        print(
+            f"{os.path.basename(r['file']):<32} {r['duration']:>5.1f}s "
+            f"{r['pyin_ms']:>9.1f} {r['yin_ms']:>8.1f} {speedup:>6.1f}x "
+            f"{r['voicing_agree'] * 100:>7.1f}% {r['gpe'] * 100:>5.1f}% {r['cents']:>8.1f} "
+            f"{r['z_pyin']:>6.2f} {r['z_yin']:>6.2f}"
+        )
+
+    if not rows:
+        print("분석할 파일이 없습니다.")
+        return
+
+    total_pyin = sum(r['pyin_ms'] for r in rows)
+    total_yin = sum(r['yin_ms'] for r in rows)
+    print("-"*104)
+    print(f"총 시간: A {total_pyin:.1f}ms → B {total_yin:.1f}ms ({total_pyin / max(total_yin, 1e-9):.1f}x)")
+    print(f"평균 GPE: {np.mean([r['gpe'] for r in rows]) * 100:.1f}%  "
+          f"평균 Z-peak 차이: {np.mean([abs(r['z_pyin'] - r['z_yin']) for r in rows]):.2f}")
+
+
+# ========== 메인 실행 ==========
+if __name__ == "__main__":
+    targets = sys.argv[1:] or DEFAULT_DIRS
+    wav_files = collect_audio_files(targets)
+
+    print(f"🎵 테스트 파일 {len(wav_files)}개")
+    results = run_ab_test(wav_files)
+    print_report(results)
@@ -0,0 +1,239 @@
+"""
+피치(F0) 추정 모듈
+- 교체 가능한 추정기 인터페이스 (PitchEstimator)
+- yin  : NumPy 벡터화 YIN (기본값, 빠름)
+- pyin : librosa.pyin (기준/검증용, 느림)
+- 노인 음성 F0 범위(기본 60~400Hz)로 탐색 범위 제한
+- 유성(목소리가 있는) 프레임만 계산
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from config.models import MODELS
+from vad import frame_signal, frame_rms, hybrid_threshold
+
+
+class PitchEstimator(ABC):
+    """
+    피치 추정기 기본 클래스 (추상 클래스, estimate()가 없는 추정기는 생성 시점에 오류)
+
+    estimate()는 프레임별 F0 배열을 반환 (무성/침묵 프레임은 NaN)
+    """
+
+    name = "base"
+
+    def __init__(self, fmin=60.0, fmax=400.0, frame_length=1024, hop_length=256):
+        """
+        Args:
+            fmin: 최소 F0 (Hz)
+            fmax: 최대 F0 (Hz)
+            frame_length: 프레임 길이 (샘플)
+            hop_length: 프레임 간격 (샘플)
+        """
+        self.fmin = fmin
+        self.fmax = fmax
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+
+    @abstractmethod
+    def estimate(self, y, sr, voiced_mask=None):
+        """
+        프레임별 F0 추정
+
+        Args:
+            y: 오디오 신호 (float)
+            sr: 샘플링 레이트
+            voiced_mask: 프레임별 유성 여부 (VADResult.frame_mask, None이면 RMS 기반으로 직접 계산)
+
+        Returns:
+            f0: 프레임별 F0 (Hz, 무성 프레임은 NaN)
+        """
+
+
+class YinPitchEstimator(PitchEstimator):
+    """
+    벡터화 YIN 피치 추정기
+    (de Cheveigné & Kawahara, 2002)
+
+    모든 프레임의 차분 함수를 FFT 한 번으로 계산
+    """
+
+    name = "yin"
+
+    def __init__(self, threshold=0.1, **kwargs):
+        """
+        Args:
+            threshold: CMNDF 임계값 (작을수록 엄격, 기본 0.1)
+        """
+        super().__init__(**kwargs)
+        self.threshold = threshold
+
+    def estimate(self, y, sr, voiced_mask=None):
+        y = np.asarray(y, dtype=np.float64)
+        frames = frame_signal(y, self.frame_length, self.hop_length)
+        f0 = np.full(len(frames), np.nan)
+
+        if voiced_mask is None:
+            voiced_mask = rms_voiced_mask(frames)
+        voiced_mask = np.asarray(voiced_mask, dtype=bool)[:len(frames)]
+
+        # 유성 프레임만 계산
+        voiced_idx = np.flatnonzero(voiced_mask)
+        if len(voiced_idx) == 0:
+            return f0
+
+        tau_min = max(2, int(np.floor(sr / self.fmax)))
+        tau_max = min(int(np.ceil(sr / self.fmin)), self.frame_length // 2)
+
+        cmndf = self._cmndf(frames[voiced_idx], tau_max)
+        f0[voiced_idx] = self._pick_f0(cmndf, tau_min, tau_max, sr)
+
+        return f0
+
+    def _cmndf(self, frames, tau_max):
+        """
+        누적 평균 정규화 차분 함수 (CMNDF)
+
+        d(τ) = E(0) + E(τ) - 2·r(τ)
+            r(τ): 자기상관 (FFT)
+            E(τ): 구간 에너지 (누적합)
+        """
+        w = self.frame_length - tau_max - 1  # 적분 구간 길이
+        n_fft = 1 << int(np.ceil(np.log2(self.frame_length + w)))
+
+        # r(τ) = Σ x[j]·x[j+τ]  (j < w)
+        spec_a = np.fft.rfft(frames[:, :w], n=n_fft, axis=1)
+        spec_x = np.fft.rfft(frames, n=n_fft, axis=1)
+        acf = np.fft.irfft(np.conj(spec_a) * spec_x, n=n_fft, axis=1)[:, :tau_max + 2]
+
+        # E(τ) = Σ x[j]² (τ ≤ j < τ+w)
+        energy = np.cumsum(frames ** 2, axis=1)
+        energy = np.concatenate([np.zeros((len(frames), 1)), energy], axis=1)
+        taus = np.arange(tau_max + 2)
+        e_tau = energy[:, taus + w] - energy[:, taus]
+        e_0 = e_tau[:, :1]
+
+        diff = np.maximum(e_0 + e_tau - 2 * acf, 0.0)
+
+        # 누적 평균 정규화
+        cumulative = np.cumsum(diff[:, 1:], axis=1)
+        cmndf = np.ones_like(diff)
+        cmndf[:, 1:] = diff[:, 1:] * taus[1:] / np.maximum(cumulative, 1e-12)
+        return cmndf
+
+    def _pick_f0(self, cmndf, tau_min, tau_max, sr):
+        """임계값 아래 첫 번째 극소점 선택 + 포물선 보간"""
+        search = cmndf[:, tau_min:tau_max + 1]
+        nxt = cmndf[:, tau_min + 1:tau_max + 2]
+
+        # 임계값 아래이면서 다음 값보다 작거나 같은 첫 지점 = 첫 번째 골짜기의 극소점
+        candidates = (search < self.threshold) & (search <= nxt)
+        has_candidate = candidates.any(axis=1)
+        first = np.argmax(candidates, axis=1)
+
+        tau = first + tau_min
+        rows = np.arange(len(cmndf))
+
+        # 포물선 보간 (서브샘플 정밀도)
+        a = cmndf[rows, tau - 1]
+        b = cmndf[rows, tau]
+        c = cmndf[rows, tau + 1]
+        denom = a - 2 * b + c
+        shift = np.where(np.abs(denom) > 1e-12, 0.5 * (a - c) / np.where(denom == 0, 1, denom), 0.0)
+        shift = np.clip(shift, -1.0, 1.0)
+
+        f0 = sr / (tau + shift)
+        f0[~has_candidate] = np.nan
+        f0[(f0 < self.fmin) | (f0 > self.fmax)] = np.nan
+        return f0
+
+
+class PyinPitchEstimator(PitchEstimator):
+    """
+    librosa.pyin 기준 추정기 (정확도 비교용)
+    """
+
+    name = "pyin"
+
+    def estimate(self, y, sr, voiced_mask=None):
+        import librosa
+
+        f0, _, _ = librosa.pyin(
+            np.asarray(y, dtype=np.float32),
+            fmin=self.fmin,
+            fmax=self.fmax,
+            sr=sr,
+            frame_length=self.frame_length,
+            hop_length=self.hop_length
+        )
+
+        if voiced_mask is not None:
+            voiced_mask = np.asarray(voiced_mask, dtype=bool)[:len(f0)]
+            f0 = f0.copy()
+            f0[:len(voiced_mask)][~voiced_mask] = np.nan
+
+        return f0
+
+
+# 백엔드 등록
+PITCH_BACKENDS = {
+    YinPitchEstimator.name: YinPitchEstimator,
+    PyinPitchEstimator.name: PyinPitchEstimator,
+}
+
+
+def get_pitch_estimator(backend=None):
+    """
+    설정(MODELS['pitch_options'])에 맞는 피치 추정기 생성
+
+    Args:
+        backend: 'yin' | 'pyin' (None이면 설정값 사용)
+    """
+    options = dict(MODELS['pitch_options'])
+    backend = backend or options.pop('backend')
+    options.pop('backend', None)
+
+    if backend not in PITCH_BACKENDS:
+        raise ValueError(f"알 수 없는 피치 백엔드: {backend} (가능: {list(PITCH_BACKENDS)})")
+
+    threshold = options.pop('yin_threshold', None)
+    if backend == YinPitchEstimator.name and threshold is not None:
+        options['threshold'] = threshold
+
+    return PITCH_BACKENDS[backend](**options)
+
+
+def rms_voiced_mask(frames, max_ratio=0.5):
+    """
+    프레임 RMS 기반 유성 구간 마스크 (VAD 결과가 없을 때 사용)
+    AudioRecorder와 같은 하이브리드 기준: max(배경 × 2, 최대 × 0.2)
+    (배경 소음 = 프레임 RMS 하위 10%)
+
+    단, 기준은 최대 × max_ratio를 넘지 않음
+    → 침묵 없이 계속 소리가 나는 입력(배경 ≈ 최대)에서 모든 프레임이 빠지지 않게
+    """
+    if len(frames) == 0:
+        return np.zeros(0, dtype=bool)
+
+    rms = frame_rms(frames)
+    peak = rms.max()
+    threshold = min(hybrid_threshold(np.percentile(rms, 10), peak), peak * max_ratio)
+    return (rms >= threshold) & (rms > 0)
+
+
+if __name__ == "__main__":
+    # 합성 신호 확인: 계속 나는 220Hz 톤 / 침묵 + 톤
+    sr = 16000
+    t = np.arange(sr) / sr
+    tone = 0.3 * np.sin(2 * np.pi * 220.0 * t)
+    estimator = get_pitch_estimator()
+
+    f0 = estimator.estimate(tone, sr)
+    print(f"계속 나는 톤: 유성 {np.mean(~np.isnan(f0)) * 100:.0f}%, F0 중앙값 {np.nanmedian(f0):.1f}Hz")
+
+    f0 = estimator.estimate(np.concatenate([np.zeros(sr), tone]), sr)
+    half = len(f0) // 2
+    print(f"침묵 + 톤: 침묵 구간 유성 {np.mean(~np.isnan(f0[:half - 2])) * 100:.0f}%, "
+          f"톤 구간 F0 중앙값 {np.nanmedian(f0[half + 2:]):.1f}Hz")
@@ -0,0 +1,303 @@
+"""
+과거 발화 일괄 재채점 (SCORING_CRITERIA 변경 후)
+
+- tb_voice_log를 voice_id 순서로 청크 단위 조회 (keyset: WHERE voice_id > 마지막 id, OFFSET 없음)
+- 채점 특징:
+    · tb_voice_score.features_json이 있으면 그대로 사용 ('analysis', 분석 당시 값)
+    · 없으면 tb_voice_log + tb_analysis 저장값으로 복원 ('legacy')
+        - 단어 수/WPM: 저장된 텍스트, 발화 길이/반응시간: 저장값
+        - TTR: KcELECTRA 토크나이저로 다시 계산
+        - 침묵/VPR: VAD 도입 전 분석기와 같은 추정식
+        - 감정: 최종 감정 레이블 + 그 감정의 저장 비율을 확신도로 사용
+- 워커 프로세스가 청크를 나눠서 특징 복원 + 벡터화 채점 (ScoringEngine)
+- 결과는 executemany 업서트 (INSERT ... ON DUPLICATE KEY UPDATE) → 청크마다 커밋
+- 커밋할 때마다 체크포인트(JSON) 저장 → 중단 후 다시 실행하면 이어서 진행
+- 기본은 현재 채점 기준으로 채점 안 된 행만 (--all: 전부)
+
+사전 준비: python db_migrate.py (tb_voice_score 생성)
+
+사용법:
+    python rescore_job.py [--all] [--chunk 2000] [--workers 4] [--checkpoint 파일] [--restart] [--dry-run]
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pymysql
+from config.db_config import DB_CONFIG
+from config.models import MODELS
+from config.scoring import ScoringEngine, emotion_stability_score, criteria_version
+
+
+DEFAULT_CHECKPOINT = "./rescore_checkpoint.json"
+
+# tb_analysis 감정 비율 컬럼 (db_handler.save_analysis와 같은 매핑)
+RATIO_COLUMNS = {
+    '기쁨': 'hap_ratio',
+    '슬픔': 'sad_ratio',
+    '중립': 'neu_ratio',
+    '분노': 'ang_ratio',
+    '불안': 'anxi_ratio',
+    '당황': 'emba_ratio',
+    '상처': 'heart_ratio',
+}
+
+SELECT_SQL = f"""
+    SELECT
+        v.voice_id,
+        v.voice_text,
+        v.response_time_sec,
+        v.utterance_length,
+        a.emotion_label,
+        {", ".join(f"a.{col}" for col in RATIO_COLUMNS.values())},
+        s.features_json
+    FROM tb_voice_log v
+    LEFT JOIN tb_analysis a ON a.voice_idx = v.voice_id
+    LEFT JOIN tb_voice_score s ON s.voice_id = v.voice_id
+    WHERE v.voice_id > %s
+      {{stale_filter}}
+    ORDER BY v.voice_id
+    LIMIT %s
+"""
+
+UPSERT_SQL = """
+    INSERT INTO tb_voice_score
+    (voice_id, features_json, feature_source, scores_json,
+     average_score, weighted_score, criteria_version, scored_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, NOW())
+    ON DUPLICATE KEY UPDATE
+        features_json = VALUES(features_json),
+        feature_source = VALUES(feature_source),
+        scores_json = VALUES(scores_json),
+        average_score = VALUES(average_score),
+        weighted_score = VALUES(weighted_score),
+        criteria_version = VALUES(criteria_version),
+        scored_at = VALUES(scored_at)
+"""
+
+
+def connect():
+    return pymysql.connect(
+        host=DB_CONFIG['host'],
+        port=DB_CONFIG['port'],
+        user=DB_CONFIG['user'],
+        password=DB_CONFIG['password'],
+        database=DB_CONFIG['database'],
+        charset=DB_CONFIG['charset'],
+        cursorclass=pymysql.cursors.DictCursor
+    )
+
+
+# ========== 체크포인트 ==========
+
+def load_checkpoint(path, version):
+    """이어서 할 위치 (채점 기준이 바뀌었으면 처음부터)"""
+    if not os.path.exists(path):
+        return {'last_voice_id': 0, 'processed': 0, 'criteria_version': version}
+
+    with open(path, encoding="utf-8") as f:
+        checkpoint = json.load(f)
+
+    if checkpoint.get('criteria_version') != version:
+        print(f"⚠️ 채점 기준이 바뀜 ({checkpoint.get('criteria_version')} → {version}) → 처음부터")
+        return {'last_voice_id': 0, 'processed': 0, 'criteria_version': version}
+    return checkpoint
+
+
+def save_checkpoint(path, checkpoint):
+    """체크포인트 저장 (임시 파일 → 교체, 중간에 죽어도 파일이 깨지지 않음)"""
+    checkpoint['updated_at'] = time.strftime("%Y-%m-%d %H:%M:%S")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+# ========== 워커 (별도 프로세스) ==========
+
+_tokenizer = None
+
+
+def _get_tokenizer():
+    """KcELECTRA 토크나이저 (legacy 행이 있을 때만 워커별 1회 로드)"""
+    global _tokenizer
+    if _tokenizer is None:
+        from transformers import AutoTokenizer
+        _tokenizer = AutoTokenizer.from_pretrained(MODELS['tokenizer'])
+    return _tokenizer
+
+
+def legacy_features(row):
+    """tb_voice_log + tb_analysis 저장값 → 채점 특징 (분석기와 같은 계산식)"""
+    text = (row['voice_text'] or "").strip()
+    duration = float(row['utterance_length'] or 0.0)
+
+    word_count = len(text.split())
+    wpm = (word_count / duration) * 60 if duration > 0 else 0
+
+    tokens = _get_tokenizer().tokenize(text) if text else []
+    ttr = len(set(tokens)) / len(tokens) if tokens else 0.0
+
+    # VAD 도입 전 분석기의 침묵/VPR 추정식 (당시 저장된 점수와 같은 기준)
+    avg_silence = max(0, duration - (word_count * 0.5))
+    vpr = duration / (avg_silence + 0.01) if avg_silence > 0 else duration * 100
+
+    label = row['emotion_label']
+    emotion = None
+    if label:
+        emotion = {'final_emotion': label}
+        ratio = row.get(RATIO_COLUMNS.get(label, ''), None)
+        if ratio is not None:
+            emotion['audio_conf'] = float(ratio)
+
+    return {
+        'wpm': wpm,
+        'duration': duration,
+        'response_time': float(row['response_time_sec'] or 0.0),
+        'word_count': word_count,
+        'ttr': ttr,
+        'avg_silence': avg_silence,
+        'emotion_score': emotion_stability_score(emotion),
+        'vpr': vpr
+    }
+
+
+def score_rows(rows):
+    """
+    행 묶음 → 업서트 파라미터 리스트 (워커 프로세스에서 실행)
+    """
+    features, sources = [], []
+    for row in rows:
+        if row['features_json']:
+            stored = row['features_json']
+            features.append(json.loads(stored) if isinstance(stored, (str, bytes)) else stored)
+            sources.append('analysis')
+        else:
+            features.append(legacy_features(row))
+            sources.append('legacy')
+
+    version = criteria_version()
+    scores_list = ScoringEngine().score_batch(features)
+
+    return [
+        (
+            row['voice_id'],
+            json.dumps(f),
+            source,
+            json.dumps(scores),
+            round(scores['average'], 2),
+            round(scores['weighted_average'], 2),
+            version
+        )
+        for row, f, source, scores in zip(rows, features, sources, scores_list)
+    ]
+
+
+# ========== 메인 작업 ==========
+
+def fetch_chunk(cursor, last_id, chunk_size, stale_only, version):
+    """voice_id > last_id 다음 청크 (keyset 페이지네이션)"""
+    if stale_only:
+        sql = SELECT_SQL.format(
+            stale_filter="AND (s.voice_id IS NULL OR s.criteria_version <> %s)"
+        )
+        cursor.execute(sql, (last_id, version, chunk_size))
+    else:
+        cursor.execute(SELECT_SQL.format(stale_filter=""), (last_id, chunk_size))
+    return cursor.fetchall()
+
+
+def split(rows, parts):
+    """행 리스트를 워커 수만큼 나눔"""
+    size = max(1, -(-len(rows) // parts))
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+
+def run(chunk_size=2000, workers=None, checkpoint_path=DEFAULT_CHECKPOINT,
+        stale_only=True, restart=False, dry_run=False):
+    """
+    재채점 실행
+
+    Returns:
+        처리한 행 수 (이번 실행)
+    """
+    version = criteria_version()
+    workers = workers or os.cpu_count() or 1
+
+    if restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    checkpoint = load_checkpoint(checkpoint_path, version)
+
+    print("="*60)
+    print(f"🔁 재채점 시작 (기준 {version}, 청크 {chunk_size}, 워커 {workers}, "
+          f"{'미채점/구버전만' if stale_only else '전체'}{', dry-run' if dry_run else ''})")
+    print(f"   이어서 시작: voice_id > {checkpoint['last_voice_id']} (누적 {checkpoint['processed']}건)")
+    print("="*60)
+
+    conn = connect()
+    processed = 0
+    started = time.perf_counter()
+
+    try:
+        with conn.cursor() as cursor, ProcessPoolExecutor(max_workers=workers) as executor:
+            rows = fetch_chunk(cursor, checkpoint['last_voice_id'], chunk_size, stale_only, version)
+
+            while rows:
+                # 워커가 채점하는 동안 다음 청크 조회
+                futures = [executor.submit(score_rows, part) for part in split(rows, workers)]
+                last_id = rows[-1]['voice_id']
+                next_rows = fetch_chunk(cursor, last_id, chunk_size, stale_only, version) \
+                    if len(rows) == chunk_size else []
+
+                params = [p for future in futures for p in future.result()]
+                if not dry_run:
+                    cursor.executemany(UPSERT_SQL, params)
+                    conn.commit()
+
+                processed += len(params)
+                checkpoint['last_voice_id'] = last_id
+                checkpoint['processed'] += len(params)
+                if not dry_run:
+                    save_checkpoint(checkpoint_path, checkpoint)
+
+                legacy = sum(1 for p in params if p[2] == 'legacy')
+                rate = processed / max(time.perf_counter() - started, 1e-9)
+                print(f"   ✅ ~{last_id}: {len(params)}건 (legacy {legacy}) | "
+                      f"누적 {checkpoint['processed']}건, {rate:.0f}건/초")
+
+                rows = next_rows
+
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ 재채점 중단: {e}")
+        print(f"   다시 실행하면 voice_id > {checkpoint['last_voice_id']}부터 이어서 진행")
+        raise
+    finally:
+        conn.close()
+
+    print(f"🎉 재채점 완료: {processed}건 ({time.perf_counter() - started:.1f}초)")
+    return processed
+
+
+# ========== 메인 실행 ==========
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="과거 발화 일괄 재채점")
+    parser.add_argument("--all", action="store_true", help="현재 기준으로 채점된 행도 다시 채점")
+    parser.add_argument("--chunk", type=int, default=2000, help="청크 크기 (행)")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="체크포인트 파일")
+    parser.add_argument("--restart", action="store_true", help="체크포인트 무시하고 처음부터")
+    parser.add_argument("--dry-run", action="store_true", help="채점만 하고 DB에 쓰지 않음")
+    args = parser.parse_args()
+
+    run(
+        chunk_size=args.chunk,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        stale_only=not args.all,
+        restart=args.restart,
+        dry_run=args.dry_run
+    )
@@ -0,0 +1,101 @@
+"""
+채점 엔진 동등성/속도 A/B 테스트
+A: 기존 스칼라 채점 (calculate_score 8번 + 단순 평균)
+B: ScoringEngine (NumPy 벡터화, 여러 발화 한 번에)
+
+임의 특징값(경계값, NaN 포함)으로 항목별 점수와 평균이 비트 단위로 같은지 확인
+
+사용법: python scoring_ab_test.py [발화 수]
+"""
+
+import math
+import sys
+import time
+
+import numpy as np
+
+from config.scoring import SCORING_CRITERIA, SCORE_FEATURES, ScoringEngine, calculate_score
+
+
+def scalar_scores(features):
+    """기존 SpeechAnalyzer._calculate_scores() 계산 방식"""
+    criteria = SCORING_CRITERIA
+    scores = {}
+    for name, feature in SCORE_FEATURES.items():
+        if name == 'emotion':
+            scores[name] = features[feature]
+        else:
+            scores[name] = calculate_score(
+                features[feature],
+                criteria[name]['optimal_min'],
+                criteria[name]['optimal_max']
+            )
+    scores['average'] = sum(scores.values()) / len(scores)
+    return scores
+
+
+def random_features(n, seed=0):
+    """임의 특징값 (최적 범위 경계값 + 범위 밖 + NaN 섞어서)"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n):
+        row = {}
+        for name, feature in SCORE_FEATURES.items():
+            c = SCORING_CRITERIA[name]
+            if name == 'emotion':
+                row[feature] = float(rng.uniform(0, 100))
+                continue
+            choices = [c['optimal_min'], c['optimal_max'], float(rng.uniform(0, c['optimal_max'] * 3))]
+            row[feature] = float(choices[rng.integers(len(choices))])
+        if i % 97 == 0:
+            row['vpr'] = float('nan')
+        rows.append(row)
+    return rows
+
+
+def same(a, b):
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+def run_ab_test(n):
+    rows = random_features(n)
+    engine = ScoringEngine()
+
+    start = time.perf_counter()
+    ref = [scalar_scores(row) for row in rows]
+    ref_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    cand = engine.score_batch(rows)
+    cand_ms = (time.perf_counter() - start) * 1000
+
+    # 재채점 작업처럼 특징 행렬을 바로 쓰는 경우 (딕셔너리 변환 제외)
+    X = engine.feature_matrix(rows)
+    start = time.perf_counter()
+    engine.averages(engine.score_matrix(X))
+    matrix_ms = (time.perf_counter() - start) * 1000
+
+    mismatches = [
+        (i, key, r[key], c[key])
+        for i, (r, c) in enumerate(zip(ref, cand))
+        for key in r
+        if not same(r[key], c[key])
+    ]
+
+    print("="*60)
+    print(f"📊 채점 A/B 결과 ({n}개 발화)")
+    print("="*60)
+    print(f"A 스칼라:  {ref_ms:>9.1f}ms")
+    print(f"B 벡터화:  {cand_ms:>9.1f}ms ({ref_ms / max(cand_ms, 1e-9):.1f}x)")
+    print(f"B 행렬만:  {matrix_ms:>9.1f}ms ({ref_ms / max(matrix_ms, 1e-9):.1f}x)")
+    print(f"불일치:    {len(mismatches)}건")
+    for i, key, r, c in mismatches[:10]:
+        print(f"   #{i} {key}: {r!r} != {c!r}")
+    print(f"가중 평균 예시: {cand[0]['weighted_average']:.2f} (단순 평균 {cand[0]['average']:.2f})")
+    return not mismatches
+
+
+# ========== 메인 실행 ==========
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    sys.exit(0 if run_ab_test(count) else 1)
@@ -0,0 +1,336 @@
+"""
+어르신별 센서 상태 캐시 (프로세스 메모리)
+- 어르신마다 최신 sensing_id + 움직임 센서별 최근 28일 일별 횟수(오늘 / 7일 / 4주 그래프용)를 보관
+  (활동량 API는 예전처럼 조회한 움직임 센서 1개의 횟수, 센서를 안 주면 어르신의 모든 움직임 센서 합계)
+- '오늘'은 DB 날짜(CURRENT_DATE, 세션 시간대) 기준 → 예전 CURDATE() 쿼리와 같은 날짜 경계
+  → /latest-sensing(server.py, server_async.py)과 활동량 API(bomi.py)는 메모리에서 바로 응답
+- 캐시에 없는 어르신은 처음 요청할 때 DB에서 1번 재구성 (범위 조회 2번)
+- 새 센싱 행 반영:
+    · 같은 프로세스에서 INSERT한 행 → record_insert()로 바로 반영
+    · 다른 프로세스(kali/motion_daemon.py 등)가 넣은 행 → refresh_sec마다 마지막 sensing_id 이후 새 행만 조회
+      (서버 전체에서 1번, 어르신 수와 상관없음)
+- 동기 커서(pymysql, bomi.py)는 refresh(), 비동기 커서(aiomysql/SQLite, server*.py)는 refresh_async()
+
+사용 예:
+    store = SensorStateStore(**SENSOR_STATE_CONFIG)
+    state = store.refresh(cursor, senior_id)
+    state.latest_sensing_id, state.daily_counts(store.today - timedelta(days=6), 7, sensor_id)
+
+설정: config/serving.py의 SENSOR_STATE_CONFIG
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+
+MAX_SENSING_SQL = "SELECT COALESCE(MAX(sensing_id), 0) FROM tb_sensing"
+
+# DB 기준 오늘 날짜 (MySQL / SQLite 공통 문법)
+TODAY_SQL = "SELECT CURRENT_DATE"
+
+# 마지막으로 반영한 sensing_id 이후 새 행 (기본키 범위 조회)
+SENSING_SINCE_SQL = """
+    SELECT se.sensing_id, d.senior_id, se.sensor_id, s.sensor_type, se.created_at
+    FROM tb_sensing se
+    JOIN tb_sensor s ON se.sensor_id = s.sensor_id
+    JOIN tb_device d ON s.device_id = d.device_id
+    WHERE se.sensing_id > %s
+    ORDER BY se.sensing_id
+    LIMIT %s
+"""
+
+# 재구성: 어르신의 최신 sensing_id (모든 센서)
+SENIOR_LATEST_SQL = """
+    SELECT MAX(se.sensing_id)
+    FROM tb_sensing se
+    JOIN tb_sensor s ON se.sensor_id = s.sensor_id
+    JOIN tb_device d ON s.device_id = d.device_id
+    WHERE d.senior_id = %s AND se.sensing_id <= %s
+"""
+
+# 재구성: 어르신의 움직임 센서별 일별 횟수 (센서마다 (sensor_id, created_at) 범위 → migrations/002 인덱스)
+SENIOR_DAYS_SQL = """
+    SELECT se.sensor_id, DATE(se.created_at) AS day, COUNT(*) AS cnt
+    FROM tb_sensing se
+    JOIN tb_sensor s ON se.sensor_id = s.sensor_id
+    JOIN tb_device d ON s.device_id = d.device_id
+    WHERE d.senior_id = %s AND s.sensor_type = 'motion'
+      AND se.created_at >= %s AND se.sensing_id <= %s
+    GROUP BY se.sensor_id, DATE(se.created_at)
+"""
+
+
+def _values(row):
+    """DictCursor(bomi.py) / 튜플 커서(server*.py) 행 → 튜플"""
+    return tuple(row.values()) if isinstance(row, dict) else tuple(row)
+
+
+def _as_date(value):
+    """DB 날짜/시각 → date (SQLite는 문자열)"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+class SeniorState:
+    """어르신 1명의 센서 상태"""
+
+    def __init__(self, latest_sensing_id=None, day_counts=None):
+        self.latest_sensing_id = latest_sensing_id
+        self.day_counts = day_counts or {}  # 움직임 sensor_id → {date → 감지 횟수}
+
+    def add(self, sensing_id, sensor_id, sensor_type, created_at):
+        if self.latest_sensing_id is None or sensing_id > self.latest_sensing_id:
+            self.latest_sensing_id = sensing_id
+        if sensor_type == 'motion':
+            counts = self.day_counts.setdefault(sensor_id, {})
+            day = _as_date(created_at)
+            counts[day] = counts.get(day, 0) + 1
+
+    def daily_counts(self, start_date, days, sensor_id=None):
+        """
+        start_date부터 days일 동안 일별 횟수 (빈 날은 0)
+
+        Args:
+            sensor_id: 이 움직임 센서의 횟수 (None이면 어르신의 모든 움직임 센서 합계)
+
+        Returns:
+            [1일째 횟수, 2일째 횟수, ...] (오래된 날 → 최신)
+        """
+        if sensor_id is None:
+            sensors = list(self.day_counts.values())
+        else:
+            sensors = [self.day_counts.get(sensor_id, {})]
+        return [
+            sum(counts.get(start_date + timedelta(days=i), 0) for counts in sensors)
+            for i in range(days)
+        ]
+
+    def prune(self, oldest_date):
+        for counts in self.day_counts.values():
+            for day in [d for d in counts if d < oldest_date]:
+                del counts[day]
+
+
+class SensorStateStore:
+    """
+    어르신별 SeniorState 캐시 (스레드 안전, LRU)
+
+    Args:
+        refresh_sec: 새 센싱 행 확인 주기 (이 시간 안의 요청은 DB 조회 없이 응답)
+        window_days: 보관할 일별 횟수 기간 (월간 그래프 28일)
+        max_seniors: 캐시할 최대 어르신 수 (넘으면 가장 오래 안 쓴 어르신부터 제거)
+        fetch_limit: 새 행 조회 1번에 읽을 최대 행 수
+        max_catchup_batches: 한 번에 따라잡을 최대 조회 수 (넘게 밀리면 캐시를 비우고 다시 구성)
+    """
+
+    def __init__(self, refresh_sec=2.0, window_days=28, max_seniors=1000,
+                 fetch_limit=5000, max_catchup_batches=10):
+        self.refresh_sec = refresh_sec
+        self.window_days = window_days
+        self.max_seniors = max_seniors
+        self.fetch_limit = fetch_limit
+        self.max_catchup_batches = max_catchup_batches
+
+        self.high_water_mark = None   # 마지막으로 반영한 sensing_id
+        self.today = None             # DB 기준 오늘 날짜 (새 행 확인할 때마다 갱신)
+        self._seniors = OrderedDict() # senior_id → SeniorState
+        self._recorded = {}           # record_insert로 먼저 반영한 sensing_id → senior_id
+        self._synced_at = 0.0
+        self._pruned_on = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+        self.catchups = 0
+        self.catchup_rows = 0
+        self.resets = 0
+
+    # ========== 조회 (동기 / 비동기) ==========
+
+    def refresh(self, cursor, senior_id):
+        """
+        senior_id의 최신 상태 (동기 커서)
+        - refresh_sec가 지났으면 새 행 반영, 캐시에 없으면 DB에서 재구성
+
+        Returns:
+            SeniorState
+        """
+        if self._is_stale():
+            self._catch_up(cursor)
+        state = self._get(senior_id)
+        if state is None:
+            as_of, start = self.high_water_mark, self._window_start()
+            cursor.execute(SENIOR_LATEST_SQL, (senior_id, as_of))
+            latest = _values(cursor.fetchone())[0]
+            cursor.execute(SENIOR_DAYS_SQL, (senior_id, start, as_of))
+            state = self._install(senior_id, as_of, latest, [_values(r) for r in cursor.fetchall()])
+        return state
+
+    def _catch_up(self, cursor):
+        cursor.execute(TODAY_SQL)
+        self._set_today(_values(cursor.fetchone())[0])
+        if self.high_water_mark is not None:
+            for _ in range(self.max_catchup_batches):
+                since = self.high_water_mark
+                cursor.execute(SENSING_SINCE_SQL, (since, self.fetch_limit))
+                rows = [_values(r) for r in cursor.fetchall()]
+                self._apply(rows)
+                if len(rows) < self.fetch_limit:
+                    self._synced_at = time.monotonic()
+                    return
+        cursor.execute(MAX_SENSING_SQL)
+        self._reset(_values(cursor.fetchone())[0])
+
+    async def refresh_async(self, cursor, senior_id):
+        """refresh()와 같음 (aiomysql / SQLite 비동기 커서)"""
+        if self._is_stale():
+            await self._catch_up_async(cursor)
+        state = self._get(senior_id)
+        if state is None:
+            as_of, start = self.high_water_mark, self._window_start()
+            await cursor.execute(SENIOR_LATEST_SQL, (senior_id, as_of))
+            latest = _values(await cursor.fetchone())[0]
+            await cursor.execute(SENIOR_DAYS_SQL, (senior_id, start, as_of))
+            state = self._install(senior_id, as_of, latest, [_values(r) for r in await cursor.fetchall()])
+        return state
+
+    async def _catch_up_async(self, cursor):
+        await cursor.execute(TODAY_SQL)
+        self._set_today(_values(await cursor.fetchone())[0])
+        if self.high_water_mark is not None:
+            for _ in range(self.max_catchup_batches):
+                since = self.high_water_mark
+                await cursor.execute(SENSING_SINCE_SQL, (since, self.fetch_limit))
+                rows = [_values(r) for r in await cursor.fetchall()]
+                self._apply(rows)
+                if len(rows) < self.fetch_limit:
+                    self._synced_at = time.monotonic()
+                    return
+        await cursor.execute(MAX_SENSING_SQL)
+        self._reset(_values(await cursor.fetchone())[0])
+
+    # ========== 갱신 ==========
+
+    def record_insert(self, senior_id, sensing_id, sensor_id, sensor_type, created_at):
+        """같은 프로세스에서 INSERT한 센싱 행 바로 반영 (다음 새 행 조회에서는 건너뜀)"""
+        with self._lock:
+            if self.high_water_mark is None or sensing_id <= self.high_water_mark:
+                return  # 아직 초기화 전이거나 이미 반영됨
+            state = self._seniors.get(senior_id)
+            if state is not None and sensing_id not in self._recorded:
+                state.add(sensing_id, sensor_id, sensor_type, created_at)
+                self._recorded[sensing_id] = senior_id
+
+    def invalidate(self, senior_id=None):
+        """어르신 1명(또는 전체) 캐시 삭제 → 다음 요청에서 재구성"""
+        with self._lock:
+            if senior_id is None:
+                self._seniors.clear()
+                self._recorded.clear()
+            else:
+                self._forget(senior_id)
+
+    def _apply(self, rows):
+        """새 행 반영 (다른 스레드가 먼저 반영한 행은 건너뜀)"""
+        with self._lock:
+            self.catchups += 1
+            for sensing_id, senior_id, sensor_id, sensor_type, created_at in rows:
+                if sensing_id <= self.high_water_mark:
+                    continue
+                self.high_water_mark = sensing_id
+                self.catchup_rows += 1
+                if self._recorded.pop(sensing_id, None) is not None:
+                    continue
+                state = self._seniors.get(senior_id)
+                if state is not None:
+                    state.add(sensing_id, sensor_id, sensor_type, created_at)
+            self._prune()
+
+    def _reset(self, high_water_mark):
+        """처음 시작 / 너무 밀림 → 캐시를 비우고 현재 최대 sensing_id부터"""
+        with self._lock:
+            if self.high_water_mark is not None:
+                self.resets += 1
+            self.high_water_mark = high_water_mark
+            self._seniors.clear()
+            self._recorded.clear()
+            self._synced_at = time.monotonic()
+
+    def _install(self, senior_id, as_of, latest_sensing_id, day_rows):
+        """
+        재구성 결과 저장
+        조회하는 동안 다른 스레드가 새 행을 반영했으면(as_of가 바뀜) 이번 응답에만 쓰고 캐시하지 않음
+        """
+        day_counts = {}
+        for sensor_id, day, cnt in day_rows:
+            day_counts.setdefault(sensor_id, {})[_as_date(day)] = cnt
+        state = SeniorState(latest_sensing_id, day_counts)
+        with self._lock:
+            self.rebuilds += 1
+            if as_of != self.high_water_mark:
+                return state
+            self._forget(senior_id)
+            self._seniors[senior_id] = state
+            while len(self._seniors) > self.max_seniors:
+                evicted, _ = self._seniors.popitem(last=False)
+                self._forget(evicted)
+        return state
+
+    # ========== 내부 ==========
+
+    def _is_stale(self):
+        return self.high_water_mark is None or time.monotonic() - self._synced_at >= self.refresh_sec
+
+    def _get(self, senior_id):
+        with self._lock:
+            state = self._seniors.get(senior_id)
+            if state is None:
+                self.misses += 1
+                return None
+            self._seniors.move_to_end(senior_id)
+            self.hits += 1
+            return state
+
+    def _forget(self, senior_id):
+        self._seniors.pop(senior_id, None)
+        self._recorded = {sid: owner for sid, owner in self._recorded.items() if owner != senior_id}
+
+    def _set_today(self, value):
+        with self._lock:
+            self.today = _as_date(value)
+
+    def _window_start(self):
+        return self.today - timedelta(days=self.window_days - 1)
+
+    def _prune(self):
+        """DB 날짜가 바뀌면 기간 밖의 일별 횟수 삭제 (하루 1번)"""
+        if self._pruned_on == self.today:
+            return
+        oldest = self._window_start()
+        for state in self._seniors.values():
+            state.prune(oldest)
+        self._pruned_on = self.today
+
+    def stats(self):
+        """캐시 상태 (/health 용)"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'seniors': len(self._seniors),
+                'max_seniors': self.max_seniors,
+                'high_water_mark': self.high_water_mark,
+                'today': self.today.isoformat() if self.today else None,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+                'rebuilds': self.rebuilds,
+                'catchups': self.catchups,
+                'catchup_rows': self.catchup_rows,
+                'resets': self.resets
+            }
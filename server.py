@@ -9,8 +9,12 @@ from typing import Optional
 
 # 로컬 모듈
 from analyzer import SpeechAnalyzer
-from db_handler import VoiceDBHandler
+from async_db_handler import build_async_db_handler
 from llm_handler import LLMHandler
+from model_registry import ModelRegistry
+from cache import build_result_cache
+from config.db_config import ASYNC_DB_CONFIG
+from config.serving import MODEL_REGISTRY_CONFIG, RESULT_CACHE_CONFIG
 
 # ========================================
 # FastAPI 앱 생성
@@ -33,36 +37,37 @@ app.add_middleware(
 # ========================================
 # 전역 변수 (모델 저장용)
 # ========================================
+model_registry = None  # 모델 지연 로딩 (analyzer 모델 + LLM)
 analyzer = None
 db_handler = None
-llm_handler = None
 
 # ========================================
 # 서버 시작 이벤트: 모델 로딩
 # ========================================
 @app.on_event("startup")
 async def startup_event():
-    """서버 시작 시 모델 1회 로드"""
-    global analyzer, db_handler, llm_handler
+    """서버 시작 시 모델 등록 (로딩은 백그라운드 → 서버는 바로 시작)"""
+    global model_registry, analyzer, db_handler
     
     print("="*60)
     print("🚀 서버 시작 중...")
     print("="*60)
     
-    # 1. 음성 분석기 로드 (무거운 작업!)
-    print("\n[1/3] 음성 분석기 로드 중... (2-3분 소요)")
-    try:
-        analyzer = SpeechAnalyzer()
-        print("✅ 음성 분석기 로드 완료!")
-    except Exception as e:
-        print(f"❌ 음성 분석기 로드 실패: {e}")
-        raise e
+    # 1. 음성 분석기 + LLM 등록 (무거운 로딩은 백그라운드에서 + 워밍업)
+    print("\n[1/2] 모델 등록 (백그라운드 로딩)...")
+    model_registry = ModelRegistry(**MODEL_REGISTRY_CONFIG)
+    analyzer = SpeechAnalyzer(
+        registry=model_registry,
+        result_cache=build_result_cache(RESULT_CACHE_CONFIG)
+    )
+    model_registry.register('llm', LLMHandler)
+    model_registry.start()
     
     # 2. DB 핸들러 초기화
-    print("\n[2/3] DB 연결 중...")
+    print("\n[2/2] DB 연결 중...")
     try:
-        db_handler = VoiceDBHandler()
-        if db_handler.connect():
+        db_handler = build_async_db_handler(ASYNC_DB_CONFIG)
+        if await db_handler.connect():
             print("✅ DB 연결 성공!")
         else:
             print("⚠️ DB 연결 실패 - DB 저장 비활성화")
@@ -71,17 +76,8 @@ async def startup_event():
         print(f"⚠️ DB 초기화 실패: {e}")
         db_handler = None
     
-    # 3. LLM 핸들러 초기화
-    print("\n[3/3] LLM 초기화 중...")
-    try:
-        llm_handler = LLMHandler()
-        print("✅ LLM 초기화 완료!")
-    except Exception as e:
-        print(f"⚠️ LLM 초기화 실패: {e}")
-        llm_handler = None
-    
     print("\n" + "="*60)
-    print("✅ 서버 준비 완료!")
+    print("✅ 서버 준비 완료! (모델은 백그라운드 로딩 중 - /health에서 확인)")
     print("="*60)
     print("📡 엔드포인트:")
     print("   POST /analyze - 음성 분석")
@@ -97,7 +93,7 @@ async def shutdown_event():
     print("\n🛑 서버 종료 중...")
     
     if db_handler:
-        db_handler.close()
+        await db_handler.close()
     
     print("✅ 서버 종료 완료")
 
@@ -119,9 +115,15 @@ async def health_check():
     """서버 상태 확인"""
     return {
         "status": "healthy",
-        "analyzer": analyzer is not None,
+        "analyzer": analyzer is not None and analyzer.is_ready(),
+        "models": model_registry.status() if model_registry else {},
+        "stt": analyzer.stt_policy.stats() if analyzer else None,
+        "result_cache": analyzer.result_cache.stats() if analyzer and analyzer.result_cache else None,
+        "text_cache": analyzer.text_cache_stats() if analyzer else None,
         "db": db_handler is not None,
-        "llm": llm_handler is not None,
+        "db_pool": db_handler.stats() if db_handler else None,
+        "sensor_state": db_handler.sensor_state_stats() if db_handler else None,
+        "llm": model_registry is not None and model_registry.is_ready('llm'),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -140,19 +142,10 @@ async def get_latest_sensing(senior_id: int = 1):
         return {"sensing_id": None, "message": "DB 연결 없음"}
     
     try:
-        # tb_sensing에서 최신 데이터 조회
-        cursor = db_handler.cursor
-        sql = """
-            SELECT sensing_id 
-            FROM tb_sensing 
-            ORDER BY created_at DESC 
-            LIMIT 1
-        """
-        cursor.execute(sql)
-        result = cursor.fetchone()
-        
-        if result:
-            sensing_id = result[0]
+        # 어르신별 센서 상태 캐시에서 조회 (새 행만 주기적으로 반영, 캐시에 없으면 DB에서 재구성)
+        sensing_id = await db_handler.latest_sensing(senior_id)
+
+        if sensing_id is not None:
             return {
                 "sensing_id": sensing_id,
                 "message": "최신 센서 데이터"
@@ -192,6 +185,8 @@ async def analyze_audio(
     # 모델 체크
     if not analyzer:
         raise HTTPException(status_code=503, detail="음성 분석기 초기화 안 됨")
+    if not analyzer.is_ready():
+        raise HTTPException(status_code=503, detail="모델 로딩 중입니다. 잠시 후 다시 시도해주세요.")
     
     print(f"\n{'='*60}")
     print(f"🎤 음성 분석 요청")
@@ -243,10 +238,10 @@ async def analyze_audio(
     # 3. AI 응답 생성 (선택)
     # ========================================
     ai_response = None
-    if generate_response and llm_handler:
+    if generate_response and model_registry.is_ready('llm'):
         try:
             print("\n[AI 응답 생성 중...]")
-            ai_response = llm_handler.chat(
+            ai_response = model_registry.get('llm').chat(
                 whisper['text'],
                 emotion_info=emotion,
                 scores=scores
@@ -268,7 +263,7 @@ async def analyze_audio(
             # ====================================
             
             print(f"\n[DB 저장 중... (sensing_id={save_sensing_id})]")
-            voice_id = db_handler.save_analysis(
+            voice_id = await db_handler.save_analysis(
                 senior_id,
                 analysis_result,
                 save_sensing_id
@@ -311,13 +306,16 @@ async def analyze_audio(
                 "word_count": whisper['word_count'],
                 "wpm": whisper['wpm'],
                 "duration": whisper['duration'],
-                "response_time": whisper['response_time']
+                "response_time": whisper['response_time'],
+                "stt_tier": whisper['stt_tier'],  # 사용한 Whisper 크기
+                "stt_reason": whisper['stt_policy']['reason']
             }
         },
         "ai_response": ai_response,
         "metadata": {
             "senior_id": senior_id,
             "sensing_id": save_sensing_id if db_handler else None,
+            "cached": analysis_result.get("cached", False),  # 같은 음성 재전송 → 캐시 결과
             "timestamp": datetime.now().isoformat()
         }
     }
@@ -2,16 +2,23 @@ from fastapi import FastAPI, File, UploadFile, HTTPException, Form, BackgroundTa
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
-import os
-import tempfile
+import asyncio
+import copy
+import hashlib
 from datetime import datetime
 from typing import Optional
 import uuid
 
 # 로컬 모듈
 from analyzer import SpeechAnalyzer
-from db_handler import VoiceDBHandler
+from audio_io import load_audio
+from async_db_handler import build_async_db_handler
 from llm_handler import LLMHandler
+from inference_scheduler import MicroBatchScheduler, QueueFullError
+from model_registry import ModelRegistry
+from cache import build_result_cache
+from config.db_config import ASYNC_DB_CONFIG
+from config.serving import SCHEDULER_CONFIG, MODEL_REGISTRY_CONFIG, RESULT_CACHE_CONFIG
 
 # ========================================
 # FastAPI 앱 생성
@@ -34,9 +41,11 @@ app.add_middleware(
 # ========================================
 # 전역 변수 (모델 저장용)
 # ========================================
+model_registry = None  # 모델 지연 로딩 (analyzer 모델 + LLM)
 analyzer = None
+scheduler = None  # /analyze 마이크로 배치 스케줄러
+pending_analyses = {}  # 캐시 키 → 진행 중인 분석 Task (같은 업로드 재시도는 결과 공유)
 db_handler = None
-llm_handler = None
 
 # ========================================
 # (발표용) 비동기 LLM 결과 저장소
@@ -49,27 +58,32 @@ JOB_STORE = {}
 # ========================================
 @app.on_event("startup")
 async def startup_event():
-    """서버 시작 시 모델 1회 로드"""
-    global analyzer, db_handler, llm_handler
+    """서버 시작 시 모델 등록 (로딩은 백그라운드 → 서버는 바로 시작)"""
+    global model_registry, analyzer, scheduler, db_handler
 
     print("="*60)
     print("🚀 서버 시작 중...")
     print("="*60)
 
-    # 1. 음성 분석기 로드 (무거운 작업!)
-    print("\n[1/3] 음성 분석기 로드 중... (2-3분 소요)")
-    try:
-        analyzer = SpeechAnalyzer()
-        print("✅ 음성 분석기 로드 완료!")
-    except Exception as e:
-        print(f"❌ 음성 분석기 로드 실패: {e}")
-        raise e
+    # 1. 음성 분석기 + LLM 등록 (무거운 로딩은 백그라운드에서 + 워밍업)
+    print("\n[1/2] 모델 등록 (백그라운드 로딩)...")
+    model_registry = ModelRegistry(**MODEL_REGISTRY_CONFIG)
+    analyzer = SpeechAnalyzer(
+        registry=model_registry,
+        result_cache=build_result_cache(RESULT_CACHE_CONFIG)
+    )
+    model_registry.register('llm', LLMHandler)
+    model_registry.start()
+
+    # 동시 요청을 묶어서 워커 스레드에서 배치 추론
+    scheduler = MicroBatchScheduler(run_analysis_batch, **SCHEDULER_CONFIG)
+    await scheduler.start()
 
     # 2. DB 핸들러 초기화
-    print("\n[2/3] DB 연결 중...")
+    print("\n[2/2] DB 연결 중...")
     try:
-        db_handler = VoiceDBHandler()
-        if db_handler.connect():
+        db_handler = build_async_db_handler(ASYNC_DB_CONFIG)
+        if await db_handler.connect():
             print("✅ DB 연결 성공!")
         else:
             print("⚠️ DB 연결 실패 - DB 저장 비활성화")
@@ -78,17 +92,8 @@ async def startup_event():
         print(f"⚠️ DB 초기화 실패: {e}")
         db_handler = None
 
-    # 3. LLM 핸들러 초기화
-    print("\n[3/3] LLM 초기화 중...")
-    try:
-        llm_handler = LLMHandler()
-        print("✅ LLM 초기화 완료!")
-    except Exception as e:
-        print(f"⚠️ LLM 초기화 실패: {e}")
-        llm_handler = None
-
     print("\n" + "="*60)
-    print("✅ 서버 준비 완료!")
+    print("✅ 서버 준비 완료! (모델은 백그라운드 로딩 중 - /health에서 확인)")
     print("="*60)
     print("📡 엔드포인트:")
     print("   POST /analyze - 음성 분석 (즉시응답 + 비동기 LLM)")
@@ -104,28 +109,78 @@ async def shutdown_event():
 
     print("\n🛑 서버 종료 중...")
 
+    if scheduler:
+        await scheduler.stop()
+
     if db_handler:
-        db_handler.close()
+        await db_handler.close()
 
     print("✅ 서버 종료 완료")
 
+# ========================================
+# 분석 배치 실행 함수 (스케줄러 워커)
+# ========================================
+def run_analysis_batch(audios):
+    """스케줄러 워커: 배치 분석 (남은 대기 건수로 STT tier 선택)"""
+    return analyzer.analyze_batch(audios, queue_depth=scheduler.queue_depth)
+
+
 # ========================================
 # 비동기 LLM 실행 함수
 # ========================================
+async def analyze_upload(content: bytes, filename: str):
+    """
+    업로드 분석 (결과 캐시 → 진행 중인 같은 분석 → 스케줄러 순서)
+    캐시 적중 시 디코딩/대기열 없이 바로 반환
+    """
+    cache = analyzer.result_cache
+    key = cache.make_key(hashlib.sha256(content).hexdigest()) if cache else None
+
+    if cache:
+        cached = cache.get(key)
+        if cached is not None:
+            print("⚡ 캐시된 분석 결과 사용 (분석 생략)")
+            cached['cached'] = True
+            return cached
+
+        pending = pending_analyses.get(key)
+        if pending is not None:
+            print("⏳ 같은 음성 분석이 진행 중 → 결과 공유")
+            result = copy.deepcopy(await asyncio.shield(pending))
+            result['cached'] = True
+            return result
+
+    async def run():
+        try:
+            audio = await asyncio.to_thread(load_audio, content, name=filename)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"오디오 디코딩 실패: {str(e)}")
+        print(f"\n[분석 대기열 등록... (대기 {scheduler.queue_depth}건)]")
+        return await scheduler.submit(audio)
+
+    task = asyncio.ensure_future(run())
+    if cache:
+        pending_analyses[key] = task
+        task.add_done_callback(lambda _: pending_analyses.pop(key, None))
+    # 클라이언트가 끊겨도 분석은 끝까지 (재시도가 결과를 받아감)
+    return copy.deepcopy(await asyncio.shield(task))
+
+
+def llm_available():
+    """LLM 사용 가능 여부 (로딩 중이면 True - 작업이 로딩 완료를 기다림)"""
+    if not model_registry:
+        return False
+    status = model_registry.status().get('llm')
+    return bool(status) and status['state'] != ModelRegistry.FAILED
+
 def run_llm_background(job_id: str, text: str, emotion: dict, scores: dict):
     """
     느린 LLM 처리를 백그라운드에서 실행
     - 결과는 JOB_STORE[job_id]에 저장
+    - LLM이 아직 로딩 중이면 준비될 때까지 대기
     """
     try:
-        if not llm_handler:
-            JOB_STORE[job_id] = {
-                "done": True,
-                "reply": None,
-                "error": "llm_handler not initialized",
-                "timestamp": datetime.now().isoformat()
-            }
-            return
+        llm_handler = model_registry.get('llm')
 
         reply = llm_handler.chat(
             text,
@@ -165,9 +220,16 @@ async def health_check():
     """서버 상태 확인"""
     return {
         "status": "healthy",
-        "analyzer": analyzer is not None,
+        "analyzer": analyzer is not None and analyzer.is_ready(),
+        "models": model_registry.status() if model_registry else {},
+        "scheduler": scheduler.stats() if scheduler else None,
+        "stt": analyzer.stt_policy.stats() if analyzer else None,
+        "result_cache": analyzer.result_cache.stats() if analyzer and analyzer.result_cache else None,
+        "text_cache": analyzer.text_cache_stats() if analyzer else None,
         "db": db_handler is not None,
-        "llm": llm_handler is not None,
+        "db_pool": db_handler.stats() if db_handler else None,
+        "sensor_state": db_handler.sensor_state_stats() if db_handler else None,
+        "llm": model_registry is not None and model_registry.is_ready('llm'),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -180,18 +242,10 @@ async def get_latest_sensing(senior_id: int = 1):
         return {"sensing_id": None, "message": "DB 연결 없음"}
 
     try:
-        cursor = db_handler.cursor
-        sql = """
-            SELECT sensing_id 
-            FROM tb_sensing 
-            ORDER BY created_at DESC 
-            LIMIT 1
-        """
-        cursor.execute(sql)
-        result = cursor.fetchone()
-
-        if result:
-            sensing_id = result[0]
+        # 어르신별 센서 상태 캐시에서 조회 (새 행만 주기적으로 반영, 캐시에 없으면 DB에서 재구성)
+        sensing_id = await db_handler.latest_sensing(senior_id)
+
+        if sensing_id is not None:
             return {
                 "sensing_id": sensing_id,
                 "message": "최신 센서 데이터"
@@ -225,8 +279,10 @@ async def analyze_audio(
     """
 
     # 모델 체크
-    if not analyzer:
+    if not analyzer or not scheduler:
         raise HTTPException(status_code=503, detail="음성 분석기 초기화 안 됨")
+    if not analyzer.is_ready():
+        raise HTTPException(status_code=503, detail="모델 로딩 중입니다. 잠시 후 다시 시도해주세요.")
 
     print(f"\n{'='*60}")
     print(f"🎤 음성 분석 요청")
@@ -235,26 +291,23 @@ async def analyze_audio(
     print(f"센싱 ID: {sensing_id}")
 
     # ========================================
-    # 1. 음성 파일 저장
+    # 1. 음성 파일 수신 (임시 파일 없이 메모리에서 바로 디코딩)
     # ========================================
     try:
-        suffix = os.path.splitext(audio_file.filename)[1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-            content = await audio_file.read()
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
+        content = await audio_file.read()
+        if not content:
+            raise ValueError("빈 파일")
 
-        print(f"✅ 음성 파일 저장: {tmp_path}")
+        print(f"✅ 음성 파일 수신: {audio_file.filename} ({len(content)} bytes)")
 
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"파일 저장 실패: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"파일 수신 실패: {str(e)}")
 
     # ========================================
-    # 2. 음성 분석
+    # 2. 음성 분석 (디코딩/추론 모두 이벤트 루프 밖에서 실행, 같은 음성은 캐시)
     # ========================================
     try:
-        print("\n[분석 중...]")
-        analysis_result = analyzer.analyze(tmp_path)
+        analysis_result = await analyze_upload(content, audio_file.filename)
 
         whisper = analysis_result['features']['whisper']
         emotion = analysis_result['features']['emotion']
@@ -265,11 +318,12 @@ async def analyze_audio(
         print(f"   감정: {emotion['final_emotion']} ({emotion['final_conf']:.3f})")
         print(f"   종합 점수: {scores['average']:.1f}점")
 
+    except HTTPException:
+        raise
+    except QueueFullError as e:
+        print(f"⚠️ {e}")
+        raise HTTPException(status_code=503, detail="분석 요청이 많습니다. 잠시 후 다시 시도해주세요.")
     except Exception as e:
-        try:
-            os.remove(tmp_path)
-        except:
-            pass
         raise HTTPException(status_code=500, detail=f"분석 실패: {str(e)}")
 
     # ========================================
@@ -278,7 +332,7 @@ async def analyze_audio(
     job_id = None
     ai_response = None
 
-    if generate_response and llm_handler:
+    if generate_response and llm_available():
         job_id = str(uuid.uuid4())
 
         # ✅ 즉시응답(짧은 멘트): TTS로 바로 읽기 좋게
@@ -312,7 +366,7 @@ async def analyze_audio(
     if db_handler:
         try:
             print(f"\n[DB 저장 중... (sensing_id={save_sensing_id})]")
-            voice_id = db_handler.save_analysis(
+            voice_id = await db_handler.save_analysis(
                 senior_id,
                 analysis_result,
                 save_sensing_id
@@ -327,15 +381,7 @@ async def analyze_audio(
             print(f"❌ DB 저장 에러: {e}")
 
     # ========================================
-    # 5. 임시 파일 삭제
-    # ========================================
-    try:
-        os.remove(tmp_path)
-    except:
-        pass
-
-    # ========================================
-    # 6. 결과 반환
+    # 5. 결과 반환
     # ========================================
     return {
         "success": True,
@@ -356,13 +402,16 @@ async def analyze_audio(
                 "word_count": whisper['word_count'],
                 "wpm": whisper['wpm'],
                 "duration": whisper['duration'],
-                "response_time": whisper['response_time']
+                "response_time": whisper['response_time'],
+                "stt_tier": whisper['stt_tier'],  # 사용한 Whisper 크기
+                "stt_reason": whisper['stt_policy']['reason']
             }
         },
         "ai_response": ai_response,  # ✅ 즉시 1차 멘트
         "metadata": {
             "senior_id": senior_id,
             "sensing_id": save_sensing_id if db_handler else None,
+            "cached": analysis_result.get("cached", False),  # 같은 음성 재전송 → 캐시 결과
             "timestamp": datetime.now().isoformat()
         }
     }
@@ -165,8 +165,7 @@ document.addEventListener('DOMContentLoaded', async function () {
     // 👇 [추가] 알림 설정 불러오기
     initNotificationSettings();
 
-    // 👇 [추가] 실시간 알림 감시 시작
-    startAlertPolling();
+    // (실시간 알림 감시는 아래 startAlertStream()에서 시작 → 여기서 폴링을 따로 돌리지 않음)
 
     const username = sessionStorage.getItem('username') || localStorage.getItem('username');
     
@@ -535,6 +534,8 @@ function handleLogin(event) {
                     // 대시보드 데이터 갱신
                     updateDashboard();
                     updateMyPage();
+                    // 이 보호자의 알림 스트림으로 다시 연결
+                    startAlertStream();
                 }, 500);
             }
         })
@@ -554,6 +555,11 @@ function handleLogout() {
 
     // 👇 [추가] 브라우저에 저장된 로그인 정보 삭제
     localStorage.removeItem('neulbom_user');
+    sessionStorage.removeItem('username');
+    localStorage.removeItem('username');
+
+    // 이전 보호자의 알림을 더 받지 않도록 스트림 닫기
+    stopAlertStream();
 
     showToast('info', '로그아웃', '안전하게 로그아웃되었습니다.');
 
@@ -1643,10 +1649,11 @@ function updateDashboard() {
  * [최종 수정] 알림 불러오기 (읽음 상태 인식 오류 수정)
  */
 function loadRecentAlerts() {
+    const username = sessionStorage.getItem('username') || localStorage.getItem('username');
     fetch('/api/alert-list', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({})
+        body: JSON.stringify({ username: username })  // 이 보호자의 알림만
     })
     .then(res => res.json())
     .then(data => {
@@ -3059,9 +3066,11 @@ function updateNotificationBadge() {
  */
 function openNotificationModal() {
     // 1. 서버에 '모두 읽음' 요청 전송 (DB 저장 -> 새로고침 해도 유지됨!)
+    const username = sessionStorage.getItem('username') || localStorage.getItem('username');
     fetch('/api/alert-read-all', {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' }
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ username: username })  // 이 보호자의 알림만 읽음 처리
     })
         .then(res => res.json())
         .then(data => {
@@ -3280,10 +3289,12 @@ function loadUserData() {
 
 
 /* ========================================
- * 20. 실시간 알림 폴링 시스템 (최종 수정)
+ * 20. 실시간 알림 스트림 시스템 (SSE, 미지원 브라우저는 폴링)
  * ======================================== */
 
 let lastProcessedAlertId = null;
+let alertStreamSource = null;   // 지금 열려 있는 알림 스트림 (로그인한 보호자 것)
+let alertPollingTimer = null;   // EventSource 미지원 브라우저의 폴링 타이머
 
 document.addEventListener('DOMContentLoaded', function () {
     console.log("📡 실시간 알림 감시 시작...");
@@ -3292,12 +3303,63 @@ document.addEventListener('DOMContentLoaded', function () {
     // alertHistory = []; 
     // updateAllUI();
 
-    startAlertPolling();
+    startAlertStream();
 });
 
+/**
+ * 서버 푸시(SSE)로 새 알림 받기
+ * - 서버의 알림 분배기가 새 알림이 생겼을 때만 이 보호자의 알림을 보내줌 (3초 폴링 제거)
+ * - 연결이 끊기면 브라우저가 자동 재연결 (Last-Event-ID로 놓친 알림도 받음)
+ * - EventSource를 지원하지 않는 브라우저는 기존 폴링 사용
+ * - 로그인 / 로그아웃 때마다 다시 호출 → 항상 지금 로그인한 보호자의 알림만 받음 (로그인 전에는 받지 않음)
+ */
+function startAlertStream() {
+    stopAlertStream();
+
+    const username = sessionStorage.getItem('username') || localStorage.getItem('username');
+    if (!username) return;
+
+    if (!window.EventSource) {
+        startAlertPolling();
+        return;
+    }
+
+    const source = new EventSource(`/api/alert-stream?username=${encodeURIComponent(username)}`);
+    alertStreamSource = source;
+
+    source.onmessage = (event) => {
+        const data = JSON.parse(event.data);
+        // 재연결 직후 같은 알림이 다시 올 수 있음 → handleNewAlert에서 ID로 중복 제거
+        if (data && data.alert_id !== lastProcessedAlertId) {
+            handleNewAlert(data);
+        }
+    };
+    source.onerror = () => console.warn('알림 스트림 연결 끊김 (자동 재연결 중)');
+}
+
+/**
+ * 알림 스트림(또는 폴링) 닫기 (로그아웃 / 다른 계정으로 다시 열기 전)
+ */
+function stopAlertStream() {
+    if (alertStreamSource) {
+        alertStreamSource.close();
+        alertStreamSource = null;
+    }
+    if (alertPollingTimer) {
+        clearInterval(alertPollingTimer);
+        alertPollingTimer = null;
+    }
+    lastProcessedAlertId = null;
+}
+
 function startAlertPolling() {
-    setInterval(() => {
-        fetch('/api/check-alert')
+    alertPollingTimer = setInterval(() => {
+        // 매번 지금 로그인한 보호자로 조회 (로그아웃 상태면 조회하지 않음)
+        const username = sessionStorage.getItem('username') || localStorage.getItem('username');
+        if (!username) return;
+        const params = new URLSearchParams({ username });
+        if (lastProcessedAlertId !== null) params.set('since_alert_id', lastProcessedAlertId);
+        fetch(`/api/check-alert?${params}`)
             .then(response => response.json())
             .then(data => {
                 // 데이터가 있고, 새로운 ID일 때만 처리
@@ -0,0 +1,299 @@
+"""
+스트리밍 음성 분석 (말하는 동안 미리 분석)
+- AudioRecorder가 녹음한 청크를 바로 받아서 처리 (on_chunk 콜백)
+- 청크 RMS로 발화/침묵 판정 → 짧은 침묵마다 끝난 구간(phrase)을 확정
+- 확정된 구간은 곧바로 Whisper 인식 + 피치(F0) 추출
+- wav2vec2 감정 윈도우(10초)도 채워지는 대로 미리 추론
+- 발화가 끝나면 남은 마지막 구간만 처리 → 최종 결과까지 짧은 지연
+
+사용 예:
+    session = StreamingSession(analyzer)
+    recorder.record_until_silence(on_chunk=session.feed)
+    result = session.finish()   # analyzer.analyze()와 같은 구조
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from config.models import MODELS
+from audio_io import AudioData, load_audio
+from vad import calculate_rms, hybrid_threshold, detect_voice_activity
+
+
+class StreamingSession:
+    """발화 1회(대화 1턴) 스트리밍 분석 세션"""
+
+    def __init__(self, analyzer, sample_rate=16000, name=None):
+        """
+        Args:
+            analyzer: SpeechAnalyzer (모델 공유)
+            sample_rate: 녹음 샘플링 레이트 (분석 모델과 같은 16kHz)
+            name: 로그용 이름
+        """
+        self.analyzer = analyzer
+        self.engine = analyzer.emotion_engine
+        self.sample_rate = sample_rate
+        self.name = name
+
+        options = MODELS['streaming_options']
+        self.commit_silence = int(options['commit_silence_sec'] * sample_rate)
+        self.max_phrase = int(options['max_phrase_sec'] * sample_rate)
+        self.pad = int(MODELS['vad_options']['pad_sec'] * sample_rate)
+        self.min_phrase = int(MODELS['vad_options']['min_speech_sec'] * sample_rate)
+        self.window = int(MODELS['emotion_audio_options']['window_sec'] * sample_rate)
+        self.hop = int(MODELS['emotion_audio_options']['hop_sec'] * sample_rate)
+        self.max_len = int(MODELS['emotion_audio_options']['max_sec'] * sample_rate)
+
+        # Whisper tier는 세션 시작 때 1번 선택 (구간 최대 길이 기준, 세션 내 구간은 같은 tier)
+        self.stt_decision = analyzer.select_stt_tier(options['max_phrase_sec'])
+
+        # 누적 PCM (float32, 필요할 때 2배씩 확장)
+        self._pcm = np.zeros(sample_rate * 30, dtype=np.float32)
+        self._n = 0
+
+        # 청크 단위 발화 판정 상태
+        self._rms_history = []
+        self._max_rms = 0.0
+        self._phrase_start = None     # 진행 중인 구간 시작 (샘플)
+        self._last_voice_end = 0      # 마지막 발화 청크 끝 (샘플)
+        self._committed_end = 0       # 확정된 구간 끝 (샘플)
+
+        # 구간별 결과 (시작 샘플 순서)
+        self._phrase_futures = []     # Whisper 인식 Future
+        self._f0_parts = []           # 구간별 F0 배열
+        self._window_futures = {}     # 윈도우 시작 샘플 → wav2vec2 Future
+        self._next_window = 0
+
+        # 모델 추론은 한 스레드에서 순서대로 (GPU 공유), 청크 처리는 별도 스레드
+        self._model_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-model")
+        self._chunks = queue.Queue()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    # ========== 입력 ==========
+
+    def feed(self, chunk):
+        """
+        녹음 청크 추가 (녹음 루프를 막지 않도록 큐에 넣기만 함)
+
+        Args:
+            chunk: int16 PCM 바이트 (마이크 청크)
+        """
+        self._chunks.put(chunk)
+
+    def _run(self):
+        """청크 처리 스레드"""
+        while True:
+            chunk = self._chunks.get()
+            if chunk is None or self._closed:
+                break
+            try:
+                self._process_chunk(chunk)
+            except Exception as e:
+                print(f"⚠️ 스트리밍 청크 처리 오류: {e}")
+
+        # 녹음 종료: 진행 중인 구간 확정 (close()로 중단했으면 생략)
+        if self._closed:
+            return
+        if self._phrase_start is not None:
+            self._commit_phrase(self._phrase_start, self._n)
+        self._submit_windows(final=False)
+
+    def _append(self, pcm):
+        """누적 버퍼에 추가"""
+        if self._n + len(pcm) > len(self._pcm):
+            grown = np.zeros(max(len(self._pcm) * 2, self._n + len(pcm)), dtype=np.float32)
+            grown[:self._n] = self._pcm[:self._n]
+            self._pcm = grown
+        self._pcm[self._n:self._n + len(pcm)] = pcm
+        self._n += len(pcm)
+
+    def _process_chunk(self, chunk):
+        """청크 1개: 버퍼 추가 → 발화 판정 → 구간 확정 / 감정 윈도우 추론"""
+        samples = np.frombuffer(chunk, dtype=np.int16)
+        start = self._n
+        self._append(samples.astype(np.float32) / 32768.0)
+
+        # 발화 판정 (AudioRecorder와 같은 하이브리드 기준)
+        rms = calculate_rms(samples)
+        self._rms_history.append(rms)
+        self._max_rms = max(self._max_rms, rms)
+        threshold = hybrid_threshold(np.percentile(self._rms_history, 10), self._max_rms)
+        is_voice = rms >= threshold and rms > 0
+
+        if is_voice:
+            if self._phrase_start is None:
+                self._phrase_start = start
+            self._last_voice_end = self._n
+
+            # 너무 긴 구간은 Whisper 윈도우(30초) 안에서 끊음
+            if self._n - self._phrase_start >= self.max_phrase:
+                self._commit_phrase(self._phrase_start, self._n)
+                self._phrase_start = self._n
+
+        elif self._phrase_start is not None and self._n - self._last_voice_end >= self.commit_silence:
+            # 짧은 침묵 → 구간 확정
+            self._commit_phrase(self._phrase_start, self._last_voice_end)
+            self._phrase_start = None
+
+        self._submit_windows(final=False)
+
+    # ========== 구간 / 윈도우 처리 ==========
+
+    def _commit_phrase(self, start, end):
+        """확정된 구간을 Whisper에 보내고 F0 추출"""
+        if end - start < self.min_phrase:
+            return  # 짧은 잡음
+
+        s = max(self._committed_end, start - self.pad)
+        e = min(self._n, end + self.pad)
+        self._committed_end = e
+        if e <= s:
+            return
+
+        pcm = self._pcm[s:e].copy()
+        print(f"   🧩 구간 확정: {s / self.sample_rate:.2f}~{e / self.sample_rate:.2f}초")
+
+        self._phrase_futures.append(
+            (s, self._model_executor.submit(self._transcribe_phrase, pcm))
+        )
+
+        try:
+            self._f0_parts.append(self.engine.pitch_estimator.estimate(pcm, self.sample_rate))
+        except Exception as e:
+            print(f"⚠️ 구간 피치 추출 오류: {e}")
+
+    def _transcribe_phrase(self, pcm):
+        """구간 1개 Whisper 인식 (타임스탬프는 구간 기준)"""
+        audio = AudioData(pcm, self.sample_rate, "", self.name)
+        return self.analyzer.transcribe_batch([audio], tier=self.stt_decision['tier'])[0]
+
+    def _submit_windows(self, final):
+        """
+        채워진 10초 감정 윈도우를 미리 추론
+        final=True면 EmotionEnsemble.window_starts()와 같은 윈도우 구성을 완성
+        """
+        n = min(self._n, self.max_len)
+
+        if final:
+            starts = self.engine.window_starts(n, self.sample_rate) if n > self.window else []
+        else:
+            starts = []
+            while self._next_window + self.window <= n:
+                starts.append(self._next_window)
+                self._next_window += self.hop
+
+        for s in starts:
+            if s not in self._window_futures:
+                window = self._pcm[s:s + self.window].copy()
+                self._window_futures[s] = self._model_executor.submit(
+                    self.engine.window_probs, [window], self.sample_rate
+                )
+
+    # ========== 최종 결과 ==========
+
+    def finish(self):
+        """
+        녹음 종료 후 최종 분석 결과
+
+        Returns:
+            analyzer.analyze()와 같은 구조의 결과 딕셔너리
+        """
+        self._chunks.put(None)
+        self._worker.join()
+
+        t_start = time.perf_counter()
+        try:
+            audio = load_audio(self._pcm[:self._n].copy(), sr=self.sample_rate, name=self.name)
+            print("="*60)
+            print(f"🎤 스트리밍 분석 마무리: {audio}")
+            print("="*60)
+
+            # 1. VAD (전체 1회, 침묵/반응시간/VPR)
+            vad = detect_voice_activity(audio)
+            print(f"   🔈 {vad}")
+
+            # 2. 남은 감정 윈도우 제출 → 구간별 Whisper 결과 수집
+            self._submit_windows(final=True)
+            transcription = self._collect_transcription()
+
+            print("\n[1/3] 📝 Whisper (구간별 인식 결과 합침)")
+            whisper_results = self.analyzer.whisper_metrics(audio, transcription, vad)
+            whisper_results['stt_policy'] = self.stt_decision
+
+            print("\n[2/3] 📚 어휘력 분석 중...")
+            vocab_results = self.analyzer.vocabulary_analysis(whisper_results['text'])
+
+            print("\n[3/3] ❤️ 감정 통합 (미리 계산한 윈도우/피치 사용)")
+            emotion_results = self._emotion_result(audio, whisper_results['text'])
+            print(f"      👉 최종 감정: {emotion_results['final_emotion']}")
+
+            scores = self.analyzer.calculate_scores(whisper_results, vocab_results, emotion_results)
+            self.analyzer.print_scores(scores)
+
+            print(f"   ⚡ 발화 종료 후 추가 지연: {(time.perf_counter() - t_start) * 1000:.0f}ms")
+
+            return {
+                'features': {
+                    'whisper': whisper_results,
+                    'vocabulary': vocab_results,
+                    'emotion': emotion_results
+                },
+                'scores': scores
+            }
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        세션 정리 (청크 스레드 종료 + 남은 모델 작업 취소)
+        finish()가 마지막에 호출, 녹음이 실패/중단되면 finish() 대신 호출 (여러 번 호출해도 됨)
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._chunks.put(None)
+        self._worker.join()
+        self._model_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _collect_transcription(self):
+        """구간별 인식 결과 → 전체 텍스트 + 원본 시간 기준 단어 타임스탬프"""
+        texts = []
+        words = []
+        for start, future in self._phrase_futures:
+            result = future.result()
+            if result['text']:
+                texts.append(result['text'])
+            offset = start / self.sample_rate
+            words.extend(
+                {'word': w['word'], 'start': w['start'] + offset, 'end': w['end'] + offset}
+                for w in result['words']
+            )
+
+        return {
+            'text': " ".join(texts),
+            'words': words,
+            'segments': self.analyzer.group_segments(words),
+            'stt_tier': self.stt_decision['tier']
+        }
+
+    def _emotion_result(self, audio, text):
+        """텍스트 감정(지금 계산) + 음성 감정 윈도우/피치(미리 계산) → 통합"""
+        f0 = np.concatenate(self._f0_parts) if self._f0_parts else np.zeros(0)
+        return self.engine.predict_precomputed(audio, text, f0, self._window_outputs())
+
+    def _window_outputs(self):
+        """미리 추론한 윈도우 (확률, mask) 리스트 (10초 이하 발화는 None → 지금 1회 추론)"""
+        if not self._window_futures or self._n <= self.window:
+            return None
+        starts = self.engine.window_starts(min(self._n, self.max_len), self.sample_rate)
+        outputs = []
+        for s in starts:
+            window_probs, window_masks = self._window_futures[s].result()
+            outputs.append((window_probs[0], window_masks[0]))
+        return outputs
@@ -0,0 +1,120 @@
+"""
+STT 모델 크기(tier) 선택 정책
+- Whisper tiny / base / small / medium을 함께 로드해두고 요청마다 하나 선택
+- 예상 완료 시간 = 오버헤드 + (앞선 대기 건수 + 1) × 음성 길이 × 실시간 계수(RTF)
+- 지연 목표(SLO) 안에 끝나는 가장 큰(정확한) tier 선택
+- 대기열이 밀리면 작은 tier로 내려감 (tier별 최대 대기 건수)
+- RTF는 초기 추정값에서 시작해서 실제 처리 시간으로 계속 갱신 (이동 평균)
+
+설정: config/models.py의 MODELS['stt_tiers'], MODELS['stt_policy']
+"""
+
+import threading
+
+from config.models import MODELS
+
+
+# 작은 것 → 큰 것 (정확도 순서)
+TIER_ORDER = ('tiny', 'base', 'small', 'medium')
+
+
+class STTTierPolicy:
+    """요청별 Whisper tier 선택"""
+
+    def __init__(self, options=None):
+        """
+        Args:
+            options: MODELS['stt_policy'] 형식 (None이면 설정값)
+        """
+        opts = dict(MODELS['stt_policy'])
+        opts.update(options or {})
+
+        unknown = [t for t in opts['enabled_tiers'] if t not in MODELS['stt_tiers']]
+        if unknown:
+            raise ValueError(f"알 수 없는 STT tier: {unknown} (가능: {list(MODELS['stt_tiers'])})")
+
+        self.tiers = [t for t in TIER_ORDER if t in opts['enabled_tiers']]
+        self.default_tier = opts['default_tier']
+        if self.default_tier not in self.tiers:
+            raise ValueError(f"default_tier({self.default_tier})가 enabled_tiers에 없습니다")
+
+        self.latency_slo_ms = opts['latency_slo_ms']
+        self.overhead_ms = opts['overhead_ms']
+        self.max_queue_depth = opts['max_queue_depth']
+        self.rtf_ema = opts['rtf_ema']
+        self.rtf = dict(opts['rtf'])
+
+        self._lock = threading.Lock()
+        self._counts = {t: 0 for t in self.tiers}
+
+    def estimate_ms(self, tier, duration, queue_depth=0):
+        """tier로 처리했을 때 예상 완료 시간 (ms)"""
+        return self.overhead_ms + (queue_depth + 1) * duration * self.rtf[tier] * 1000
+
+    def choose(self, duration, queue_depth=0, ready_tiers=None):
+        """
+        tier 선택
+
+        Args:
+            duration: 음성 길이 (초)
+            queue_depth: 이 요청보다 먼저 처리될 대기 건수
+            ready_tiers: 로딩 완료된 tier (None이면 전부)
+
+        Returns:
+            {'tier', 'reason', 'estimate_ms', 'queue_depth'}
+            reason: 'default' (기본 tier) | 'slo' (지연 목표 때문에 낮춤)
+                    | 'queue' (대기열 때문에 낮춤) | 'fallback' (목표 못 맞춤 → 가장 작은 tier)
+                    | 'loading' (큰 tier 로딩 중)
+        """
+        ready = [t for t in self.tiers if ready_tiers is None or t in ready_tiers]
+        if not ready:
+            ready = [self.default_tier]  # 아무것도 준비 안 됨 → 기본 tier 로딩 대기
+
+        # 기본 tier보다 큰 것은 쓰지 않음 (큰 것부터 검사)
+        candidates = [t for t in ready if TIER_ORDER.index(t) <= TIER_ORDER.index(self.default_tier)]
+        candidates = candidates[::-1] or ready[:1]
+
+        reason = 'default' if candidates[0] == self.default_tier else 'loading'
+        chosen = None
+        for tier in candidates:
+            if queue_depth > self.max_queue_depth.get(tier, float('inf')):
+                reason = 'queue'
+                continue
+            if self.estimate_ms(tier, duration, queue_depth) > self.latency_slo_ms:
+                if reason != 'queue':
+                    reason = 'slo'
+                continue
+            chosen = tier
+            break
+
+        if chosen is None:
+            chosen = candidates[-1]
+            reason = 'fallback'
+
+        with self._lock:
+            self._counts[chosen] = self._counts.get(chosen, 0) + 1
+
+        return {
+            'tier': chosen,
+            'reason': reason,
+            'estimate_ms': round(self.estimate_ms(chosen, duration, queue_depth), 1),
+            'queue_depth': queue_depth
+        }
+
+    def observe(self, tier, audio_sec, elapsed_ms):
+        """실제 처리 시간으로 tier의 RTF 갱신"""
+        if audio_sec <= 0 or tier not in self.rtf:
+            return
+        measured = (elapsed_ms / 1000) / audio_sec
+        with self._lock:
+            self.rtf[tier] = (1 - self.rtf_ema) * self.rtf[tier] + self.rtf_ema * measured
+
+    def stats(self):
+        """tier별 선택 횟수 + 현재 RTF (/health 용)"""
+        with self._lock:
+            return {
+                'default_tier': self.default_tier,
+                'latency_slo_ms': self.latency_slo_ms,
+                'counts': dict(self._counts),
+                'rtf': {t: round(self.rtf[t], 3) for t in self.tiers}
+            }
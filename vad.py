@@ -0,0 +1,280 @@
+"""
+음성 구간 검출 (VAD: Voice Activity Detection)
+- 프레임 에너지(RMS) + 영교차율(ZCR)을 NumPy로 한 번에 계산 (파형 1회 순회)
+- AudioRecorder와 같은 하이브리드 기준: max(배경 × 2, 최대 × 0.2)
+- 발화 구간, 첫 발화까지 침묵(반응시간), 침묵 분포, 실제 VPR
+- Whisper/피치 분석이 유성 구간만 처리하도록 구간 정보 제공
+"""
+
+import numpy as np
+
+from config.models import MODELS
+
+
+# ========== 공용 RMS 함수 (AudioRecorder, 피치 추정기와 공유) ==========
+
+def calculate_rms(samples):
+    """
+    RMS (Root Mean Square) 계산
+
+    Args:
+        samples: int16 PCM 바이트 (마이크 청크) 또는 numpy 배열
+
+    Returns:
+        rms: RMS 값 (빈 입력/NaN이면 0.0)
+    """
+    if isinstance(samples, (bytes, bytearray, memoryview)):
+        samples = np.frombuffer(samples, dtype=np.int16)
+
+    if len(samples) == 0:
+        return 0.0
+
+    rms = float(np.sqrt(np.mean(np.asarray(samples, dtype=np.float64) ** 2)))
+    return rms if np.isfinite(rms) else 0.0
+
+
+def frame_rms(frames):
+    """프레임별 RMS (벡터화)"""
+    return np.sqrt(np.mean(frames ** 2, axis=1))
+
+
+def frame_zcr(frames):
+    """프레임별 영교차율 (샘플당 부호 변화 비율)"""
+    signs = np.signbit(frames)
+    return np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+
+def hybrid_threshold(background_rms, max_rms):
+    """침묵 기준: 배경의 2배 vs 최대값의 20% 중 더 높은 값"""
+    return max(background_rms * 2.0, max_rms * 0.2)
+
+
+def frame_signal(y, frame_length, hop_length):
+    """
+    신호를 프레임 행렬로 변환 (복사 없는 strided view)
+    librosa와 같이 양쪽에 frame_length // 2 만큼 0 패딩 (center=True)
+    → i번째 프레임 중심 = i * hop_length 샘플
+    """
+    pad = frame_length // 2
+    y = np.pad(y, (pad, pad), "constant")
+    n_frames = 1 + (len(y) - frame_length) // hop_length
+    if n_frames <= 0:
+        return np.zeros((0, frame_length))
+
+    return np.lib.stride_tricks.as_strided(
+        y,
+        shape=(n_frames, frame_length),
+        strides=(y.strides[0] * hop_length, y.strides[0])
+    )
+
+
+def _runs(mask):
+    """True 구간의 (시작, 끝) 프레임 인덱스 배열 (끝은 미포함)"""
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], mask.astype(np.int8), [0]])))
+    return edges[0::2], edges[1::2]
+
+
+# ========== VAD 결과 ==========
+
+class VADResult:
+    """
+    음성 구간 검출 결과
+
+    Attributes:
+        segments: 발화 구간 [(시작초, 끝초), ...]
+        speech_time: 총 발화 시간 (초)
+        leading_silence: 첫 발화까지 침묵 (초) = 반응시간
+        trailing_silence: 마지막 발화 이후 침묵 (초)
+        pauses: 발화 사이 침묵 길이 배열 (초)
+        avg_silence: 평균 침묵 길이 (초)
+        vpr: 발화시간 / 침묵시간 (Vocalization-to-Pause Ratio)
+             발화 사이 침묵이 없으면 no_pause_vpr (중립값), 발화가 없으면 0
+        pause_histogram: 침묵 길이 분포 {'0.3-0.5s': n, ...}
+        voiced: 프레임별 유성음 여부 (피치 추정용)
+    """
+
+    def __init__(self, segments, voiced, duration, sample_rate, hop_length, pause_bins, no_pause_vpr=5.0):
+        self.segments = segments
+        self.voiced = voiced
+        self.duration = duration
+        self.sample_rate = sample_rate
+        self.hop_length = hop_length
+
+        self.speech_time = float(sum(end - start for start, end in segments))
+        self.leading_silence = segments[0][0] if segments else duration
+        self.trailing_silence = max(0.0, duration - segments[-1][1]) if segments else 0.0
+        self.pauses = np.array([
+            segments[i + 1][0] - segments[i][1] for i in range(len(segments) - 1)
+        ])
+
+        pause_time = float(self.pauses.sum())
+        self.avg_silence = float(self.pauses.mean()) if len(self.pauses) else 0.0
+        # 발화 사이 침묵이 없는 짧은 연속 답변(노인 답변에서 흔함)은 비율을 정할 수 없음
+        # → 발화시간 × 100 대신 정상 범위 안의 중립값 (활력도 0점으로 떨어지지 않도록)
+        if pause_time > 0:
+            self.vpr = self.speech_time / pause_time
+        elif segments:
+            self.vpr = float(no_pause_vpr)
+        else:
+            self.vpr = 0.0
+
+        edges = list(pause_bins) + [np.inf]
+        counts, _ = np.histogram(self.pauses, bins=edges)
+        labels = [
+            f"{lo:.1f}-{hi:.1f}s" if np.isfinite(hi) else f"{lo:.1f}s+"
+            for lo, hi in zip(edges[:-1], edges[1:])
+        ]
+        self.pause_histogram = dict(zip(labels, counts.tolist()))
+
+    @property
+    def has_speech(self):
+        return len(self.segments) > 0
+
+    def frame_mask(self, hop_length, n_frames):
+        """
+        다른 프레임 해상도(예: 피치 추정기)의 유성 마스크로 변환
+        (프레임 중심 시점의 VAD 유성 여부)
+        """
+        centers = np.arange(n_frames) * hop_length
+        idx = np.rint(centers / self.hop_length).astype(int)
+        inside = idx < len(self.voiced)
+        mask = np.zeros(n_frames, dtype=bool)
+        mask[inside] = self.voiced[idx[inside]]
+        return mask
+
+    def voiced_regions(self, pad_sec=0.2):
+        """
+        발화 구간 앞뒤로 pad_sec 여유를 둔 샘플 구간 (겹치면 병합)
+
+        Returns:
+            [(시작 샘플, 끝 샘플), ...]
+        """
+        total = int(round(self.duration * self.sample_rate))
+        regions = []
+        for start, end in self.segments:
+            s = max(0, int((start - pad_sec) * self.sample_rate))
+            e = min(total, int(np.ceil((end + pad_sec) * self.sample_rate)))
+            if regions and s <= regions[-1][1]:
+                regions[-1] = (regions[-1][0], max(regions[-1][1], e))
+            else:
+                regions.append((s, e))
+        return regions
+
+    def to_dict(self):
+        """JSON 저장/응답용 요약"""
+        return {
+            'segments': [{'start': round(s, 3), 'end': round(e, 3)} for s, e in self.segments],
+            'speech_time': round(self.speech_time, 3),
+            'leading_silence': round(self.leading_silence, 3),
+            'trailing_silence': round(self.trailing_silence, 3),
+            'pause_count': int(len(self.pauses)),
+            'avg_silence': round(self.avg_silence, 3),
+            'vpr': round(self.vpr, 3),
+            'pause_histogram': self.pause_histogram
+        }
+
+    def __repr__(self):
+        return (f"VADResult({len(self.segments)} segments, speech {self.speech_time:.2f}s, "
+                f"leading {self.leading_silence:.2f}s, pauses {len(self.pauses)})")
+
+
+# ========== 검출 ==========
+
+def detect_voice_activity(audio, options=None):
+    """
+    음성 구간 검출 (에너지 + 영교차율)
+
+    - 발화 프레임: RMS >= 하이브리드 기준
+                  또는 (RMS >= 배경 × 2 이고 ZCR 높음 → 'ㅅ','ㅎ' 같은 무성 자음)
+    - 유성 프레임: RMS >= 하이브리드 기준 이고 ZCR 낮음 (피치 추정 대상)
+    - min_silence_sec보다 짧은 끊김은 발화로 병합, min_speech_sec보다 짧은 잡음은 제거
+
+    Args:
+        audio: AudioData
+        options: MODELS['vad_options'] 형식 (None이면 설정값)
+
+    Returns:
+        VADResult
+    """
+    opts = dict(MODELS['vad_options'])
+    opts.update(options or {})
+
+    sr = audio.sample_rate
+    hop = int(sr * opts['hop_ms'] / 1000)
+    frame_length = int(sr * opts['frame_ms'] / 1000)
+
+    frames = frame_signal(audio.pcm.astype(np.float64), frame_length, hop)
+    if len(frames) == 0:
+        return VADResult([], np.zeros(0, dtype=bool), audio.duration, sr, hop, opts['pause_bins'],
+                         opts['no_pause_vpr'])
+
+    rms = frame_rms(frames)
+    zcr = frame_zcr(frames)
+
+    background = np.percentile(rms, 10)
+    threshold = hybrid_threshold(background, rms.max())
+    noisy_zcr = zcr >= opts['zcr_threshold']
+
+    loud = (rms >= threshold) & (rms > 0)
+    speech = loud | ((rms >= background * 2.0) & (rms > 0) & noisy_zcr)
+    voiced = loud & ~noisy_zcr
+
+    # 짧은 끊김 병합 → 짧은 잡음 제거
+    starts, ends = _runs(speech)
+    if len(starts):
+        min_gap = int(np.ceil(opts['min_silence_sec'] * sr / hop))
+        keep_gap = (starts[1:] - ends[:-1]) >= min_gap
+        starts = starts[np.concatenate([[True], keep_gap])]
+        ends = ends[np.concatenate([keep_gap, [True]])]
+
+        min_len = int(np.ceil(opts['min_speech_sec'] * sr / hop))
+        long_enough = (ends - starts) >= min_len
+        starts, ends = starts[long_enough], ends[long_enough]
+
+    segments = [
+        (float(s * hop / sr), float(min(e * hop / sr, audio.duration)))
+        for s, e in zip(starts, ends)
+    ]
+
+    return VADResult(segments, voiced, audio.duration, sr, hop, opts['pause_bins'], opts['no_pause_vpr'])
+
+
+def extract_regions(pcm, regions):
+    """구간들만 이어붙인 PCM"""
+    if not regions:
+        return pcm[:0]
+    return np.concatenate([pcm[s:e] for s, e in regions])
+
+
+def to_original_time(t, regions, sample_rate):
+    """
+    extract_regions()로 이어붙인 오디오의 시간(초) → 원본 오디오 시간(초)
+    """
+    lengths = np.array([e - s for s, e in regions])
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    sample = t * sample_rate
+    i = int(np.clip(np.searchsorted(offsets, sample, side='right') - 1, 0, len(regions) - 1))
+    return float((regions[i][0] + sample - offsets[i]) / sample_rate)
+
+
+# ========== 확인 (합성 음성) ==========
+if __name__ == "__main__":
+    from audio_io import AudioData
+
+    sr = 16000
+    t = np.arange(sr) / sr
+    tone = 0.3 * np.sin(2 * np.pi * 150 * t)   # 1초 유성음
+    quiet = np.zeros(sr)                       # 1초 침묵
+
+    cases = {
+        '연속 답변 3초 (발화 사이 침묵 없음)': np.concatenate([quiet[:sr // 2], tone, tone, tone]),
+        '발화 2개 + 사이 침묵 1초': np.concatenate([tone, quiet, tone]),
+        '침묵만': quiet,
+    }
+    for name, pcm in cases.items():
+        vad = detect_voice_activity(AudioData(pcm, sr, name))
+        print(f"{name}: {vad} → avg_silence {vad.avg_silence:.2f}초, VPR {vad.vpr:.2f}")
+
+    single = detect_voice_activity(AudioData(cases['연속 답변 3초 (발화 사이 침묵 없음)'], sr, "single"))
+    assert len(single.segments) == 1 and single.vpr == MODELS['vad_options']['no_pause_vpr']
+    print("✅ 연속 답변 VPR = 중립값")